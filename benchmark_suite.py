@@ -0,0 +1,292 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Stages run for every roster size, in order
+stages = ['ingest', 'eligibility', 'quota', 'render']
+default_sizes = [1000, 10000, 100000]
+board_grades = ['A1C', 'SRA', 'SSG', 'TSG', 'MSG', 'SMS']
+
+
+def timed(function, *args, **kwargs):
+    """Call function, returning (seconds, result)"""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def quiet():
+    """Silence the pipeline's progress prints while a stage is timed"""
+    return contextlib.redirect_stdout(open(os.devnull, 'w'))
+
+
+def record(results, members, stage, seconds, items=None, **extra):
+    """Add one stage timing to results and print it"""
+    entry = {'members': members, 'stage': stage, 'seconds': round(seconds, 6)}
+    if items is not None:
+        entry['items'] = items
+        entry['items_per_second'] = round(items / seconds, 1) if seconds > 0 else None
+    entry.update(extra)
+    results.append(entry)
+    print(f"{members:>8} {stage:<34} {seconds:9.3f}s" + (f"  {items} items" if items is not None else ''))
+
+
+def bench_ingest(raw, members, results, work_dir, excel_max):
+    """Type and validate the roster and read it from CSV, Parquet and (up to excel_max) Excel. Returns the typed roster."""
+    from roster_ingest import type_roster, validate_required_fields, read_alpha_roster
+    from roster_cache import load_alpha_roster
+    from roster_sources import read_roster
+    from synthetic_roster import write_roster
+
+    seconds, roster = timed(type_roster, raw)
+    record(results, members, 'ingest.type_roster', seconds, members)
+    seconds, _ = timed(validate_required_fields, roster)
+    record(results, members, 'ingest.validate', seconds, members)
+
+    csv_path = os.path.join(work_dir, f'roster_{members}.csv')
+    raw.to_csv(csv_path, index=False)
+    seconds, _ = timed(read_roster, csv_path)
+    record(results, members, 'ingest.csv_read', seconds, members)
+    try:
+        parquet_path = os.path.join(work_dir, f'roster_{members}.parquet')
+        raw.to_parquet(parquet_path, index=False)
+        seconds, _ = timed(read_roster, parquet_path)
+        record(results, members, 'ingest.parquet_read', seconds, members)
+    except ImportError as e:
+        print(f"Skipping Parquet read: {e}")
+
+    if members > excel_max:
+        return roster
+    path = write_roster(raw, os.path.join(work_dir, f'roster_{members}.xlsx'))
+    seconds, _ = timed(read_alpha_roster, path)
+    record(results, members, 'ingest.excel_read', seconds, members)
+    cache_dir = os.path.join(work_dir, 'roster_cache')
+    seconds, _ = timed(load_alpha_roster, path, cache_dir)
+    record(results, members, 'ingest.cache_build', seconds, members)
+    seconds, _ = timed(load_alpha_roster, path, cache_dir)
+    record(results, members, 'ingest.cache_load', seconds, members)
+    return roster
+
+
+def bench_eligibility(roster, members, results, cycle, year, sample):
+    """Per-member board_filter/accounting_date_check on a sample, then the vectorized rules on everyone"""
+    from board_filter import board_filter
+    from accounting_date_check import accounting_date_check
+    from date_utils import clear_date_caches, date_cache_stats, print_date_cache_stats
+    from eligibility_engine import evaluate_eligibility
+    from excel_parser import sort_members
+
+    # Date cache hit rates cover the per-member checks only
+    clear_date_caches()
+    rows = roster[roster['GRADE'].isin(board_grades)].head(sample)
+    board_args = list(zip(rows['GRADE'], rows['DOR'], rows['UIF_CODE'], rows['UIF_DISPOSITION_DATE'], rows['TAFMSD'],
+                          rows['REENL_ELIG_STATUS'], rows['CAFSC'], rows['2AFSC'], rows['3AFSC'], rows['4AFSC']))
+    with quiet():
+        seconds, _ = timed(lambda: [board_filter(grade, year, *args) for grade, *args in board_args])
+    record(results, members, 'eligibility.board_filter', seconds, len(board_args))
+
+    arrivals = rows['DATE_ARRIVED_STATION'].dropna().tolist()
+    seconds, _ = timed(lambda: [accounting_date_check(arrived, cycle, year) for arrived in arrivals])
+    date_cache = date_cache_stats()
+    record(results, members, 'eligibility.accounting_date_check', seconds, len(arrivals), date_cache=date_cache)
+    print_date_cache_stats(date_cache)
+
+    seconds, _ = timed(evaluate_eligibility, roster, year)
+    record(results, members, 'eligibility.evaluate_eligibility', seconds, members)
+    seconds, _ = timed(sort_members, roster, cycle, year)
+    record(results, members, 'eligibility.sort_members', seconds, members)
+
+
+def bench_quota(roster, members, results, cycle, year, mel_config):
+    """Build the MEL data, then time the quota table and lookups on it. Returns the MEL data."""
+    from excel_parser import build_mel_data
+    from promotion_eligible_counter import build_unit_quotas, get_unit_quota, get_promotion_eligibility
+
+    with quiet():
+        seconds, mel_data = timed(build_mel_data, roster, cycle, year, mel_config)
+    record(results, members, 'quota.build_mel_data', seconds, members)
+
+    pascode_srids = {pascode: info[3] for pascode, info in mel_data['pascode_map'].items()}
+    seconds, quotas = timed(build_unit_quotas, mel_data['eligible_df'], cycle, pascode_srids)
+    record(results, members, 'quota.build_unit_quotas', seconds, len(mel_data['eligible_df']))
+
+    keys = list(quotas[0].index)
+    seconds, _ = timed(lambda: [get_unit_quota(quotas[0], key) for key in keys])
+    record(results, members, 'quota.get_unit_quota', seconds, len(keys))
+    seconds, _ = timed(lambda: [get_promotion_eligibility(total, cycle) for total in range(members)])
+    record(results, members, 'quota.get_promotion_eligibility', seconds, members)
+    return mel_data
+
+
+def _pas_info(mel_data, pascode):
+    from promotion_eligible_counter import get_unit_quota
+
+    name, rank, title, srid = mel_data['pascode_map'][pascode]
+    _, must_promote, promote_now = get_unit_quota(mel_data['quotas'][0], pascode)
+    return {'srid': srid, 'fd name': name, 'rank': rank, 'title': title, 'fdid': f'{srid}{pascode[-4:]}',
+            'srid mpf': pascode[:2], 'mp': must_promote, 'pn': promote_now}
+
+
+def bench_render(mel_data, members, results, mel_config, logo_path):
+    """Per-PASCODE initial/final renders, checkbox fields, merges and the whole single-pass MELs"""
+    from io import BytesIO
+    from PyPDF2 import PdfReader
+    from roster_ingest import format_roster_dates
+    import initial_mel_pdf_generator as initial
+    import final_mel_pdf_generator as final
+    from pdf_utils import partition_by_pascode
+    from excel_parser import generate_initial_mel, generate_final_mel
+
+    cycle, year = mel_data['cycle'], mel_data['year']
+    eligible = partition_by_pascode(format_roster_dates(mel_data['eligible_df']))
+    ineligible = partition_by_pascode(mel_data['ineligible_df'][
+        ['FULL_NAME', 'GRADE', 'ASSIGNED_PAS', 'DAFSC', 'ASSIGNED_PAS_CLEARTEXT', 'REASON']
+    ], pascode_idx=2)
+    btz = partition_by_pascode(format_roster_dates(mel_data['btz_df']))
+    pascodes = sorted(set(eligible) | set(ineligible) | set(btz))
+    small_unit_df = mel_data['small_unit_df']
+
+    seconds, initial_pdfs = timed(lambda: [initial.generate_pascode_pdf(
+        eligible.get(pascode, []), ineligible.get(pascode, []), btz.get(pascode, []), small_unit_df, None,
+        mel_data['srid_pascode_map'], False, cycle, year, pascode, _pas_info(mel_data, pascode), None, logo_path
+    ) for pascode in pascodes])
+    record(results, members, 'render.initial_pascode', seconds, len(pascodes))
+    with quiet():
+        seconds, merged = timed(initial.merge_pdfs, initial_pdfs, None)
+    record(results, members, 'merge.initial', seconds, len(initial_pdfs), pages=len(PdfReader(BytesIO(merged)).pages))
+
+    # Final MEL ineligible rows are the full pdf columns, PASCODE 8th like the eligible rows
+    final_ineligible = partition_by_pascode(mel_data['ineligible_df'])
+
+    def render_final(checkboxes):
+        return [final.generate_final_mel_pdf(
+            eligible.get(pascode, []), final_ineligible.get(pascode, []), cycle, year,
+            pascode if checkboxes else None, _pas_info(mel_data, pascode), None, logo_path
+        ) for pascode in pascodes]
+
+    plain_seconds, _ = timed(render_final, False)
+    seconds, final_pdfs = timed(render_final, True)
+    record(results, members, 'render.final_pascode', seconds, len(pascodes))
+    checkboxes = 4 * sum(len(rows) for rows in eligible.values())
+    record(results, members, 'render.checkbox_fields', max(seconds - plain_seconds, 0), checkboxes)
+    seconds, merged = timed(final.merge_pdfs, final_pdfs, None)
+    record(results, members, 'merge.final', seconds, len(final_pdfs), pages=len(PdfReader(BytesIO(merged)).pages))
+
+    with quiet():
+        seconds, _ = timed(generate_initial_mel, mel_data, BytesIO(), mel_config, logo_path=logo_path, single_pass=True)
+    record(results, members, 'render.initial_mel_single_pass', seconds, members)
+    with quiet():
+        seconds, _ = timed(generate_final_mel, mel_data, BytesIO(), logo_path=logo_path, single_pass=True)
+    record(results, members, 'render.final_mel_single_pass', seconds, members)
+
+
+def run_benchmarks(sizes=default_sizes, selected_stages=stages, cycle='SSG', year=2025, seed=0, excel_max=10000,
+                   board_filter_sample=5000, logo_path='images/Air_Force_Personnel_Center.png'):
+    """
+    Time ingest, eligibility, quota and render stages on synthetic rosters of each size.
+
+    Args:
+        sizes (list): Roster sizes (members)
+        selected_stages (list, optional): Subset of stages to run
+        cycle (str, optional): Promotion cycle to evaluate and render
+        year (int, optional): Promotion year
+        seed (int, optional): Synthetic roster seed, so runs are comparable
+        excel_max (int, optional): Largest roster written to and read from Excel (writing 100k rows is slow)
+        board_filter_sample (int, optional): Members run through the per-member board_filter
+        logo_path (str, optional): Header logo for rendered MELs
+
+    Returns:
+        dict: Run details and 'results', one entry per stage and size with seconds and items/second
+    """
+    from synthetic_roster import generate_roster, synthetic_mel_config
+    from roster_ingest import type_roster
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for members in sizes:
+            seconds, raw = timed(generate_roster, members, seed, None, year)
+            record(results, members, 'synthetic.generate_roster', seconds, members)
+            mel_config = synthetic_mel_config(raw)
+
+            if 'ingest' in selected_stages:
+                roster = bench_ingest(raw, members, results, work_dir, excel_max)
+            else:
+                roster = type_roster(raw)
+            if 'eligibility' in selected_stages:
+                bench_eligibility(roster, members, results, cycle, year, board_filter_sample)
+            if 'quota' in selected_stages:
+                mel_data = bench_quota(roster, members, results, cycle, year, mel_config)
+            else:
+                from excel_parser import build_mel_data
+                with quiet():
+                    mel_data = build_mel_data(roster, cycle, year, mel_config)
+            if 'render' in selected_stages:
+                bench_render(mel_data, members, results, mel_config, logo_path)
+
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'cycle': cycle,
+        'year': year,
+        'seed': seed,
+        'results': results
+    }
+
+
+def compare_results(baseline, current, threshold=1.2):
+    """
+    Stages that got slower than baseline by more than threshold (a ratio).
+
+    Returns:
+        list: (members, stage, baseline seconds, current seconds) for each regression
+    """
+    baseline_seconds = {(entry['members'], entry['stage']): entry['seconds'] for entry in baseline['results']}
+    regressions = []
+    for entry in current['results']:
+        before = baseline_seconds.get((entry['members'], entry['stage']))
+        if before and entry['seconds'] > before * threshold:
+            regressions.append((entry['members'], entry['stage'], before, entry['seconds']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark MEL ingest, eligibility, quotas and PDF rendering on synthetic rosters.')
+    parser.add_argument('--sizes', nargs='+', type=int, default=default_sizes, help='Roster sizes (default: 1k 10k 100k)')
+    parser.add_argument('--stages', nargs='+', choices=stages, default=stages, help='Stages to run (default: all)')
+    parser.add_argument('--cycle', default='SSG', type=str.upper, help='Promotion cycle')
+    parser.add_argument('--year', type=int, default=2025, help='Promotion year')
+    parser.add_argument('--seed', type=int, default=0, help='Synthetic roster seed')
+    parser.add_argument('--excel-max', type=int, default=10000, help='Largest roster timed through Excel')
+    parser.add_argument('--logo', default='images/Air_Force_Personnel_Center.png', help='Header logo')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON results file')
+    parser.add_argument('--baseline', help='Earlier JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2, help='Slowdown ratio reported as a regression')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.stages, args.cycle, args.year, args.seed, args.excel_max,
+                            logo_path=args.logo)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_results(json.load(f), report, args.threshold)
+        for members, stage, before, after in regressions:
+            print(f"Regression: {stage} at {members} members {before:.3f}s -> {after:.3f}s")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
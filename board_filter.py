@@ -1,52 +1,6 @@
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
-
-#Static closeout date = annual report due date
-SCODs = {
-    'AB': f'31-MAR',
-    'AMN': f'31-MAR',
-    'A1C': f'31-MAR',
-    'SRA': f'31-MAR',
-    'SSG': f'31-JAN',
-    'TSG': f'30-NOV',
-    'MSG': f'30-SEP',
-    'SMS': f'31-JUL'
-}
-
-#Time in grade = how long you've been in a rank
-TIG = {
-    'AB': f'01-AUG',
-    'AMN': f'01-AUG',
-    'A1C': f'01-AUG',
-    'SRA': f'01-AUG',
-    'SSG': f'01-JUL',
-    'TSG': f'01-MAY',
-    'MSG': f'01-MAR',
-    'SMS': f'01-DEC'
-}
-
-tig_months_required = {
-    'AB': 6,
-    'AMN': 6,
-    'A1C': 6,
-    'SRA': 6,
-    'SSG': 23,
-    'TSG': 24,
-    'MSG': 20,
-    'SMS': 21
-}
-
-#Total active federal military service date = time in military (years)
-TAFMSD = {
-    'AB': 3,
-    'AMN': 3,
-    'A1C': 3,
-    'SRA': 3,
-    'SSG': 5,
-    'TSG': 8,
-    'MSG': 11,
-    'SMS': 14
-}
+from date_utils import as_date, add_months, add_years
+from cycle_context import tig_months_required, TAFMSD, get_cycle_context
 
 #manditory date of separation = the day you have to exit the military
 mdos = {
@@ -151,12 +105,10 @@ def cafsc_check(grade, cafsc, two_afsc, three_afsc, four_afsc):
 
 
 def btz_elgibility_check(date_of_rank, year):
-    cutoff_date = datetime.strptime(f'01-Feb-{year}', '%d-%b-%Y' )
-    if isinstance(date_of_rank, str):
-        btz_date_of_rank = datetime.strptime(date_of_rank, '%d-%b-%Y') + relativedelta(months=22)
-    else:
-        btz_date_of_rank = date_of_rank + relativedelta(months=22)
-    scod_date = datetime.strptime(f'{SCODs.get('SRA')}-{year}', '%d-%b-%Y')
+    context = get_cycle_context('SRA', year)
+    cutoff_date = context.a1c_cutoff_date
+    btz_date_of_rank = add_months(as_date(date_of_rank), 22)
+    scod_date = context.scod
     if btz_date_of_rank <= cutoff_date:
         return True
     if cutoff_date < btz_date_of_rank <= scod_date:
@@ -164,12 +116,10 @@ def btz_elgibility_check(date_of_rank, year):
     return False
 
 def check_a1c_eligbility(date_of_rank, year):
-    cutoff_date = datetime.strptime(f'01-Feb-{year}', '%d-%b-%Y')
-    scod_date = datetime.strptime(f'{SCODs.get('SRA')}-{year}', '%d-%b-%Y')
-    if isinstance(date_of_rank, str):
-        standard_a1c_date_of_rank = datetime.strptime(date_of_rank, '%d-%b-%Y') + relativedelta(months=28)
-    else:
-        standard_a1c_date_of_rank = date_of_rank + relativedelta(months=28)
+    context = get_cycle_context('SRA', year)
+    cutoff_date = context.a1c_cutoff_date
+    scod_date = context.scod
+    standard_a1c_date_of_rank = add_months(as_date(date_of_rank), 28)
     if standard_a1c_date_of_rank <= cutoff_date:
         return True
     if cutoff_date < standard_a1c_date_of_rank <= scod_date:
@@ -177,30 +127,23 @@ def check_a1c_eligbility(date_of_rank, year):
     return None
 
 def three_year_tafmsd_check(scod_as_datetime, tafmsd):
-    if isinstance(tafmsd, str):
-        tafmsd = datetime.strptime(tafmsd, "%d-%b-%Y")
-    adjusted_tafmsd = tafmsd + relativedelta(months=36)
+    adjusted_tafmsd = add_months(as_date(tafmsd), 36)
     if adjusted_tafmsd > scod_as_datetime:
         return False
 
 
 def board_filter(grade, year, date_of_rank, uif_code, uif_disposition_date, tafmsd, re_status, cafsc, two_afsc, three_afsc, four_afsc):
     try:
-        if isinstance(date_of_rank, str):
-            date_of_rank = datetime.strptime(date_of_rank, "%d-%b-%Y")
-        if isinstance(uif_disposition_date, str):
-            uif_disposition_date = datetime.strptime(uif_disposition_date, "%d-%b-%Y")
-        if isinstance(tafmsd, str):
-            tafmsd = datetime.strptime(tafmsd, "%d-%b-%Y")
-
-        scod = f'{SCODs.get(grade)}-{year}'
-        scod_as_datetime = datetime.strptime(scod, "%d-%b-%Y")
-        tig_selection_month = f'{TIG.get(grade)}-{year}'
-        formatted_tig_selection_month = datetime.strptime(tig_selection_month, "%d-%b-%Y")
-        tig_eligibility_month = formatted_tig_selection_month - relativedelta(months=tig_months_required.get(grade))
-        tafmsd_required_date = formatted_tig_selection_month - relativedelta(years=TAFMSD.get(grade)-1)
-        hyt_date = tafmsd + relativedelta(years=main_higher_tenure.get(grade))
-        mdos = formatted_tig_selection_month + relativedelta(months=1)
+        date_of_rank = as_date(date_of_rank)
+        uif_disposition_date = as_date(uif_disposition_date)
+        tafmsd = as_date(tafmsd)
+
+        context = get_cycle_context(grade, year)
+        scod_as_datetime = context.scod
+        tig_eligibility_month = context.tig_eligibility_month
+        tafmsd_required_date = context.tafmsd_required_date
+        hyt_date = add_years(tafmsd, main_higher_tenure.get(grade))
+        mdos = context.mdos
         btz_check = None
 
         if grade == 'A1C':
@@ -219,7 +162,7 @@ def board_filter(grade, year, date_of_rank, uif_code, uif_disposition_date, tafm
         if tafmsd > tafmsd_required_date:
             return False, f'TIS < {TAFMSD.get(grade)} years'
         if exception_hyt_start_date < hyt_date < exception_hyt_end_date:
-            hyt_date += relativedelta(years=2)
+            hyt_date = add_years(hyt_date, 2)
         if hyt_date < mdos:
             return False, 'Higher tenure.'
         if uif_code > 1 and uif_disposition_date < scod_as_datetime:
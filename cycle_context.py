@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from dateutil.relativedelta import relativedelta
+from date_utils import parse_date, add_months, add_years
+
+#Static closeout date = annual report due date
+SCODs = {
+    'AB': f'31-MAR',
+    'AMN': f'31-MAR',
+    'A1C': f'31-MAR',
+    'SRA': f'31-MAR',
+    'SSG': f'31-JAN',
+    'TSG': f'30-NOV',
+    'MSG': f'30-SEP',
+    'SMS': f'31-JUL'
+}
+
+#Time in grade = how long you've been in a rank
+TIG = {
+    'AB': f'01-AUG',
+    'AMN': f'01-AUG',
+    'A1C': f'01-AUG',
+    'SRA': f'01-AUG',
+    'SSG': f'01-JUL',
+    'TSG': f'01-MAY',
+    'MSG': f'01-MAR',
+    'SMS': f'01-DEC'
+}
+
+tig_months_required = {
+    'AB': 6,
+    'AMN': 6,
+    'A1C': 6,
+    'SRA': 6,
+    'SSG': 23,
+    'TSG': 24,
+    'MSG': 20,
+    'SMS': 21
+}
+
+#Total active federal military service date = time in military (years)
+TAFMSD = {
+    'AB': 3,
+    'AMN': 3,
+    'A1C': 3,
+    'SRA': 3,
+    'SSG': 5,
+    'TSG': 8,
+    'MSG': 11,
+    'SMS': 14
+}
+
+
+@dataclass(frozen=True)
+class CycleContext:
+    """Cutoff dates for one grade and cycle year. Build through get_cycle_context() so they are computed once."""
+    grade: str
+    year: int
+    scod: datetime
+    tig_selection_month: datetime
+    tig_eligibility_month: datetime
+    tafmsd_required_date: datetime
+    mdos: datetime
+    accounting_date: datetime
+    a1c_cutoff_date: datetime
+
+    @property
+    def accounting_date_text(self):
+        return self.accounting_date.strftime("%d %B %Y")
+
+
+@lru_cache(maxsize=None)
+def _build_cycle_context(grade, year):
+    scod = parse_date(f'{SCODs.get(grade)}-{year}')
+    tig_selection_month = parse_date(f'{TIG.get(grade)}-{year}')
+    accounting_date = scod - relativedelta(days=120 - 1)
+    return CycleContext(
+        grade=grade,
+        year=year,
+        scod=scod,
+        tig_selection_month=tig_selection_month,
+        tig_eligibility_month=add_months(tig_selection_month, -tig_months_required.get(grade)),
+        tafmsd_required_date=add_years(tig_selection_month, -(TAFMSD.get(grade) - 1)),
+        mdos=add_months(tig_selection_month, 1),
+        accounting_date=accounting_date.replace(day=3).replace(hour=23, minute=59, second=59),
+        a1c_cutoff_date=parse_date(f'01-Feb-{year}')
+    )
+
+
+def get_cycle_context(grade, year):
+    """
+    Get the shared cutoff dates for a grade and cycle year.
+
+    Args:
+        grade (str): Grade the dates are for (e.g., 'SSG')
+        year (int | str): Year for promotion cycle
+
+    Returns:
+        CycleContext: Cached, immutable cutoff dates
+    """
+    return _build_cycle_context(grade, int(year))
@@ -0,0 +1,82 @@
+from datetime import datetime
+from functools import lru_cache
+from dateutil.relativedelta import relativedelta
+
+roster_date_format = '%d-%b-%Y'
+
+# Roster dates repeat heavily (shared DORs and TAFMSDs, one SCOD per cycle), so a few thousand entries cover a wing.
+# Month/year offsets are cached on (date, n); typed=True keeps datetime and pandas Timestamp inputs apart, so each
+# call gets back its own type.
+date_cache_size = 8192
+
+
+@lru_cache(maxsize=date_cache_size)
+def parse_date(text, date_format=roster_date_format):
+    """Parse a roster date string (e.g., '01-JAN-2025'); raises ValueError like strptime"""
+    return datetime.strptime(text, date_format)
+
+
+def as_date(value, date_format=roster_date_format):
+    """Parse value when it is a string, otherwise return it unchanged"""
+    if isinstance(value, str):
+        return parse_date(value, date_format)
+    return value
+
+
+@lru_cache(maxsize=date_cache_size, typed=True)
+def add_months(date, months):
+    """date + relativedelta(months=months), clamped to the end of the month like relativedelta"""
+    return date + relativedelta(months=months)
+
+
+@lru_cache(maxsize=date_cache_size, typed=True)
+def add_years(date, years):
+    """date + relativedelta(years=years)"""
+    return date + relativedelta(years=years)
+
+
+_cached_functions = {
+    'parse_date': parse_date,
+    'add_months': add_months,
+    'add_years': add_years
+}
+
+
+def date_cache_stats():
+    """
+    Hit statistics of the date caches since they were last cleared.
+
+    Returns:
+        dict: Function name to dict with hits, misses, size, max_size and hit_rate (None before the first call)
+    """
+    stats = {}
+    for name, function in _cached_functions.items():
+        info = function.cache_info()
+        calls = info.hits + info.misses
+        stats[name] = {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'max_size': info.maxsize,
+            'hit_rate': info.hits / calls if calls else None
+        }
+    return stats
+
+
+def format_date_cache_stats(stats=None):
+    """Stats table, one line per cached function"""
+    stats = date_cache_stats() if stats is None else stats
+    lines = [f"{'DATE CACHE':<12} {'HITS':>10} {'MISSES':>8} {'SIZE':>8} {'HIT RATE':>9}"]
+    for name, entry in stats.items():
+        rate = '-' if entry['hit_rate'] is None else f"{entry['hit_rate']:.1%}"
+        lines.append(f"{name:<12} {entry['hits']:>10} {entry['misses']:>8} {entry['size']:>8} {rate:>9}")
+    return '\n'.join(lines)
+
+
+def print_date_cache_stats(stats=None):
+    print(format_date_cache_stats(stats))
+
+
+def clear_date_caches():
+    for function in _cached_functions.values():
+        function.cache_clear()
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+from board_filter import main_higher_tenure, cafsc_map, re_codes, exception_hyt_start_date, exception_hyt_end_date
+from cycle_context import SCODs, tig_months_required, TAFMSD, get_cycle_context
+
+# Status values written to the STATUS column
+ELIGIBLE = 'eligible'
+BTZ = 'btz'
+INELIGIBLE = 'ineligible'
+
+board_columns = ['GRADE', 'DOR', 'UIF_CODE', 'UIF_DISPOSITION_DATE', 'TAFMSD', 'REENL_ELIG_STATUS', 'CAFSC', '2AFSC',
+                 '3AFSC', '4AFSC']
+
+
+def _as_datetime(column):
+    if pd.api.types.is_datetime64_any_dtype(column.dtype):
+        return column
+    return pd.to_datetime(column, format='%d-%b-%Y', errors='coerce')
+
+
+def _is_str(column):
+    return column.apply(isinstance, args=(str,)).astype(bool)
+
+
+def _str_values(column):
+    # blank out non-string cells so the .str accessor works on empty/numeric columns
+    return column.where(_is_str(column), '').astype(object)
+
+
+def _afsc_meets_level(afsc, required_level):
+    """Skill level check for a 2AFSC/3AFSC/4AFSC column (5 or 6 character codes)."""
+    length = afsc.str.len()
+    six_char = (length == 6) & (afsc.str.slice(4, 5) >= required_level)
+    five_char = (length == 5) & (afsc.str.slice(3, 4) >= required_level)
+    return (six_char | five_char).fillna(False).astype(bool)
+
+
+def _cafsc_failed(grade, cafsc, two_afsc, three_afsc, four_afsc):
+    """Vectorized equivalent of board_filter.cafsc_check(...) is False."""
+    required_level = cafsc_map.get(grade)
+    two_present = _is_str(two_afsc)
+    three_present = ~two_present & _is_str(three_afsc)
+    four_present = ~two_present & ~three_present & _is_str(four_afsc)
+    cafsc, two_afsc, three_afsc, four_afsc = (_str_values(c) for c in (cafsc, two_afsc, three_afsc, four_afsc))
+
+    long_cafsc = (cafsc.str.len() >= 6).fillna(False).astype(bool)
+    exempt = long_cafsc & cafsc.str.slice(1, 2).isin(['8', '9'])
+    primary = long_cafsc & (cafsc.str.slice(4, 5) >= required_level).fillna(False).astype(bool)
+
+    # cafsc_check only looks at the first alternate AFSC that is present
+    alternate = ((two_present & _afsc_meets_level(two_afsc, required_level)) |
+                 (three_present & _afsc_meets_level(three_afsc, required_level)) |
+                 (four_present & _afsc_meets_level(four_afsc, required_level)))
+
+    return ~(exempt | primary | (long_cafsc & alternate))
+
+
+def _evaluate_grade(group, grade, year):
+    """Evaluate every member of one grade against the board rules for the cycle year."""
+    dor = _as_datetime(group['DOR'])
+    tafmsd = _as_datetime(group['TAFMSD'])
+    uif_disposition_date = _as_datetime(group['UIF_DISPOSITION_DATE'])
+    uif_code = pd.to_numeric(group['UIF_CODE'], errors='coerce')
+    re_status = group['REENL_ELIG_STATUS']
+
+    context = get_cycle_context(grade, year)
+
+    hyt_date = tafmsd + pd.DateOffset(years=main_higher_tenure.get(grade))
+    in_exception = (hyt_date > exception_hyt_start_date) & (hyt_date < exception_hyt_end_date)
+    hyt_date = hyt_date.where(~in_exception, hyt_date + pd.DateOffset(years=2))
+
+    no_status = pd.Series(False, index=group.index)
+    a1c_failed = pd.Series(False, index=group.index)
+    btz = pd.Series(False, index=group.index)
+    if grade == 'A1C':
+        cutoff_date = context.a1c_cutoff_date
+        sra_scod = get_cycle_context('SRA', year).scod
+        standard_a1c_date_of_rank = dor + pd.DateOffset(months=28)
+        btz_date_of_rank = dor + pd.DateOffset(months=22)
+        a1c_failed = (standard_a1c_date_of_rank > cutoff_date) & (standard_a1c_date_of_rank <= sra_scod)
+        needs_btz = ~(standard_a1c_date_of_rank <= cutoff_date) & ~a1c_failed
+        btz = needs_btz & (btz_date_of_rank <= sra_scod)
+        no_status = needs_btz & ~btz
+
+    cafsc_present = _is_str(group['CAFSC'])
+    cafsc_failed = _cafsc_failed(grade, group['CAFSC'], group['2AFSC'], group['3AFSC'], group['4AFSC'])
+
+    # Ordered exactly like board_filter: the first rule that applies decides the member.
+    # A missing date board_filter has to compare raises there, so the member is not considered (None).
+    rules = [
+        (tafmsd.isna() | dor.isna(), None, None),
+        (no_status, None, None),
+        (a1c_failed, INELIGIBLE, 'Failed A1C Check.'),
+        # three_year_tafmsd_check never returns True, so 'Over 36 months TIS.' is never applied
+        (dor > context.tig_eligibility_month, INELIGIBLE, f'TIG: < {tig_months_required.get(grade)} months'),
+        (tafmsd > context.tafmsd_required_date, INELIGIBLE, f'TIS < {TAFMSD.get(grade)} years'),
+        (hyt_date < context.mdos, INELIGIBLE, 'Higher tenure.'),
+        ((uif_code > 1) & uif_disposition_date.isna(), None, None),
+        ((uif_code > 1) & (uif_disposition_date < context.scod), INELIGIBLE,
+         'UIF code: ' + group['UIF_CODE'].astype(str)),
+        (re_status.isin(re_codes.keys()), INELIGIBLE, re_status.astype(str) + ': ' + re_status.map(re_codes)),
+        (~cafsc_present, None, None),
+        (cafsc_failed, INELIGIBLE, 'Insufficient CAFSC skill level.'),
+        (btz, BTZ, None),
+    ]
+    conditions = [condition.fillna(False).to_numpy(dtype=bool) for condition, _, _ in rules]
+    status = np.select(conditions, [np.full(len(group), s, dtype=object) for _, s, _ in rules], default=ELIGIBLE)
+    reason = np.select(conditions, [np.broadcast_to(np.asarray(r, dtype=object), len(group)) for _, _, r in rules],
+                       default=None)
+    return pd.DataFrame({'STATUS': status, 'REASON': reason}, index=group.index)
+
+
+def evaluate_eligibility(roster, year):
+    """
+    Evaluate the board rules (TIG, TIS, HYT, UIF, RE code, CAFSC, A1C and BTZ) for a whole roster at once.
+
+    Args:
+        roster (pd.DataFrame): Roster rows containing the board_columns
+        year (int): Year for promotion cycle
+
+    Returns:
+        pd.DataFrame: STATUS and REASON columns aligned to the roster index. STATUS is ELIGIBLE, BTZ,
+            INELIGIBLE, or None where board_filter returns None (member is not considered for the board).
+    """
+    year = int(year)
+    results = [pd.DataFrame({'STATUS': pd.Series(dtype=object), 'REASON': pd.Series(dtype=object)})]
+    for grade, group in roster[board_columns].groupby('GRADE', sort=False):
+        if grade not in SCODs:
+            results.append(pd.DataFrame({'STATUS': None, 'REASON': None}, index=group.index))
+            continue
+        results.append(_evaluate_grade(group, grade, year))
+    return pd.concat(results).reindex(roster.index)
+
+
+def to_board_filter_result(status, reason):
+    """Convert a STATUS/REASON pair back to the value board_filter would have returned."""
+    if status == ELIGIBLE:
+        return True
+    if status == BTZ:
+        return True, 'btz'
+    if status == INELIGIBLE:
+        return False, reason
+    return None
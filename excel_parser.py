@@ -1,24 +1,16 @@
-import pandas as pd
-from accounting_date_check import accounting_date_check
-from board_filter import board_filter
-from initial_mel_pdf_generator import generate_roster_pdf
-# from final_mel_pdf_generator import generate_final_roster_pdf
-from datetime import datetime, timedelta
+from cycle_context import get_cycle_context
+from mel_config import load_mel_config, resolve_pascode_map
+from pipeline_timing import stage
 
-eligible_service_members = []
-eligible_btz_service_members = []
-ineligible_service_members = []
+# pandas, the eligibility engine and the PDF generators are imported inside the functions that
+# use them, so importing this module stays cheap for the CLI and web routes
 
 
 alpha_roster_path = rf'C:\Users\Trent\Downloads\Base Alpha Roster - Deleted DAS member.xlsx'
 a1c_test = rf'C:\Users\Trent\Documents\a1c_test_cases_extended.xlsx'
 test_path = rf'C:\Users\Trent\Documents\testlist.xlsx'
-required_columns = ['FULL_NAME', 'GRADE', 'ASSIGNED_PAS_CLEARTEXT', 'DAFSC', 'DOR', 'DATE_ARRIVED_STATION', 'TAFMSD','REENL_ELIG_STATUS', 'ASSIGNED_PAS', 'CAFSC']
-optional_columns = ['GRADE_PERM_PROJ', 'UIF_CODE', 'UIF_DISPOSITION_DATE', '2AFSC', '3AFSC', '4AFSC']
-pdf_columns = ['FULL_NAME','GRADE', 'DATE_ARRIVED_STATION','DAFSC', 'ASSIGNED_PAS_CLEARTEXT', 'DOR', 'TAFMSD', 'ASSIGNED_PAS']
-pascodes = []
-pascodeMap = {}
-reason_for_ineligible_map = {}
+# YAML/CSV/JSON file with PASCODE FD details/SRIDs and senior raters; PASCODEs missing from it are prompted for
+mel_config_path = None
 boards = ['E5', 'E6', 'E7', 'E8', 'E9']
 grade_map = {
     "SRA": "E4",
@@ -36,125 +28,160 @@ promotional_map = {
     'SMS': 'CMS'
 }
 
-pascodeUnitMap = {}
-sridPascodeMap = {}
-
-alpha_roster = pd.read_excel(test_path, parse_dates=True)
-filtered_alpha_roster = alpha_roster[required_columns + optional_columns]
-pdf_roster = filtered_alpha_roster[pdf_columns]
-valid_upload = True
-
-# cycle = input('Enter Cycle: ')
-# year = input('Enter Year: ')
-unit_total_map = {}
-cycle = 'SMS'
-year = 2025
-
-for index, row in filtered_alpha_roster.iterrows():
-    for column, value in row.items():
-        if pd.isna(value) and column in required_columns:
-            valid_upload = False
-            print(rf"error at {index}, {column}")
-            break
-        if isinstance(value, pd.Timestamp):
-            row[column] = value.strftime('%d-%b-%Y').upper()
-            continue
-    valid_member = accounting_date_check(row['DATE_ARRIVED_STATION'], cycle, year)
-    if not valid_member:
-        continue
-    if row['ASSIGNED_PAS'] not in pascodes:
-        pascodes.append(row['ASSIGNED_PAS'])
-        pascodeUnitMap[row['ASSIGNED_PAS']] = row['ASSIGNED_PAS_CLEARTEXT']
-    if row['GRADE_PERM_PROJ'] == cycle:
-        ineligible_service_members.append(index)
-        reason_for_ineligible_map[index] = f'Projected for {cycle}.'
-        continue
-    elif row['GRADE_PERM_PROJ'] == promotional_map.get(cycle):
-        continue
-    if row['GRADE'] == cycle or (row['GRADE'] == 'A1C' and cycle == 'SRA'):
-        member_status = board_filter(row['GRADE'], year, row['DOR'], row['UIF_CODE'], row['UIF_DISPOSITION_DATE'], row['TAFMSD'], row['REENL_ELIG_STATUS'], row['CAFSC'], row['2AFSC'], row['3AFSC'], row['4AFSC'])
-        if member_status is None:
-            continue
-        elif member_status == True:
-            eligible_service_members.append(index)
-            if row['ASSIGNED_PAS'] in unit_total_map:
-                unit_total_map[row['ASSIGNED_PAS']] = unit_total_map[row['ASSIGNED_PAS']] + 1
-            else:
-                unit_total_map[row['ASSIGNED_PAS']] = 1
-        elif member_status[0] == True and member_status[1] == 'btz':
-            eligible_btz_service_members.append(index)
-        elif member_status[0] == False:
-            ineligible_service_members.append(index)
-            reason_for_ineligible_map[index] = member_status[1]
-
-pascodes = sorted(pascodes)
-for pascode in pascodes:
-    # name = input(f'Enter the name for {pascode} \n unit: {pascodeUnitMap[pascode]}: ')
-    # rank = input(f'Enter rank for {name}: ')
-    # title = input(f'Enter the title for {name}: ')
-    name = 'FIRST M. LAST'
-    rank = 'Rank'
-    title = 'Duty Title'
-    srid = input(f'Enter associated SRID for {pascode} \n unit: {pascodeUnitMap[pascode]}: ')
-    if srid in sridPascodeMap:
-        sridPascodeMap[srid].append(pascode)
-    else:
-        sridPascodeMap[srid] = [pascode]
-    pascodeMap[pascode] = (name, rank, title, srid)
-
-
-# pascodes = sorted(pascodes)
-# for pascode in pascodes:
-#     name = 'FIRST M. LAST'
-#     rank = 'Rank'
-#     title = 'Duty Title'
-#     srid = '0R173'
-#     pascodeMap[pascode] = (name, rank, title, srid)
-
-eligible_df = pdf_roster.loc[eligible_service_members]
-for column in eligible_df.columns:
-    if column == 'ASSIGNED_PAS_CLEARTEXT':
-        eligible_df['ASSIGNED_PAS_CLEARTEXT'] = eligible_df['ASSIGNED_PAS_CLEARTEXT'].str[:25]
-    if column == 'FULL_NAME':
-        eligible_df['FULL_NAME'] = eligible_df['FULL_NAME'].str[:25]
-    if pd.api.types.is_datetime64_any_dtype(eligible_df[column].dtype):
-        eligible_df[column] = eligible_df[column].dt.strftime('%d-%b-%Y').str.upper()
-
-ineligible_df = pdf_roster.loc[ineligible_service_members].copy()
-ineligible_df['REASON'] = ineligible_df.index.map(reason_for_ineligible_map)
-for column in ineligible_df.columns:
-    if column == 'ASSIGNED_PAS_CLEARTEXT':
-        ineligible_df['ASSIGNED_PAS_CLEARTEXT'] = ineligible_df['ASSIGNED_PAS_CLEARTEXT'].str[:25]
-    if column == 'FULL_NAME':
-        ineligible_df['FULL_NAME'] = ineligible_df['FULL_NAME'].str[:25]
-    if pd.api.types.is_datetime64_any_dtype(ineligible_df[column].dtype):
-        ineligible_df[column] = ineligible_df[column].dt.strftime('%d-%b-%Y').str.upper()
-
-btz_df = pdf_roster.loc[eligible_btz_service_members]
-for column in btz_df.columns:
-    if column == 'ASSIGNED_PAS_CLEARTEXT':
-        btz_df['ASSIGNED_PAS_CLEARTEXT'] = btz_df['ASSIGNED_PAS_CLEARTEXT'].str[:25]
-    if column == 'FULL_NAME':
-        btz_df['FULL_NAME'] = btz_df['FULL_NAME'].str[:25]
-    if pd.api.types.is_datetime64_any_dtype(btz_df[column].dtype):
-        btz_df[column] = btz_df[column].dt.strftime('%d-%b-%Y').str.upper()
-
-small_unit_pascodes = []
-small_unit_eligible_service_members = []
-
-for pascode in unit_total_map:
-    if unit_total_map[pascode] < 10:
-        small_unit_pascodes.append(pascode)
-
-for index, row in eligible_df.iterrows():
-    if row['ASSIGNED_PAS'] in small_unit_pascodes:
-        small_unit_eligible_service_members.append(index)
-
-small_unit_df = eligible_df.loc[small_unit_eligible_service_members]
-
-
-generate_roster_pdf(eligible_df, ineligible_df, btz_df, small_unit_df, sridPascodeMap, cycle, year, pascodeMap, output_filename="initial_mel_roster.pdf",
-                    logo_path='images/Air_Force_Personnel_Center.png')
-
-# generate_final_roster_pdf(eligible_df, ineligible_df, cycle, year, pascodeMap, output_filename="final_mel_roster.pdf",
-#                     logo_path='images/Air_Force_Personnel_Center.png')
+# Columns shortened for the PDF tables
+truncated_columns = ['FULL_NAME', 'ASSIGNED_PAS_CLEARTEXT']
+
+
+def load_roster(alpha_roster_path):
+    """Load the typed Alpha Roster (cached) and print any missing required values"""
+    from roster_cache import load_alpha_roster
+    from roster_ingest import validate_required_fields, print_validation_report
+
+    with stage('ingest.load_roster') as timing:
+        roster = load_alpha_roster(alpha_roster_path)
+        timing['rows'] = len(roster)
+    with stage('ingest.validate', rows=len(roster)):
+        validation_report = validate_required_fields(roster)
+    if not validation_report['valid']:
+        print_validation_report(validation_report)
+    return roster
+
+
+def _pdf_frame(roster, mask):
+    from roster_ingest import pdf_columns
+
+    df = roster.loc[mask, pdf_columns].copy()
+    for column in truncated_columns:
+        df[column] = df[column].str[:25]
+    return df
+
+
+def sort_members(roster, cycle, year):
+    """
+    Sort a roster into the eligible, ineligible and BTZ lists for one cycle.
+
+    Args:
+        roster (pd.DataFrame): Typed roster from load_roster
+        cycle (str): Promotion cycle (e.g., 'SSG')
+        year (int): Year for promotion cycle
+
+    Returns:
+        dict: 'eligible_df', 'ineligible_df' (with REASON), 'btz_df', 'pascodes' (sorted) and
+            'pascode_units' (PASCODE -> unit name)
+    """
+    from eligibility_engine import evaluate_eligibility, ELIGIBLE, BTZ, INELIGIBLE
+
+    # Members who arrived after the accounting date are left off the MEL entirely
+    on_station = ~(roster['DATE_ARRIVED_STATION'] > get_cycle_context(cycle, year).accounting_date)
+    units = roster.loc[on_station, ['ASSIGNED_PAS', 'ASSIGNED_PAS_CLEARTEXT']].dropna(subset=['ASSIGNED_PAS'])
+    units = units.drop_duplicates('ASSIGNED_PAS')
+    pascode_units = dict(zip(units['ASSIGNED_PAS'], units['ASSIGNED_PAS_CLEARTEXT']))
+
+    projected = on_station & (roster['GRADE_PERM_PROJ'] == cycle)
+    already_selected = on_station & (roster['GRADE_PERM_PROJ'] == promotional_map.get(cycle))
+    candidates = on_station & ~projected & ~already_selected & (
+        (roster['GRADE'] == cycle) | ((roster['GRADE'] == 'A1C') & (cycle == 'SRA'))
+    )
+
+    with stage('eligibility.evaluate', rows=int(candidates.sum())):
+        board_results = evaluate_eligibility(roster[candidates], year).reindex(roster.index)
+    status = board_results['STATUS']
+
+    ineligible = projected | (candidates & (status == INELIGIBLE))
+    ineligible_df = _pdf_frame(roster, ineligible)
+    ineligible_df['REASON'] = board_results.loc[ineligible, 'REASON'].where(
+        ~projected[ineligible], f'Projected for {cycle}.'
+    )
+
+    return {
+        'eligible_df': _pdf_frame(roster, candidates & (status == ELIGIBLE)),
+        'ineligible_df': ineligible_df,
+        'btz_df': _pdf_frame(roster, candidates & (status == BTZ)),
+        'pascodes': sorted(pascode_units),
+        'pascode_units': pascode_units
+    }
+
+
+def build_mel_data(roster, cycle, year, mel_config=None):
+    """
+    Everything the MEL generators need for one cycle: member lists, PASCODE/SRID maps, quotas
+    and the small unit members.
+
+    Args:
+        roster (pd.DataFrame): Typed roster from load_roster
+        cycle (str): Promotion cycle (e.g., 'SSG')
+        year (int): Year for promotion cycle
+        mel_config (dict, optional): From mel_config.load_mel_config
+
+    Returns:
+        dict: sort_members output plus 'pascode_map', 'srid_pascode_map', 'quotas', 'small_unit_df',
+            'cycle' and 'year'
+    """
+    with stage('eligibility.sort_members', rows=len(roster)):
+        mel_data = sort_members(roster, cycle, year)
+    return finish_mel_data(mel_data, cycle, year, mel_config)
+
+
+def finish_mel_data(mel_data, cycle, year, mel_config=None):
+    """
+    Add the PASCODE/SRID maps, quotas and small unit members to sort_members output (see build_mel_data).
+    Used directly with the member lists from roster_stream.stream_mel_members.
+    """
+    from promotion_eligible_counter import build_unit_quotas
+
+    pascode_map, srid_pascode_map = resolve_pascode_map(mel_data['pascodes'], mel_data['pascode_units'], mel_config)
+
+    # Eligible counts, unit size and PN/MP for every PASCODE and SRID
+    eligible_df = mel_data['eligible_df']
+    with stage('quota.build_unit_quotas', rows=len(eligible_df)):
+        quotas = build_unit_quotas(eligible_df, cycle, {pascode: info[3] for pascode, info in pascode_map.items()})
+    pascode_quotas = quotas[0]
+    small_unit_pascodes = pascode_quotas.index[pascode_quotas['small_unit']]
+
+    mel_data.update({
+        'cycle': cycle,
+        'year': year,
+        'pascode_map': pascode_map,
+        'srid_pascode_map': srid_pascode_map,
+        'quotas': quotas,
+        'small_unit_df': eligible_df[eligible_df['ASSIGNED_PAS'].isin(small_unit_pascodes)]
+    })
+    return mel_data
+
+
+def generate_initial_mel(mel_data, output_filename, mel_config=None, **kwargs):
+    """Render the initial MEL for build_mel_data output. Extra keyword arguments go to generate_roster_pdf."""
+    from initial_mel_pdf_generator import generate_roster_pdf
+
+    rows = len(mel_data['eligible_df']) + len(mel_data['ineligible_df']) + len(mel_data['btz_df'])
+    with stage('render.initial_mel', rows=rows):
+        generate_roster_pdf(mel_data['eligible_df'], mel_data['ineligible_df'], mel_data['btz_df'],
+                            mel_data['small_unit_df'], mel_data['srid_pascode_map'], mel_data['cycle'], mel_data['year'],
+                            mel_data['pascode_map'], output_filename=output_filename, quotas=mel_data['quotas'],
+                            senior_rater_details=None if mel_config is None else mel_config['senior_raters'], **kwargs)
+    return output_filename
+
+
+def generate_final_mel(mel_data, output_filename, **kwargs):
+    """Render the final MEL for build_mel_data output. Extra keyword arguments go to generate_final_roster_pdf."""
+    from final_mel_pdf_generator import generate_final_roster_pdf
+
+    with stage('render.final_mel', rows=len(mel_data['eligible_df']) + len(mel_data['ineligible_df'])):
+        return generate_final_roster_pdf(mel_data['eligible_df'], mel_data['ineligible_df'], mel_data['cycle'],
+                                         mel_data['year'], mel_data['pascode_map'], output_filename=output_filename,
+                                         quotas=mel_data['quotas'], **kwargs)
+
+
+if __name__ == '__main__':
+    # cycle = input('Enter Cycle: ')
+    # year = input('Enter Year: ')
+    cycle = 'SMS'
+    year = 2025
+
+    mel_config = load_mel_config(mel_config_path)
+    mel_data = build_mel_data(load_roster(test_path), cycle, year, mel_config)
+
+    generate_initial_mel(mel_data, "initial_mel_roster.pdf", mel_config,
+                         logo_path='images/Air_Force_Personnel_Center.png')
+
+    # generate_final_mel(mel_data, "final_mel_roster.pdf", logo_path='images/Air_Force_Personnel_Center.png')
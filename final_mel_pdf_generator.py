@@ -1,22 +1,15 @@
 from reportlab.lib.pagesizes import landscape, letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, PageBreak, Image, Frame, Paragraph
+from reportlab.platypus import PageBreak, Frame, Flowable
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
-from promotion_eligible_counter import get_promotion_eligibility
+from cycle_context import get_cycle_context
+from promotion_eligible_counter import build_unit_quotas, get_unit_quota, small_unit_size
+from pdf_utils import render_jobs, build_sections, pdf_stream, write_pdf, register_fonts, get_logo, stamp_form, footer_lines, FastTable, partition_by_pascode
+from pipeline_timing import stage
 import os
-import fitz  # PyMuPDF
-from PyPDF2 import PdfMerger
-import pandas as pd
-
-# Register Calibri fonts
-pdfmetrics.registerFont(TTFont('Calibri', 'Calibri.ttf'))
-pdfmetrics.registerFont(TTFont('Calibri-Bold', 'Calibrib.ttf'))
+from io import BytesIO
 
 promotion_map = {
     "SRA": "E5",
@@ -26,24 +19,14 @@ promotion_map = {
     "SMS": "E9"
 }
 
-SCODs = {'SRA': f'31-MAR',
-         'SSG': f'31-JAN',
-         'TSG': f'30-NOV',
-         'MSG': f'30-SEP',
-         'SMS': f'31-JUL'
-         }
-
 
 def get_accounting_date(grade, year):
-    scod = f'{SCODs.get(grade)}-{year}'
-    formatted_scod_date = datetime.strptime(scod, "%d-%b-%Y")
-    accounting_date = formatted_scod_date - relativedelta(days=120 - 1)
-    adjusted_accounting_date = accounting_date.replace(day=3).replace(hour=23, minute=59, second=59)
-    return adjusted_accounting_date.strftime("%d %B %Y")
+    return get_cycle_context(grade, year).accounting_date_text
 
 
 class FinalMELDocument(BaseDocTemplate):
     def __init__(self, filename, cycle=None, melYear=None, **kwargs):
+        register_fonts()
         super().__init__(filename, **kwargs)
         self.page_width, self.page_height = landscape(letter)
         self.cycle = cycle
@@ -67,7 +50,30 @@ class FinalMELDocument(BaseDocTemplate):
     def add_page_elements(self, canvas, doc):
         """Add header and footer to each page"""
         canvas.saveState()
+        # Static chrome is drawn once per document as a form XObject and stamped on every page
+        stamp_form(canvas, 'final_mel_chrome', lambda form_canvas: self.add_page_chrome(form_canvas, doc))
         self.add_header(canvas, doc)
+        canvas.restoreState()
+
+    def add_page_chrome(self, canvas, doc):
+        """Parts of the page that are the same on every page of the document"""
+        # CUI Header at the very top
+        canvas.setFont('Helvetica-Bold', 10)
+        canvas.drawCentredString(
+            self.page_width / 2,
+            self.page_height - 0.3 * inch,
+            'CUI// CONTROLLED UNCLASSIFIED INFORMATION'
+        )
+
+        # Logo on the left
+        header_top = self.page_height - 0.8 * inch
+        logo = get_logo(doc.logo_path)
+        if logo is not None:
+            canvas.drawImage(logo, 0.5 * inch, header_top - 0.8 * inch, 1 * inch, 1 * inch, mask='auto')
+
+        # Title "Unit Data"
+        canvas.setFont('Calibri-Bold', 12)
+        canvas.drawString(2 * inch, header_top + 0.1 * inch, "Unit Data")
 
         # Add footer border
         canvas.setLineWidth(0.1)
@@ -79,31 +85,12 @@ class FinalMELDocument(BaseDocTemplate):
             1.2 * inch
         )
         self.add_footer(canvas, doc)
-        canvas.restoreState()
 
     def add_header(self, canvas, doc):
-        # CUI Header at the very top
-        canvas.setFont('Helvetica-Bold', 10)
-        canvas.drawCentredString(
-            self.page_width / 2,
-            self.page_height - 0.3 * inch,
-            'CUI// CONTROLLED UNCLASSIFIED INFORMATION'
-        )
-
         # Start the main header content below the CUI line
         header_top = self.page_height - 0.8 * inch
-
-        # Logo on the left
-        logo_path = doc.logo_path
-        if os.path.exists(logo_path):
-            logo = Image(logo_path, width=1 * inch, height=1 * inch)
-            logo.drawOn(canvas, 0.5 * inch, header_top - 0.8 * inch)
-
-        # Title "Unit Data"
-        canvas.setFont('Calibri-Bold', 12)
         text_start_x = 2 * inch
         title_y = header_top + 0.1 * inch
-        canvas.drawString(text_start_x, title_y, "Unit Data")
 
         # PAS Information
         canvas.setFont('Calibri-Bold', 10)
@@ -144,42 +131,13 @@ class FinalMELDocument(BaseDocTemplate):
         canvas.drawString(text_start_s, title_s - line_height_s, title)
 
     def add_footer(self, canvas, doc):
-        footer_text = (
-            "The information herein is FOR OFFICIAL USE ONLY (CUI) information which must be protected under "
-            "the Freedom of Information Act (5 U.S.C. 552) and/or the Privacy Act of 1974 (5 U.S.C. 552a). "
-            "Unauthorized disclosure or misuse of this PERSONAL INFORMATION may result in disciplinary action, "
-            "criminal and/or civil penalties."
-        )
-
         canvas.setFont('Calibri-Bold', 8)
         x = 0.5 * inch
         y = 0.75 * inch
 
-        # Split footer text into lines
-        from reportlab.pdfbase.pdfmetrics import stringWidth
-        words = footer_text.split()
-        lines = []
-        current_line = []
-        current_width = 0
-        max_width = self.page_width - inch
-
-        for word in words:
-            word_width = stringWidth(word + ' ', 'Calibri-Bold', 8)
-            if current_width + word_width <= max_width:
-                current_line.append(word)
-                current_width += word_width
-            else:
-                lines.append(' '.join(current_line))
-                current_line = [word]
-                current_width = word_width
-
-        if current_line:
-            lines.append(' '.join(current_line))
-
-        # Draw footer lines centered
-        for i, line in enumerate(lines):
-            line_width = stringWidth(line, 'Calibri', 8)
-            center_x = (self.page_width - line_width) / 2
+        # Footer lines are wrapped once per page width and drawn centered
+        lines = footer_lines(self.page_width)
+        for i, (center_x, line) in enumerate(lines):
             canvas.drawString(center_x, y + (len(lines) - 1 - i) * 10, line)
 
         # Bottom footer elements
@@ -192,6 +150,7 @@ class FinalMELDocument(BaseDocTemplate):
 
         # Center: CUI and identifier
         cui_text = "CUI"
+        from reportlab.pdfbase.pdfmetrics import stringWidth
         cui_width = stringWidth(cui_text, 'Calibri-Bold', 12)
         cui_center_x = (self.page_width / 2) - (cui_width / 2)
         canvas.drawString(cui_center_x, bottom_y, cui_text)
@@ -208,71 +167,57 @@ class FinalMELDocument(BaseDocTemplate):
         canvas.drawString(self.page_width - 0.5 * inch - page_width, bottom_y, page_text)
 
 
-def create_final_mel_table(doc, data, header, table_type=None, count=None):
-    """Create table without checkbox graphics for final MEL (checkboxes will be added with PyMuPDF)"""
+class CheckboxField(Flowable):
+    """AcroForm checkbox drawn where the table places the cell, so the field lands exactly on its row"""
+
+    def __init__(self, name, size=11):
+        Flowable.__init__(self)
+        self.name = name
+        self.size = size
+
+    def wrap(self, availWidth, availHeight):
+        return self.size, self.size
+
+    def draw(self):
+        self.canv.acroForm.checkbox(
+            name=self.name,
+            checked=False,
+            buttonStyle='check',
+            size=self.size,
+            x=0,
+            y=0,
+            borderWidth=1,
+            borderColor=colors.black,
+            fillColor=colors.white,
+            fieldFlags='',
+            forceBorder=True,
+            relative=True
+        )
+
+
+def create_final_mel_table(doc, data, header, table_type=None, count=None, pascode=None):
+    """Create table for final MEL. With a pascode, the NRN/P/MP/PN cells hold interactive checkboxes
+    named {pascode}_{row}_{label}"""
     table_width = doc.page_width - inch
 
     # Column widths for eligible table
     # Format: [NAME, GRADE, PASCODE, DAFSC, UNIT, NRN, P, MP, PN]
     col_widths = [table_width * x for x in [0.26, 0.08, 0.1, 0.1, 0.26, 0.05, 0.05, 0.05, 0.05]]
 
-    # Process data to include empty cells for checkboxes
+    # Process data to include cells for checkboxes
+    checkbox_labels = ["NRN", "P", "MP", "PN"]
     processed_data = []
-    for row in data:
-        # Create a new row with empty cells for checkboxes
-        new_row = row[:5] + ["", "", "", ""]
+    for i, row in enumerate(data):
+        if pascode is None:
+            checkboxes = ["", "", "", ""]
+        else:
+            checkboxes = [CheckboxField(f"{pascode}_{i}_{label}") for label in checkbox_labels]
+        new_row = row[:5] + checkboxes
         processed_data.append(new_row)
 
-    # Prepare table data
-    table_data = [header] + processed_data
-    repeat_rows = 1
-
-    # Add status row if provided
-    if table_type and count is not None:
-        status_row = [[table_type, "", "", "", "", "", "", "", f"Total: {count}"]]
-        table_data = status_row + table_data
-        repeat_rows = 2
-
-    # Convert hex #17365d to RGB values (23, 54, 93)
-    dark_blue = colors.Color(23 / 255, 54 / 255, 93 / 255)
-
-    table = Table(table_data, repeatRows=repeat_rows, colWidths=col_widths)
-
-    style = [
-        # Header styling (for both status row and column headers)
-        ('BACKGROUND', (0, 0), (-1, repeat_rows - 1), dark_blue),
-        ('TEXTCOLOR', (0, 0), (-1, repeat_rows - 1), colors.white),
-        ('FONTNAME', (0, 0), (-1, repeat_rows - 1), 'Calibri-Bold'),
-        ('FONTSIZE', (0, 0), (-1, repeat_rows - 1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, repeat_rows - 1), 4),
-        ('ROWHEIGHT', (0, 0), (-1, -1), 30),
-
-        # Data rows styling
-        ('FONTNAME', (0, repeat_rows), (-1, -1), 'Calibri'),
-        ('FONTSIZE', (0, repeat_rows), (-1, -1), 10),
-        ('LINEBELOW', (0, 0), (-1, -1), .5, colors.lightgrey),
-
-        # Column alignments
-        ('ALIGN', (0, repeat_rows - 1), (0, -1), 'LEFT'),  # FULL NAME
-        ('ALIGN', (1, repeat_rows - 1), (1, -1), 'CENTER'),  # GRADE
-        ('ALIGN', (2, repeat_rows - 1), (2, -1), 'CENTER'),  # PASCODE
-        ('ALIGN', (3, repeat_rows - 1), (3, -1), 'LEFT'),  # DAFSC
-        ('ALIGN', (4, repeat_rows - 1), (4, -1), 'CENTER'),  # UNIT
-        ('ALIGN', (5, repeat_rows - 1), (8, -1), 'CENTER'),  # Checkbox columns
-
-        # Vertical alignment for all cells
-        ('VALIGN', (0, repeat_rows), (-1, -1), 'MIDDLE'),
-    ]
-
-    # Add status row styling if present
-    if table_type:
-        style.extend([
-            ('SPAN', (0, 0), (7, 0)),  # Span heading across
-            ('ALIGN', (8, 0), (8, 0), 'RIGHT'),  # Right align the count
-        ])
-
-    table.setStyle(TableStyle(style))
-    return table
+    status = (table_type, f"Total: {count}") if table_type and count is not None else None
+    aligns = ['LEFT', 'CENTER', 'CENTER', 'LEFT', 'CENTER', 'CENTER', 'CENTER', 'CENTER', 'CENTER']
+    return FastTable(col_widths, header, processed_data, header_aligns=aligns, data_aligns=aligns, status=status)
 
 
 def create_ineligible_table(doc, data, header, table_type=None, count=None):
@@ -282,162 +227,14 @@ def create_ineligible_table(doc, data, header, table_type=None, count=None):
     # Column widths for ineligible table
     # Format: [NAME, GRADE, PASCODE, DAFSC, UNIT, REASON NOT ELIGIBLE]
     col_widths = [table_width * x for x in [0.25, 0.08, 0.1, 0.1, 0.25, 0.2]]
+    status = (table_type, f"Total: {count}") if table_type and count is not None else None
 
-    # Prepare table data
-    table_data = [header] + data
-    repeat_rows = 1
-
-    # Add status row if provided
-    if table_type and count is not None:
-        status_row = [[table_type, "", "", "", "", f"Total: {count}"]]
-        table_data = status_row + table_data
-        repeat_rows = 2
-
-    # Convert hex #17365d to RGB values (23, 54, 93)
-    dark_blue = colors.Color(23 / 255, 54 / 255, 93 / 255)
-
-    table = Table(table_data, repeatRows=repeat_rows, colWidths=col_widths)
-
-    style = [
-        # Header styling (for both status row and column headers)
-        ('BACKGROUND', (0, 0), (-1, repeat_rows - 1), dark_blue),
-        ('TEXTCOLOR', (0, 0), (-1, repeat_rows - 1), colors.white),
-        ('FONTNAME', (0, 0), (-1, repeat_rows - 1), 'Calibri-Bold'),
-        ('FONTSIZE', (0, 0), (-1, repeat_rows - 1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, repeat_rows - 1), 4),
-        ('ROWHEIGHT', (0, 0), (-1, -1), 30),
-
-        # Data rows styling
-        ('FONTNAME', (0, repeat_rows), (-1, -1), 'Calibri'),
-        ('FONTSIZE', (0, repeat_rows), (-1, -1), 10),
-        ('LINEBELOW', (0, 0), (-1, -1), .5, colors.lightgrey),
-
-        # Column alignments
-        ('ALIGN', (0, repeat_rows - 1), (0, -1), 'LEFT'),  # FULL NAME
-        ('ALIGN', (1, repeat_rows - 1), (1, -1), 'CENTER'),  # GRADE
-        ('ALIGN', (2, repeat_rows - 1), (2, -1), 'CENTER'),  # PASCODE
-        ('ALIGN', (3, repeat_rows - 1), (3, -1), 'LEFT'),  # DAFSC
-        ('ALIGN', (4, repeat_rows - 1), (4, -1), 'CENTER'),  # UNIT
-        ('ALIGN', (5, repeat_rows - 1), (5, -1), 'LEFT'),  # REASON NOT ELIGIBLE
-    ]
-
-    # Add status row styling if present
-    if table_type:
-        style.extend([
-            ('SPAN', (0, 0), (4, 0)),  # Span heading across
-            ('ALIGN', (5, 0), (5, 0), 'RIGHT'),  # Right align the count
-        ])
-
-    table.setStyle(TableStyle(style))
-    return table
-
-
-def add_interactive_checkboxes(pdf_path, eligible_data, pascode):
-    """Add interactive checkboxes using PyMuPDF with precise positioning across multiple pages"""
-    try:
-        # Open the PDF
-        doc = fitz.open(pdf_path)
-
-        # Track the current page and row count
-        current_page_index = 0
-        rows_on_current_page = 0
-        max_rows_per_page = 20  # Adjust based on your PDF layout
-
-        # Get page dimensions
-        page_width = doc[0].rect.width
-        page_height = doc[0].rect.height
-
-        # Refined positioning calculations
-        start_x = page_width * 0.79  # Adjusted for checkbox column
-        start_y = page_height * 0.276  # Initial start position
-        row_height = page_height * 0.0295  # Proportional to page height
-        col_width = page_width * 0.045  # Spacing between checkbox columns
-
-        # Checkbox size
-        checkbox_size = 11  # Slightly larger for easier clicking
-
-        # Labels for the checkboxes
-        checkbox_labels = ["NRN", "P", "MP", "PN"]
-
-        # Add checkboxes for each row in eligible data
-        for i, row in enumerate(eligible_data):
-            # Check if we need to move to a new page
-            if rows_on_current_page >= max_rows_per_page:
-                current_page_index += 1
-                rows_on_current_page = 0
-
-            # Get the current page
-            page = doc[current_page_index]
-
-            # Reset y position for new page
-            if rows_on_current_page == 0:
-                current_y = start_y
-            else:
-                current_y = start_y + (rows_on_current_page * row_height)
-
-            # Add checkboxes for NRN, P, MP, PN
-            for j, label in enumerate(checkbox_labels):
-                # Calculate x position for this checkbox
-                x_pos = start_x + (j * col_width)
-
-                # Create a checkbox widget
-                widget = fitz.Widget()
-                widget.rect = fitz.Rect(
-                    x_pos,
-                    current_y,
-                    x_pos + checkbox_size,
-                    current_y + checkbox_size
-                )
-                widget.field_type = fitz.PDF_WIDGET_TYPE_CHECKBOX
-                widget.field_name = f"{pascode}_{i}_{label}"
-                widget.field_value = "Off"
-                widget.field_flags = 0  # Normal behavior
-                widget.border_width = 1
-                widget.border_color = (0, 0, 0)  # Black border
-                widget.fill_color = (1, 1, 1)  # White fill
-
-                # Add the checkbox to the page
-                page.add_widget(widget)
-
-            # Increment rows on current page
-            rows_on_current_page += 1
-
-        # Generate a temporary filename
-        import tempfile
-        import os
-
-        # Create a temporary file in the same directory as the original PDF
-        temp_dir = os.path.dirname(pdf_path)
-        temp_filename = os.path.join(temp_dir, f"temp_{os.path.basename(pdf_path)}")
-
-        # Save to a new file
-        doc.save(temp_filename, garbage=4, deflate=True, clean=True)
-        doc.close()
-
-        # Replace the original file with the temporary file
-        import shutil
-        shutil.move(temp_filename, pdf_path)
-
-        return pdf_path
-
-    except Exception as e:
-        try:
-            doc.close()
-        except:
-            pass
-
-        return pdf_path
+    aligns = ['LEFT', 'CENTER', 'CENTER', 'LEFT', 'CENTER', 'LEFT']
+    return FastTable(col_widths, header, data, header_aligns=aligns, data_aligns=aligns, status=status)
 
-def generate_final_mel_pdf(eligible_data, ineligible_data, cycle, melYear, pascode, pas_info,
-                           output_filename, logo_path):
-    """Generate a PDF for a single pascode for final MEL with interactive form fields"""
-    # Standard columns we know about
-    name_idx = 0  # FULL_NAME
-    grade_idx = 1  # GRADE
-    dafsc_idx = 3  # DAFSC
-    unit_idx = 4  # UNIT
-    pascode_idx = 7  # ASSIGNED_PAS/PASCODE
 
+def create_final_mel_document(output_filename, cycle, melYear, logo_path):
+    """Create an empty landscape final MEL document"""
     doc = FinalMELDocument(
         output_filename,
         cycle=cycle,
@@ -448,11 +245,20 @@ def generate_final_mel_pdf(eligible_data, ineligible_data, cycle, melYear, pasco
         topMargin=0.5 * inch,
         bottomMargin=0.5 * inch
     )
-
-    # Store additional information
     doc.logo_path = logo_path
-    doc.pas_members = [pas_info]
-    doc.pas_info = pas_info
+    return doc
+
+
+def build_final_mel_elements(doc, eligible_data, ineligible_data, pascode):
+    """Build the eligible (with checkbox fields) and ineligible tables for a single pascode"""
+    import pandas as pd
+
+    # Standard columns we know about
+    name_idx = 0  # FULL_NAME
+    grade_idx = 1  # GRADE
+    dafsc_idx = 3  # DAFSC
+    unit_idx = 4  # UNIT
+    pascode_idx = 7  # ASSIGNED_PAS/PASCODE
 
     elements = []
 
@@ -489,7 +295,8 @@ def generate_final_mel_pdf(eligible_data, ineligible_data, cycle, melYear, pasco
                 data=processed_eligible_data,
                 header=eligible_header_row,
                 table_type="ELIGIBLE",
-                count=len(processed_eligible_data)
+                count=len(processed_eligible_data),
+                pascode=pascode
             )
             elements.append(table)
 
@@ -540,57 +347,95 @@ def generate_final_mel_pdf(eligible_data, ineligible_data, cycle, melYear, pasco
             )
             elements.append(table)
 
-    # Build the PDF with ReportLab
-    doc.build(elements)
+    return elements
 
-    # Add interactive checkboxes with PyMuPDF if we have eligible data
-    if processed_eligible_data:
-        add_interactive_checkboxes(output_filename, processed_eligible_data, pascode)
 
+def generate_final_mel_pdf(eligible_data, ineligible_data, cycle, melYear, pascode, pas_info,
+                           output_filename, logo_path):
+    """Generate a PDF for a single pascode for final MEL with interactive form fields.
+    With output_filename None the PDF is built in memory and returned as bytes."""
+    buffer = BytesIO() if output_filename is None else output_filename
+    doc = create_final_mel_document(buffer, cycle, melYear, logo_path)
+
+    # Store additional information
+    doc.pas_info = pas_info
+
+    # Build the PDF with ReportLab; checkbox fields are drawn with their table cells
+    with stage('render.final_pascode', rows=len(eligible_data) + len(ineligible_data), pascode=pascode):
+        doc.build(build_final_mel_elements(doc, eligible_data, ineligible_data, pascode))
+
+    if output_filename is None:
+        return buffer.getvalue()
     return output_filename
 
 
 def merge_pdfs(input_pdfs, output_pdf):
-    merger = PdfMerger()
-
-    # Add each PDF to the merger
-    for pdf in input_pdfs:
-        if not os.path.exists(pdf):
-            continue
-        try:
-            merger.append(pdf)
-        except Exception as e:
-            pass
-
-    # Write the merged PDF to output file
-    if len(merger.pages) > 0:
-        try:
-            merger.write(output_pdf)
-            merger.close()
-        except Exception as e:
-            pass
-    else:
-        pass
+    """Merge PDFs given as paths, bytes or BytesIO, keeping their form fields.
+    With output_pdf None the merged bytes are returned."""
+    with stage('merge.final', rows=len(input_pdfs)):
+        from PyPDF2 import PdfReader, PdfWriter
+        from PyPDF2.generic import ArrayObject, DictionaryObject, NameObject
+
+        writer = PdfWriter()
+        fields = ArrayObject()
+        # The writer tracks copied objects by id(reader), so readers must stay alive until the write
+        readers = []
+
+        # Add each PDF's pages, collecting the checkbox widgets for the merged AcroForm
+        for i, pdf in enumerate(input_pdfs):
+            if isinstance(pdf, str) and not os.path.exists(pdf):
+                continue
+            try:
+                readers.append(PdfReader(pdf_stream(pdf)))
+                for page in readers[-1].pages:
+                    page = writer.add_page(page)
+                    for annot in page.get('/Annots', []):
+                        if '/FT' in annot.get_object():
+                            fields.append(annot)
+            except Exception as e:
+                print(f"Warning: Could not add {pdf if isinstance(pdf, str) else f'document {i}'} and its form fields "
+                      f"to merged document: {e}")
+
+        # Merge in memory, then write the output once
+        if len(writer.pages) > 0:
+            try:
+                if fields:
+                    writer._root_object[NameObject('/AcroForm')] = DictionaryObject({NameObject('/Fields'): fields})
+                buffer = BytesIO()
+                writer.write(buffer)
+                return write_pdf(buffer.getvalue(), output_pdf)
+            except Exception as e:
+                print(f"Error writing merged PDF: {e}")
+        else:
+            print("Warning: No pages to merge")
 
 
 def generate_final_roster_pdf(eligible_df, ineligible_df, cycle, melYear, pascode_map,
                               output_filename="final_military_roster.pdf",
-                              logo_path='images/Air_Force_Personnel_Center.png'):
-    """Generate a final MEL PDF with interactive form fields"""
-
-    # Convert DataFrames to lists
-    eligible_data = eligible_df.values.tolist()
-    ineligible_data = ineligible_df.values.tolist()
+                              logo_path='images/Air_Force_Personnel_Center.png', workers=1, single_pass=False,
+                              quotas=None, cache_dir=None):
+    """Generate a final MEL PDF with interactive form fields. PASCODE documents are rendered in a
+    process pool when workers is not 1 (None uses every CPU). With single_pass, every pascode is
+    built straight into output_filename with no temp files or merge. quotas is the
+    (pascode_quotas, srid_quotas) pair from build_unit_quotas; it is built from eligible_df when omitted.
+    With cache_dir (merged output only), PASCODE documents whose rows and header info are unchanged since the
+    last run are reused from the cache instead of re-rendered."""
+
+    # Eligible counts and PN/MP for every PASCODE
+    if quotas is None:
+        quotas = build_unit_quotas(eligible_df, cycle)
+    pascode_quotas = quotas[0]
+
+    # Partition both DataFrames into per-PASCODE row lists once (PASCODE is the 8th column)
+    eligible_by_pascode = partition_by_pascode(eligible_df)
+    ineligible_by_pascode = partition_by_pascode(ineligible_df)
 
     # Get unique PASCODEs from eligible and ineligible data
-    unique_pascodes = set()
-    for row in eligible_data + ineligible_data:
-        if len(row) > 7 and row[7] is not None:
-            unique_pascodes.add(row[7])  # PASCODE is the 8th column
-    unique_pascodes = sorted(list(unique_pascodes))
+    unique_pascodes = sorted(set(eligible_by_pascode) | set(ineligible_by_pascode))
 
-    # Create a list to store temporary PDF filenames
-    temp_pdfs = []
+    # Arguments for each PASCODE document, rendered after the loop
+    pascode_jobs = []
+    pascode_sections = []
 
     # Generate a separate PDF for each pascode
     for pascode in unique_pascodes:
@@ -599,26 +444,19 @@ def generate_final_roster_pdf(eligible_df, ineligible_df, cycle, melYear, pascod
             continue
 
         # Filter data for current pascode
-        pascode_eligible = [row for row in eligible_data if len(row) > 7 and row[7] == pascode]
-        pascode_ineligible = [row for row in ineligible_data if len(row) > 7 and row[7] == pascode]
+        pascode_eligible = eligible_by_pascode.get(pascode, [])
+        pascode_ineligible = ineligible_by_pascode.get(pascode, [])
 
         # Skip if there's no data for this pascode
         if not pascode_eligible and not pascode_ineligible:
             continue
 
         # Create PAS info for this pascode
-        try:
-            if 'ASSIGNED_PAS' in eligible_df.columns:
-                eligible_candidates = (eligible_df['ASSIGNED_PAS'] == pascode).sum()
-            else:
-                eligible_candidates = len(pascode_eligible)
-        except:
-            eligible_candidates = len(pascode_eligible)
+        eligible_candidates, must_promote, promote_now = get_unit_quota(pascode_quotas, pascode)
 
         # Determine if this is a small unit (10 or fewer eligible members)
-        is_small_unit = eligible_candidates <= 10
+        is_small_unit = eligible_candidates <= small_unit_size
 
-        must_promote, promote_now = get_promotion_eligibility(eligible_candidates, cycle)
         pas_info = {
             'srid': pascode_map[pascode][3],
             'fd name': pascode_map[pascode][0],
@@ -631,33 +469,44 @@ def generate_final_roster_pdf(eligible_df, ineligible_df, cycle, melYear, pascod
             'is_small_unit': is_small_unit  # Add small unit flag
         }
 
-        # Create temporary filename
-        temp_filename = f"temp_final_{pascode}.pdf"
-
         # Generate PDF for this pascode with interactive form fields
-        temp_pdf = generate_final_mel_pdf(
+        pascode_jobs.append((
             pascode_eligible,
             pascode_ineligible,
             cycle,
             melYear,
             pascode,
             pas_info,
-            temp_filename,
+            None,  # render in memory
             logo_path
-        )
-
-        temp_pdfs.append(temp_pdf)
-
-    # Merge all the temporary PDFs into the final output file
-    if temp_pdfs:
-        merge_pdfs(temp_pdfs, output_filename)
-
-        # Clean up temporary files
-        for pdf in temp_pdfs:
-            try:
-                if os.path.exists(pdf):
-                    os.remove(pdf)
-            except:
-                pass
+        ))
+        pascode_sections.append((pascode, pas_info, pascode_eligible, pascode_ineligible))
+
+    if single_pass:
+        # One document: each section switches the header info at its first page
+        doc = create_final_mel_document(output_filename, cycle, melYear, logo_path)
+        sections = [(pas_info, build_final_mel_elements(doc, pascode_eligible, pascode_ineligible, pascode))
+                    for pascode, pas_info, pascode_eligible, pascode_ineligible in pascode_sections]
+        if any(elements for _, elements in sections):
+            with stage('render.final_single_pass', rows=len(sections)):
+                build_sections(doc, sections)
+        return output_filename
+
+    if cache_dir is None:
+        # PASCODE documents are independent; results come back in sorted PASCODE order
+        pascode_pdfs = render_jobs(generate_final_mel_pdf, pascode_jobs, workers)
+    else:
+        from fragment_cache import fragment_fingerprint, render_cached, file_fingerprint, pascode_key
+
+        # A job holds everything its document is drawn from, apart from the logo's contents
+        logo_fingerprint = file_fingerprint(logo_path)
+        pascode_pdfs = render_cached(generate_final_mel_pdf, pascode_jobs,
+                                     [pascode_key(section[0]) for section in pascode_sections],
+                                     [fragment_fingerprint('pascode', *job, logo_fingerprint) for job in pascode_jobs],
+                                     cache_dir, f'final_{cycle}_{melYear}', workers)
+
+    # Merge the in-memory PDFs; the output file is the only disk write
+    if pascode_pdfs:
+        merge_pdfs(pascode_pdfs, output_filename)
 
     return output_filename
\ No newline at end of file
@@ -0,0 +1,118 @@
+import hashlib
+import os
+from datetime import date
+
+default_cache_dir = '.mel_cache'
+
+# Bump when the generators change what a PASCODE document looks like
+cache_version = 2
+
+
+def fragment_fingerprint(*parts):
+    """
+    Fingerprint of everything a PASCODE document is drawn from (rows, header info, cycle, logo...).
+
+    The footer shows the generation date, so fingerprints also change daily.
+    """
+    digest = hashlib.sha256(f'{cache_version}|{date.today().isoformat()}'.encode())
+    for part in parts:
+        digest.update(repr(part).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()[:32]
+
+
+def file_fingerprint(path):
+    """SHA-256 of a file's contents (e.g. the logo), so editing it in place changes the fingerprint. None when missing."""
+    if not path or not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+def pascode_key(pascode):
+    return f'pas:{pascode}'
+
+
+def senior_rater_key(srid):
+    return f'sr:{srid}'
+
+
+def _key_file_name(key):
+    # ':' is not allowed in Windows file names
+    return key.replace(':', '_')
+
+
+def get_fragment_path(cache_dir, group, key, fingerprint):
+    """
+    Cached PDF for one document of a MEL group such as 'initial_SSG_2025'. key is pascode_key(...) or
+    senior_rater_key(...), so a PASCODE and an SRID with the same text do not share entries.
+    """
+    return os.path.join(cache_dir, group, f'{_key_file_name(key)}-{fingerprint}.pdf')
+
+
+def load_fragment(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except Exception as e:
+        print(f"Warning: Could not read MEL cache {path}, re-rendering: {e}")
+        return None
+
+
+def store_fragment(path, pdf):
+    """Write a document to the cache and remove the key's earlier versions"""
+    group_dir = os.path.dirname(path)
+    key = os.path.basename(path).rsplit('-', 1)[0]
+    try:
+        os.makedirs(group_dir, exist_ok=True)
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(pdf)
+        os.replace(temp_path, path)
+        for name in os.listdir(group_dir):
+            stale_path = os.path.join(group_dir, name)
+            if name.endswith('.pdf') and name.rsplit('-', 1)[0] == key and stale_path != path:
+                os.remove(stale_path)
+    except Exception as e:
+        print(f"Warning: Could not write MEL cache {path}: {e}")
+
+
+def render_cached(render, jobs, keys, fingerprints, cache_dir=default_cache_dir, group='mel', workers=1):
+    """
+    render_jobs, reusing cached PDFs for jobs whose fingerprint has not changed since the last run.
+
+    Args:
+        render (callable): Module-level render function returning PDF bytes
+        jobs (list): Argument tuples, one per document
+        keys (list): pascode_key or senior_rater_key of each job
+        fingerprints (list): fragment_fingerprint of each job's inputs. None always renders and is not cached
+        cache_dir (str, optional): Cache directory
+        group (str, optional): Subdirectory for this MEL, e.g. 'final_SSG_2025'
+        workers (int, optional): Worker processes for the jobs that have to be rendered
+
+    Returns:
+        list: PDF bytes in the same order as jobs
+    """
+    from pdf_utils import render_jobs
+
+    pdfs = [None] * len(jobs)
+    paths = [None if fingerprint is None else get_fragment_path(cache_dir, group, key, fingerprint)
+             for key, fingerprint in zip(keys, fingerprints)]
+    for i, path in enumerate(paths):
+        if path is not None:
+            pdfs[i] = load_fragment(path)
+
+    # Only changed documents are rendered; results come back in job order
+    stale = [i for i, pdf in enumerate(pdfs) if pdf is None]
+    for i, pdf in zip(stale, render_jobs(render, [jobs[i] for i in stale], workers)):
+        pdfs[i] = pdf
+        if paths[i] is not None and pdf:
+            store_fragment(paths[i], pdf)
+
+    print(f"Reused {len(jobs) - len(stale)} of {len(jobs)} cached documents for {group}")
+    return pdfs
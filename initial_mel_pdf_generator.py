@@ -1,23 +1,17 @@
 from reportlab.lib.pagesizes import landscape, letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Spacer, Paragraph, Image, Frame
-from reportlab.lib import colors
+from reportlab.platypus import Frame
 from reportlab.lib.units import inch
 from reportlab.platypus.flowables import PageBreak
 from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
-from promotion_eligible_counter import get_promotion_eligibility
+from cycle_context import get_cycle_context
+from promotion_eligible_counter import get_promotion_eligibility, build_unit_quotas, get_unit_quota
+from mel_config import get_senior_rater
+from pdf_utils import render_jobs, build_sections, pdf_stream, write_pdf, register_fonts, get_logo, stamp_form, footer_lines, FastTable, partition_by_pascode
+from pipeline_timing import stage
 from reportlab.pdfbase.pdfmetrics import stringWidth
-import pandas as pd
 import os
-from PyPDF2 import PdfMerger
-
-# Register Calibri fonts
-pdfmetrics.registerFont(TTFont('Calibri', 'Calibri.ttf'))
-pdfmetrics.registerFont(TTFont('Calibri-Bold', 'Calibrib.ttf'))
+from io import BytesIO
 
 promotion_map = {
     "SRA": "E5",
@@ -27,25 +21,14 @@ promotion_map = {
     "SMS": "E9"
 }
 
-SCODs = {
-    'SRA': f'31-MAR',
-    'SSG': f'31-JAN',
-    'TSG': f'30-NOV',
-    'MSG': f'30-SEP',
-    'SMS': f'31-JUL'
-    }
-
 
 def get_accounting_date(grade, year):
-    scod = f'{SCODs.get(grade)}-{year}'
-    formatted_scod_date = datetime.strptime(scod, "%d-%b-%Y")
-    accounting_date = formatted_scod_date - relativedelta(days=120 - 1)
-    adjusted_accounting_date = accounting_date.replace(day=3).replace(hour=23, minute=59, second=59)
-    return adjusted_accounting_date.strftime("%d %B %Y")
+    return get_cycle_context(grade, year).accounting_date_text
 
 
 class MilitaryRosterDocument(BaseDocTemplate):
     def __init__(self, filename, cycle, melYear=None, **kwargs):
+        register_fonts()
         super().__init__(filename, **kwargs)
         self.page_width, self.page_height = landscape(letter)
         self.cycle = cycle
@@ -69,7 +52,30 @@ class MilitaryRosterDocument(BaseDocTemplate):
     def add_page_elements(self, canvas, doc):
         """Add header and footer to each page"""
         canvas.saveState()
+        # Static chrome is drawn once per document as a form XObject and stamped on every page
+        stamp_form(canvas, 'initial_mel_chrome', lambda form_canvas: self.add_page_chrome(form_canvas, doc))
         self.add_header(canvas, doc)
+        canvas.restoreState()
+
+    def add_page_chrome(self, canvas, doc):
+        """Parts of the page that are the same on every page of the document"""
+        # CUI Header at the very top
+        canvas.setFont('Helvetica-Bold', 10)
+        canvas.drawCentredString(
+            self.page_width / 2,
+            self.page_height - 0.3 * inch,
+            'CUI// CONTROLLED UNCLASSIFIED INFORMATION'
+        )
+
+        # Logo on the left
+        header_top = self.page_height - 0.8 * inch
+        logo = get_logo(doc.logo_path)
+        if logo is not None:
+            canvas.drawImage(logo, 0.5 * inch, header_top - 0.8 * inch, 1 * inch, 1 * inch, mask='auto')
+
+        # Title "Unit Data"
+        canvas.setFont('Calibri-Bold', 12)
+        canvas.drawString(2 * inch, header_top + 0.1 * inch, "Unit Data")
 
         # Add footer border
         canvas.setLineWidth(0.1)
@@ -81,30 +87,12 @@ class MilitaryRosterDocument(BaseDocTemplate):
             1.2 * inch
         )
         self.add_footer(canvas, doc)
-        canvas.restoreState()
 
     def add_header(self, canvas, doc):
-        # CUI Header at the very top
-        canvas.setFont('Helvetica-Bold', 10)
-        canvas.drawCentredString(
-            self.page_width / 2,
-            self.page_height - 0.3 * inch,
-            'CUI// CONTROLLED UNCLASSIFIED INFORMATION'
-        )
-
         # Start the main header content below the CUI line
         header_top = self.page_height - 0.8 * inch
-
-        # Logo on the left
-        logo_path = doc.logo_path
-        logo = Image(logo_path, width=1 * inch, height=1 * inch)
-        logo.drawOn(canvas, 0.5 * inch, header_top - 0.8 * inch)
-
-        # Title "Unit Data"
-        canvas.setFont('Calibri-Bold', 12)
         text_start_x = 2 * inch
         title_y = header_top + 0.1 * inch
-        canvas.drawString(text_start_x, title_y, "Unit Data")
 
         # PAS Information
         canvas.setFont('Calibri-Bold', 10)
@@ -144,41 +132,13 @@ class MilitaryRosterDocument(BaseDocTemplate):
         canvas.drawString(text_start_s, title_s - line_height_s, title)
 
     def add_footer(self, canvas, doc):
-        footer_text = (
-            "The information herein is FOR OFFICIAL USE ONLY (CUI) information which must be protected under "
-            "the Freedom of Information Act (5 U.S.C. 552) and/or the Privacy Act of 1974 (5 U.S.C. 552a). "
-            "Unauthorized disclosure or misuse of this PERSONAL INFORMATION may result in disciplinary action, "
-            "criminal and/or civil penalties."
-        )
-
         canvas.setFont('Calibri-Bold', 8)
         x = 0.5 * inch
         y = 0.75 * inch
 
-        # Split footer text into lines
-        words = footer_text.split()
-        lines = []
-        current_line = []
-        current_width = 0
-        max_width = self.page_width - inch
-
-        for word in words:
-            word_width = stringWidth(word + ' ', 'Calibri-Bold', 8)
-            if current_width + word_width <= max_width:
-                current_line.append(word)
-                current_width += word_width
-            else:
-                lines.append(' '.join(current_line))
-                current_line = [word]
-                current_width = word_width
-
-        if current_line:
-            lines.append(' '.join(current_line))
-
-        # Draw footer lines centered
-        for i, line in enumerate(lines):
-            line_width = stringWidth(line, 'Calibri', 8)
-            center_x = (self.page_width - line_width) / 2
+        # Footer lines are wrapped once per page width and drawn centered
+        lines = footer_lines(self.page_width)
+        for i, (center_x, line) in enumerate(lines):
             canvas.drawString(center_x, y + (len(lines) - 1 - i) * 10, line)
 
         # Bottom footer elements
@@ -210,181 +170,33 @@ def create_table(doc, data, header, table_type=None, count=None):
     """Create table with optional status row"""
     table_width = doc.page_width - inch
     col_widths = [table_width * x for x in [0.22, 0.07, 0.1, 0.08, 0.23, 0.1, 0.1, 0.1]]
-
-    # Prepare table data
-    table_data = [header] + data
-    repeat_rows = 1
-
-    # Add status row if provided
-    if table_type and count is not None:
-        status_row = [[table_type, "", "", "", "", "", "", f"Total: {count}"]]
-        table_data = status_row + table_data
-        repeat_rows = 2
-
-    # Convert hex #17365d to RGB values (23, 54, 93)
-    dark_blue = colors.Color(23 / 255, 54 / 255, 93 / 255)
-
-    table = Table(table_data, repeatRows=repeat_rows, colWidths=col_widths)
-
-    style = [
-        # Header styling (for both status row and column headers)
-        ('BACKGROUND', (0, 0), (-1, repeat_rows - 1), dark_blue),
-        ('TEXTCOLOR', (0, 0), (-1, repeat_rows - 1), colors.white),
-        ('FONTNAME', (0, 0), (-1, repeat_rows - 1), 'Calibri-Bold'),
-        ('FONTSIZE', (0, 0), (-1, repeat_rows - 1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, repeat_rows - 1), 4),
-        ('ROWHEIGHT', (0, 0), (-1, -1), 30),
-
-        # Data rows styling
-        ('FONTNAME', (0, repeat_rows), (-1, -1), 'Calibri'),
-        ('FONTSIZE', (0, repeat_rows), (-1, -1), 10),
-        ('LINEBELOW', (0, 0), (-1, -1), .5, colors.lightgrey),
-
-        # Column alignments
-        ('ALIGN', (0, repeat_rows - 1), (0, -1), 'LEFT'),  # FULL NAME
-        ('ALIGN', (1, repeat_rows - 1), (1, -1), 'CENTER'),  # GRADE
-        ('ALIGN', (2, repeat_rows - 1), (2, repeat_rows - 1), 'CENTER'),  # DAS header
-        ('ALIGN', (2, repeat_rows), (2, -1), 'RIGHT'),  # DAS data
-        ('ALIGN', (3, repeat_rows - 1), (3, -1), 'LEFT'),  # DAFSC
-        ('ALIGN', (4, repeat_rows - 1), (4, repeat_rows - 1), 'CENTER'),  # UNIT header
-        ('ALIGN', (4, repeat_rows), (4, -1), 'CENTER'),  # UNIT data
-        ('ALIGN', (5, repeat_rows - 1), (5, repeat_rows - 1), 'CENTER'),  # DOR header
-        ('ALIGN', (5, repeat_rows), (5, -1), 'RIGHT'),  # DOR data
-        ('ALIGN', (6, repeat_rows - 1), (6, -1), 'RIGHT'),  # TAFMSD
-        ('ALIGN', (7, repeat_rows - 1), (7, -1), 'RIGHT'),  # PASCODE
-    ]
-
-    # Add status row styling if present
-    if table_type:
-        style.extend([
-            ('SPAN', (0, 0), (6, 0)),  # Span ELIGIBLE/INELIGIBLE across
-            ('ALIGN', (7, 0), (7, 0), 'RIGHT'),  # Right align the count
-        ])
-
-    table.setStyle(TableStyle(style))
-    return table
+    status = (table_type, f"Total: {count}") if table_type and count is not None else None
+
+    # FULL NAME, GRADE, DAS, DAFSC, UNIT, DOR, TAFMSD, PASCODE
+    return FastTable(
+        col_widths, header, data,
+        header_aligns=['LEFT', 'CENTER', 'CENTER', 'LEFT', 'CENTER', 'CENTER', 'RIGHT', 'RIGHT'],
+        data_aligns=['LEFT', 'CENTER', 'RIGHT', 'LEFT', 'CENTER', 'RIGHT', 'RIGHT', 'RIGHT'],
+        status=status
+    )
 
 def create_ineligible_table(doc, data, header, table_type=None, count=None):
     """Create table with optional status row"""
     table_width = doc.page_width - inch
     col_widths = [table_width * x for x in [0.22, 0.07, 0.1, 0.08, 0.3, 0.23]]  # Adjusted last column to be wider
+    status = (table_type, f"Total: {count}") if table_type and count is not None else None
 
-    # Prepare table data
-    table_data = [header] + data
-    repeat_rows = 1
-
-    # Add status row if provided
-    if table_type and count is not None:
-        # For 6 columns, the status row should only have 6 cells
-        status_row = [[table_type, "", "", "", "", f"Total: {count}"]]
-        table_data = status_row + table_data
-        repeat_rows = 2
-
-    # Convert hex #17365d to RGB values (23, 54, 93)
-    dark_blue = colors.Color(23 / 255, 54 / 255, 93 / 255)
-
-    table = Table(table_data, repeatRows=repeat_rows, colWidths=col_widths)
-
-    style = [
-        # Header styling (for both status row and column headers)
-        ('BACKGROUND', (0, 0), (-1, repeat_rows - 1), dark_blue),
-        ('TEXTCOLOR', (0, 0), (-1, repeat_rows - 1), colors.white),
-        ('FONTNAME', (0, 0), (-1, repeat_rows - 1), 'Calibri-Bold'),
-        ('FONTSIZE', (0, 0), (-1, repeat_rows - 1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, repeat_rows - 1), 4),
-        ('ROWHEIGHT', (0, 0), (-1, -1), 30),
-
-        # Data rows styling
-        ('FONTNAME', (0, repeat_rows), (-1, -1), 'Calibri'),
-        ('FONTSIZE', (0, repeat_rows), (-1, -1), 10),
-        ('LINEBELOW', (0, 0), (-1, -1), .5, colors.lightgrey),
-
-        # Column alignments
-        ('ALIGN', (0, repeat_rows - 1), (0, -1), 'LEFT'),  # FULL NAME
-        ('ALIGN', (1, repeat_rows - 1), (1, -1), 'CENTER'),  # GRADE
-        ('ALIGN', (2, repeat_rows - 1), (2, repeat_rows - 1), 'CENTER'),  # DAS header
-        ('ALIGN', (2, repeat_rows), (2, -1), 'CENTER'),  # DAS data
-        ('ALIGN', (3, repeat_rows - 1), (3, -1), 'CENTER'),  # DAFSC
-        ('ALIGN', (4, repeat_rows - 1), (4, repeat_rows - 1), 'CENTER'),  # UNIT header
-        ('ALIGN', (4, repeat_rows), (4, -1), 'CENTER'),  # UNIT data
-        ('ALIGN', (5, repeat_rows - 1), (5, repeat_rows - 1), 'LEFT'),  # DOR header
-        ('ALIGN', (5, repeat_rows), (5, -1), 'LEFT'),  # DOR data
-    ]
-
-    # Add status row styling if present
-    if table_type:
-        style.extend([
-            ('SPAN', (0, 0), (4, 0)),  # Span across first 5 columns (0-4)
-            ('ALIGN', (5, 0), (5, 0), 'RIGHT'),  # Right align the count in last column
-        ])
-
-    table.setStyle(TableStyle(style))
-    return table
+    # FULL NAME, GRADE, PASCODE, DAFSC, UNIT, REASON
+    aligns = ['LEFT', 'CENTER', 'CENTER', 'CENTER', 'CENTER', 'LEFT']
+    return FastTable(col_widths, header, data, header_aligns=aligns, data_aligns=aligns, status=status)
 
 def create_btz_table(doc, data, header, table_type=None, count=None):
     """Create table with optional status row"""
-    table_width = doc.page_width - inch
-    col_widths = [table_width * x for x in [0.22, 0.07, 0.1, 0.08, 0.23, 0.1, 0.1, 0.1]]
-
-    # Prepare table data
-    table_data = [header] + data
-    repeat_rows = 1
-
-    # Add status row if provided
-    if table_type and count is not None:
-        status_row = [[table_type, "", "", "", "", "", "", f"Total: {count}"]]
-        table_data = status_row + table_data
-        repeat_rows = 2
-
-    # Convert hex #17365d to RGB values (23, 54, 93)
-    dark_blue = colors.Color(23 / 255, 54 / 255, 93 / 255)
-
-    table = Table(table_data, repeatRows=repeat_rows, colWidths=col_widths)
-
-    style = [
-        # Header styling (for both status row and column headers)
-        ('BACKGROUND', (0, 0), (-1, repeat_rows - 1), dark_blue),
-        ('TEXTCOLOR', (0, 0), (-1, repeat_rows - 1), colors.white),
-        ('FONTNAME', (0, 0), (-1, repeat_rows - 1), 'Calibri-Bold'),
-        ('FONTSIZE', (0, 0), (-1, repeat_rows - 1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, repeat_rows - 1), 4),
-        ('ROWHEIGHT', (0, 0), (-1, -1), 30),
-
-        # Data rows styling
-        ('FONTNAME', (0, repeat_rows), (-1, -1), 'Calibri'),
-        ('FONTSIZE', (0, repeat_rows), (-1, -1), 10),
-        ('LINEBELOW', (0, 0), (-1, -1), .5, colors.lightgrey),
-
-        # Column alignments
-        ('ALIGN', (0, repeat_rows - 1), (0, -1), 'LEFT'),  # FULL NAME
-        ('ALIGN', (1, repeat_rows - 1), (1, -1), 'CENTER'),  # GRADE
-        ('ALIGN', (2, repeat_rows - 1), (2, repeat_rows - 1), 'CENTER'),  # DAS header
-        ('ALIGN', (2, repeat_rows), (2, -1), 'RIGHT'),  # DAS data
-        ('ALIGN', (3, repeat_rows - 1), (3, -1), 'LEFT'),  # DAFSC
-        ('ALIGN', (4, repeat_rows - 1), (4, repeat_rows - 1), 'CENTER'),  # UNIT header
-        ('ALIGN', (4, repeat_rows), (4, -1), 'CENTER'),  # UNIT data
-        ('ALIGN', (5, repeat_rows - 1), (5, repeat_rows - 1), 'CENTER'),  # DOR header
-        ('ALIGN', (5, repeat_rows), (5, -1), 'RIGHT'),  # DOR data
-        ('ALIGN', (6, repeat_rows - 1), (6, -1), 'RIGHT'),  # TAFMSD
-        ('ALIGN', (7, repeat_rows - 1), (7, -1), 'RIGHT'),  # PASCODE
-    ]
+    return create_table(doc, data, header, table_type, count)
 
-    # Add status row styling if present
-    if table_type:
-        style.extend([
-            ('SPAN', (0, 0), (6, 0)),  # Span ELIGIBLE/INELIGIBLE across
-            ('ALIGN', (7, 0), (7, 0), 'RIGHT'),  # Right align the count
-        ])
 
-    table.setStyle(TableStyle(style))
-    return table
-
-
-
-
-def generate_pascode_pdf(eligible_data, ineligible_data, btz_data, small_unit_data, senior_rater_srid, senior_raters, is_last, cycle, melYear, pascode, pas_info,
-                         output_filename, logo_path):
-    """Generate a PDF for a single pascode"""
+def create_roster_document(output_filename, cycle, melYear, logo_path):
+    """Create an empty landscape roster document"""
     doc = MilitaryRosterDocument(
         output_filename,
         cycle=cycle,
@@ -395,23 +207,12 @@ def generate_pascode_pdf(eligible_data, ineligible_data, btz_data, small_unit_da
         topMargin=0.5 * inch,
         bottomMargin=0.5 * inch
     )
-
-    doc2 = MilitaryRosterDocument(
-        output_filename,
-        cycle=cycle,
-        melYear=melYear,
-        pagesize=landscape(letter),
-        rightMargin=0.5 * inch,
-        leftMargin=0.5 * inch,
-        topMargin=0.5 * inch,
-        bottomMargin=0.5 * inch
-    )
-
-    # Store additional information
     doc.logo_path = logo_path
-    # doc.pas_members = [pas_info]  # Only include this pascode's info
-    doc.pas_info = pas_info  # Set directly
+    return doc
+
 
+def build_pascode_elements(doc, eligible_data, ineligible_data, btz_data):
+    """Build the eligible, ineligible and BTZ tables for a single pascode"""
     elements = []
     header_row = ['FULL NAME', 'GRADE', 'DAS', 'DAFSC', 'UNIT', 'DOR', 'TAFMSD', 'PASCODE']
     ineligible_header_row = ['FULL NAME', 'GRADE', 'PASCODE', 'DAFSC', 'UNIT', 'REASON']
@@ -451,106 +252,151 @@ def generate_pascode_pdf(eligible_data, ineligible_data, btz_data, small_unit_da
         elements.append(table)
         elements.append(PageBreak())
 
-    doc.build(elements)
+    return elements
 
-    if is_last and len(small_unit_data) > 0:
-        srid_df = small_unit_data[small_unit_data['ASSIGNED_PAS'].isin(senior_raters[senior_rater_srid])]
-        srid_list = srid_df.values.tolist()
-        senior_rater = input('Name of Senior Rater: ')
-        senior_rater_rank = input("Rank: ")
-        senior_rater_title = input("Title: ")
+
+def build_senior_rater_elements(doc, small_unit_data, senior_rater_srid, senior_raters, cycle, pas_info, srid_quotas=None,
+                                senior_rater_details=None):
+    """Build the small unit table for an SRID. The senior rater comes from senior_rater_details (SRID -> (name, rank, title))
+    and is prompted for only when missing. PN/MP come from srid_quotas (see build_unit_quotas) when given, otherwise
+    from the small unit count of the whole roster. Returns (pas_info, elements)"""
+    header_row = ['FULL NAME', 'GRADE', 'DAS', 'DAFSC', 'UNIT', 'DOR', 'TAFMSD', 'PASCODE']
+    srid_df = small_unit_data[small_unit_data['ASSIGNED_PAS'].isin(senior_raters[senior_rater_srid])]
+    srid_list = srid_df.values.tolist()
+    senior_rater, senior_rater_rank, senior_rater_title = get_senior_rater(
+        {} if senior_rater_details is None else senior_rater_details, senior_rater_srid
+    )
+    if srid_quotas is not None:
+        _, must_promote, promote_now = get_unit_quota(srid_quotas, senior_rater_srid)
+    else:
         must_promote, promote_now = get_promotion_eligibility(len(small_unit_data), cycle)
 
-        doc2.pas_info = {
-            'srid': senior_rater_srid,
-            'fd name': senior_rater,
-            'rank': senior_rater_rank,
-            'title': senior_rater_title,
-            'fdid': pas_info['fdid'],
-            'srid mpf': pas_info['srid mpf'],
-            'mp': must_promote,
-            'pn': promote_now
-        }
+    senior_rater_info = {
+        'srid': senior_rater_srid,
+        'fd name': senior_rater,
+        'rank': senior_rater_rank,
+        'title': senior_rater_title,
+        'fdid': pas_info['fdid'],
+        'srid mpf': pas_info['srid mpf'],
+        'mp': must_promote,
+        'pn': promote_now
+    }
 
+    elements = []
 
-        doc2.logo_path = logo_path
+    table = create_table(
+        doc,
+        data=srid_list,
+        header=header_row,
+        table_type="SENIOR RATER",
+        count=len(srid_list)
+    )
+    elements.append(table)
+    if senior_rater_srid != list(senior_raters.keys())[-1]:
+        elements.append(PageBreak())
 
-        elements = []
+    return senior_rater_info, elements
 
-        table = create_table(
-            doc2,
-            data=srid_list,
-            header=header_row,
-            table_type="SENIOR RATER",
-            count=len(srid_list)
-        )
-        elements.append(table)
-        if senior_rater_srid != list(senior_raters.keys())[-1]:
-            elements.append(PageBreak())
 
-        doc2.build(elements)
+def generate_pascode_pdf(eligible_data, ineligible_data, btz_data, small_unit_data, senior_rater_srid, senior_raters, is_last, cycle, melYear, pascode, pas_info,
+                         output_filename, logo_path, srid_quotas=None, senior_rater_details=None):
+    """Generate a PDF for a single pascode. With output_filename None the PDF is built in memory and returned as bytes."""
+    buffer = BytesIO() if output_filename is None else output_filename
+    doc = create_roster_document(buffer, cycle, melYear, logo_path)
+    doc.pas_info = pas_info  # Set directly
+
+    with stage('render.initial_pascode', rows=len(eligible_data) + len(ineligible_data) + len(btz_data), pascode=pascode):
+        doc.build(build_pascode_elements(doc, eligible_data, ineligible_data, btz_data))
+
+    if is_last and len(small_unit_data) > 0:
+        # The senior rater document replaces the (empty) pascode document
+        buffer = BytesIO() if output_filename is None else output_filename
+        doc2 = create_roster_document(buffer, cycle, melYear, logo_path)
+        doc2.pas_info, elements = build_senior_rater_elements(
+            doc2, small_unit_data, senior_rater_srid, senior_raters, cycle, pas_info, srid_quotas,
+            senior_rater_details
+        )
+        with stage('render.senior_rater', pascode=pascode):
+            doc2.build(elements)
 
     # Build PDF for this pascode
+    if output_filename is None:
+        return buffer.getvalue()
     return output_filename
 
 
 def merge_pdfs(input_pdfs, output_pdf):
-    """Merge multiple PDFs into a single PDF"""
-    merger = PdfMerger()
+    """Merge multiple PDFs (paths, bytes or BytesIO) into a single PDF. With output_pdf None the merged bytes are returned."""
+    with stage('merge.initial', rows=len(input_pdfs)):
+        from PyPDF2 import PdfMerger
+        merger = PdfMerger()
+
+        # Add each PDF to the merger
+        for i, pdf in enumerate(input_pdfs):
+            try:
+                merger.append(pdf_stream(pdf))
+            except Exception as e:
+                print(f"Error adding {pdf if isinstance(pdf, str) else f'document {i}'} to merged document: {e}")
 
-    # Add each PDF to the merger
-    for pdf in input_pdfs:
+        # Merge in memory, then write the output once
         try:
-            merger.append(pdf)
+            buffer = BytesIO()
+            merger.write(buffer)
+            merger.close()
+            result = write_pdf(buffer.getvalue(), output_pdf)
+            if output_pdf is not None:
+                print(f"Successfully created merged PDF: {output_pdf}")
+            return result
         except Exception as e:
-            print(f"Error adding {pdf} to merged document: {e}")
-
-    # Write the merged PDF to output file
-    try:
-        merger.write(output_pdf)
-        merger.close()
-        print(f"Successfully created merged PDF: {output_pdf}")
-    except Exception as e:
-        print(f"Error writing merged PDF: {e}")
+            print(f"Error writing merged PDF: {e}")
 
 
 def generate_roster_pdf(eligible_df, ineligible_df, btz_df, small_unit_df, senior_raters, cycle, melYear, pascode_map, output_filename="military_roster.pdf",
-                        logo_path='images/Air_Force_Personnel_Center.png'):
-    """Generate a military roster PDF from eligible and ineligible DataFrames by creating separate PDFs for each pascode"""
-
-    # Convert DataFrames to lists
-    eligible_data = eligible_df.values.tolist()
+                        logo_path='images/Air_Force_Personnel_Center.png', workers=1, single_pass=False, quotas=None,
+                        senior_rater_details=None, cache_dir=None):
+    """Generate a military roster PDF from eligible and ineligible DataFrames by creating separate PDFs for each pascode.
+    PASCODE documents are rendered in a process pool when workers is not 1 (None uses every CPU).
+    With single_pass, every pascode is built straight into output_filename with no temp files or merge.
+    quotas is the (pascode_quotas, srid_quotas) pair from build_unit_quotas; it is built from eligible_df when omitted.
+    senior_rater_details maps SRID -> (name, rank, title); senior raters missing from it are prompted for.
+    With cache_dir (merged output only), PASCODE and senior rater documents whose rows and header info are unchanged
+    since the last run are reused from the cache instead of re-rendered."""
+
+    # Eligible counts and PN/MP for every PASCODE and SRID
+    if quotas is None:
+        quotas = build_unit_quotas(eligible_df, cycle, {pascode: info[3] for pascode, info in pascode_map.items()})
+    pascode_quotas, srid_quotas = quotas
+
+    from roster_ingest import format_roster_dates
+
+    # Dates stay datetime64 until here; format them for the tables
+    small_unit_df = format_roster_dates(small_unit_df)
+
+    # Partition each DataFrame into per-PASCODE row lists once
+    eligible_by_pascode = partition_by_pascode(format_roster_dates(eligible_df))  # PASCODE is the 8th column
     ineligible_columns = ['FULL_NAME', 'GRADE', 'ASSIGNED_PAS', 'DAFSC', 'ASSIGNED_PAS_CLEARTEXT', 'REASON']
-    ineligible_data = ineligible_df[ineligible_columns].values.tolist()
-    btz_data = btz_df.values.tolist()
+    ineligible_by_pascode = partition_by_pascode(ineligible_df[ineligible_columns], pascode_idx=2)
+    btz_by_pascode = partition_by_pascode(format_roster_dates(btz_df))
 
     # Get unique PASCODEs from both eligible and ineligible data
-    unique_pascodes = set()
-    for row in eligible_data:
-        unique_pascodes.add(row[7])  # PASCODE is the 8th column
-    for row in ineligible_data:
-        unique_pascodes.add(row[2])
-    for row in btz_data:
-        unique_pascodes.add(row[7])
-    unique_pascodes = sorted(list(unique_pascodes))
+    unique_pascodes = sorted(set(eligible_by_pascode) | set(ineligible_by_pascode) | set(btz_by_pascode))
 
 
-    # Create a list to store temporary PDF filenames
-    temp_pdfs = []
-
+    # PASCODE sections to render, and the last pascode's info for the senior rater pages
+    pascode_sections = []
+    senior_rater_section = None
 
     # Generate a separate PDF for each pascode
     for pascode in unique_pascodes:
-        is_last = False
         # Skip if this pascode is not in the pascode_map
         if pascode not in pascode_map:
             print(f"Warning: No info for pascode {pascode}, skipping")
             continue
 
         # Filter data for current pascode
-        pascode_eligible = [row for row in eligible_data if row[7] == pascode]
-        pascode_ineligible = [row for row in ineligible_data if row[2] == pascode]
-        pascode_btz = [row for row in btz_data if row[7] == pascode]
+        pascode_eligible = eligible_by_pascode.get(pascode, [])
+        pascode_ineligible = ineligible_by_pascode.get(pascode, [])
+        pascode_btz = btz_by_pascode.get(pascode, [])
 
 
 
@@ -560,9 +406,8 @@ def generate_roster_pdf(eligible_df, ineligible_df, btz_df, small_unit_df, senio
             continue
 
         # Create PAS info for this pascode
-        eligible_candidates = (eligible_df['ASSIGNED_PAS'] == pascode).sum()
+        eligible_candidates, must_promote, promote_now = get_unit_quota(pascode_quotas, pascode)
         print(f"Creating PDF for pascode {pascode}: {eligible_candidates} eligible candidates")
-        must_promote, promote_now = get_promotion_eligibility(eligible_candidates, cycle)
 
         pas_info = {
             'srid': pascode_map[pascode][3],
@@ -575,59 +420,95 @@ def generate_roster_pdf(eligible_df, ineligible_df, btz_df, small_unit_df, senio
             'pn': promote_now
         }
 
-        # Create temporary filename
-
         # Always generate this PASCODE's base document
-        senior_rater_srid = None
-        temp_pdf = generate_pascode_pdf(
+        pascode_sections.append((pascode, pas_info, pascode_eligible, pascode_ineligible, pascode_btz))
+
+        # Then if it’s the last pascode, trigger senior rater documents
+        if pascode == unique_pascodes[-1]:
+            senior_rater_section = (pascode, pas_info)
+
+    if single_pass:
+        # One document: each section switches the header info at its first page
+        doc = create_roster_document(output_filename, cycle, melYear, logo_path)
+        sections = [(pas_info, build_pascode_elements(doc, eligible, ineligible, btz))
+                    for _, pas_info, eligible, ineligible, btz in pascode_sections]
+        if senior_rater_section and len(small_unit_df) > 0:
+            for sr in senior_raters:
+                sections.append(build_senior_rater_elements(
+                    doc, small_unit_df, sr, senior_raters, cycle, senior_rater_section[1], srid_quotas,
+                    senior_rater_details
+                ))
+        if sections:
+            with stage('render.initial_single_pass', rows=len(sections)):
+                build_sections(doc, sections)
+        else:
+            print("No PDFs were generated. Check your data and pascode_map.")
+        return
+
+    pascode_jobs = [
+        (
             pascode_eligible,
             pascode_ineligible,
             pascode_btz,
             small_unit_df,
-            senior_rater_srid,
+            None,
             senior_raters,
-            is_last,  # we still signal whether this is the final pascode
+            False,
             cycle,
             melYear,
             pascode,
             pas_info,
-            f"temp_{pascode}.pdf",
+            None,  # render in memory
             logo_path
         )
-        temp_pdfs.append(temp_pdf)
-
-        is_last = (pascode == unique_pascodes[-1])
+        for pascode, pas_info, pascode_eligible, pascode_ineligible, pascode_btz in pascode_sections
+    ]
 
-        # Then if it’s the last pascode, trigger senior rater documents
-        if is_last:
+    # Senior rater documents prompt for input, so they stay in this process
+    senior_rater_jobs = []
+    if senior_rater_section:
+        pascode, pas_info = senior_rater_section
+        senior_rater_jobs = [
+            ([], [], [], small_unit_df, sr, senior_raters, True, cycle, melYear, pascode, pas_info, None, logo_path,
+             srid_quotas, senior_rater_details)
+            for sr in senior_raters
+        ]
+
+    if cache_dir is None:
+        # PASCODE documents are independent; results come back in sorted PASCODE order
+        pascode_pdfs = render_jobs(generate_pascode_pdf, pascode_jobs, workers)
+        pascode_pdfs.extend(generate_pascode_pdf(*job) for job in senior_rater_jobs)
+    else:
+        from fragment_cache import fragment_fingerprint, render_cached, file_fingerprint, pascode_key, senior_rater_key
+
+        group = f'initial_{cycle}_{melYear}'
+        logo = (logo_path, file_fingerprint(logo_path))
+        fingerprints = [
+            fragment_fingerprint('pascode', pascode, pas_info, eligible, ineligible, btz, cycle, melYear, logo)
+            for pascode, pas_info, eligible, ineligible, btz in pascode_sections
+        ]
+        pascode_pdfs = render_cached(generate_pascode_pdf, pascode_jobs,
+                                     [pascode_key(section[0]) for section in pascode_sections], fingerprints, cache_dir,
+                                     group, workers)
+
+        if senior_rater_jobs:
+            # A senior rater that still has to be prompted for is always rendered
+            fingerprints = []
+            last_sr = list(senior_raters)[-1]
             for sr in senior_raters:
-                senior_rater_srid = sr
-                sr_temp_pdf = generate_pascode_pdf(
-                    [],  # no eligible
-                    [],  # no ineligible
-                    [],  # no btz
-                    small_unit_df,
-                    senior_rater_srid,
-                    senior_raters,
-                    is_last,
-                    cycle,
-                    melYear,
-                    pascode,
-                    pas_info,
-                    f"temp_{pascode}_{sr}.pdf",
-                    logo_path
-                )
-                temp_pdfs.append(sr_temp_pdf)
-
-    # Merge all the temporary PDFs into the final output file
-    if temp_pdfs:
-        merge_pdfs(temp_pdfs, output_filename)
-
-        # Clean up temporary files
-        for pdf in temp_pdfs:
-            try:
-                os.remove(pdf)
-            except Exception as e:
-                print(f"Warning: Could not remove temporary file {pdf}: {e}")
+                details = (senior_rater_details or {}).get(sr)
+                srid_rows = small_unit_df[small_unit_df['ASSIGNED_PAS'].isin(senior_raters[sr])].values.tolist()
+                # Every SRID but the last ends with a page break
+                fingerprints.append(None if not details or not details[0] else fragment_fingerprint(
+                    'senior_rater', sr, details, srid_rows, get_unit_quota(srid_quotas, sr), senior_rater_section[1],
+                    sr == last_sr, cycle, melYear, logo
+                ))
+            pascode_pdfs.extend(render_cached(generate_pascode_pdf, senior_rater_jobs,
+                                              [senior_rater_key(sr) for sr in senior_raters], fingerprints, cache_dir,
+                                              group))
+
+    # Merge the in-memory PDFs; the output file is the only disk write
+    if pascode_pdfs:
+        merge_pdfs(pascode_pdfs, output_filename)
     else:
         print("No PDFs were generated. Check your data and pascode_map.")
\ No newline at end of file
@@ -0,0 +1,139 @@
+import argparse
+import contextlib
+import os
+import time
+from excel_parser import load_roster, build_mel_data, finish_mel_data, generate_initial_mel, generate_final_mel
+from mel_config import load_mel_config
+from pipeline_timing import start_timing, stop_timing, print_timing_summary, write_timing_json, profile
+from fragment_cache import default_cache_dir
+from roster_stream import default_chunk_size
+
+cycles = ['SRA', 'SSG', 'TSG', 'MSG', 'SMS']
+
+
+def run_batch(alpha_roster_path, cycle_list, years, mel_config_path=None, output_dir='.', initial=True, final=True,
+              logo_path='images/Air_Force_Personnel_Center.png', workers=1, single_pass=False, cache_dir=None,
+              chunk_size=None):
+    """
+    Generate MELs for every cycle/year pair from one parsed roster.
+
+    Args:
+        alpha_roster_path (str): Path to the Alpha Roster Excel, CSV or Parquet file
+        cycle_list (list): Promotion cycles (e.g., ['SSG', 'TSG'])
+        years (list): Years for the promotion cycles
+        mel_config_path (str, optional): YAML/CSV/JSON PASCODE and senior rater config
+        output_dir (str, optional): Directory for the PDFs
+        initial (bool, optional): Generate initial MELs
+        final (bool, optional): Generate final MELs
+        logo_path (str, optional): Logo for the page header
+        workers (int, optional): Worker processes per MEL, see generate_roster_pdf
+        single_pass (bool, optional): Build each MEL as one document
+        cache_dir (str, optional): Reuse unchanged PASCODE documents from this cache (merged output only)
+        chunk_size (int, optional): Stream the roster this many rows at a time, keeping only each cycle's
+            MEL members instead of the whole roster
+
+    Returns:
+        list: (cycle, year, seconds, files) for each cycle/year
+    """
+    start = time.perf_counter()
+    if chunk_size:
+        from roster_stream import stream_mel_members
+
+        cycle_years = [(cycle, year) for year in years for cycle in cycle_list]
+        members_by_cycle, members = stream_mel_members(alpha_roster_path, cycle_years, chunk_size)
+    else:
+        roster = load_roster(alpha_roster_path)
+        members = len(roster)
+    mel_config = load_mel_config(mel_config_path)
+    print(f"Parsed roster in {time.perf_counter() - start:.2f}s: {members} members")
+
+    os.makedirs(output_dir, exist_ok=True)
+    render_options = {'logo_path': logo_path, 'workers': workers, 'single_pass': single_pass, 'cache_dir': cache_dir}
+    timings = []
+    for year in years:
+        for cycle in cycle_list:
+            cycle_start = time.perf_counter()
+            if chunk_size:
+                mel_data = finish_mel_data(members_by_cycle.pop((cycle, year)), cycle, year, mel_config)
+            else:
+                mel_data = build_mel_data(roster, cycle, year, mel_config)
+            files = []
+            if initial:
+                files.append(generate_initial_mel(
+                    mel_data, os.path.join(output_dir, f"{cycle}_{year}_initial_mel.pdf"), mel_config, **render_options
+                ))
+            if final:
+                files.append(generate_final_mel(
+                    mel_data, os.path.join(output_dir, f"{cycle}_{year}_final_mel.pdf"), **render_options
+                ))
+            timings.append((cycle, year, time.perf_counter() - cycle_start, files))
+    return timings
+
+
+def print_timings(timings):
+    for cycle, year, seconds, files in timings:
+        print(f"{cycle} {year}: {seconds:.2f}s  {', '.join(files)}")
+    print(f"Total: {sum(seconds for _, _, seconds, _ in timings):.2f}s for {len(timings)} cycles")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate initial and final MELs for several cycles from one Alpha Roster.')
+    parser.add_argument('roster', help='Alpha Roster Excel, CSV or Parquet file')
+    parser.add_argument('--cycles', nargs='+', default=cycles, type=str.upper, choices=cycles,
+                        help='Promotion cycles (default: all)')
+    parser.add_argument('--years', nargs='+', type=int, required=True, help='Promotion years')
+    parser.add_argument('--config', help='YAML/CSV/JSON file with PASCODE and senior rater details')
+    parser.add_argument('--output-dir', default='.', help='Directory for the PDFs')
+    only = parser.add_mutually_exclusive_group()
+    only.add_argument('--initial-only', action='store_true', help='Only generate initial MELs')
+    only.add_argument('--final-only', action='store_true', help='Only generate final MELs')
+    parser.add_argument('--logo', default='images/Air_Force_Personnel_Center.png', help='Header logo')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes per MEL (0 uses every CPU)')
+    parser.add_argument('--single-pass', action='store_true', help='Build each MEL as one document')
+    parser.add_argument('--incremental', nargs='?', const=default_cache_dir, metavar='CACHE_DIR',
+                        help=f'Only re-render PASCODEs that changed since the last run (cache: {default_cache_dir})')
+    parser.add_argument('--streaming', nargs='?', type=int, const=default_chunk_size, metavar='ROWS',
+                        help=f'Read the roster in chunks of ROWS (default {default_chunk_size}) and keep only MEL '
+                             f'members, for very large rosters')
+    parser.add_argument('--stage-timings', nargs='?', const='', metavar='JSON',
+                        help='Print wall/CPU time and rows per pipeline stage, and write every record to JSON if given '
+                             '(per-PASCODE stages need --workers 1)')
+    parser.add_argument('--memory', action='store_true', help='Add peak memory to the stage timings (slower)')
+    parser.add_argument('--profile', metavar='PATH', help='Profile the run and write the result to PATH')
+    parser.add_argument('--profiler', choices=['cprofile', 'pyinstrument'], default='cprofile',
+                        help='Profiler for --profile (default: cprofile)')
+    args = parser.parse_args(argv)
+    if args.incremental and args.single_pass:
+        parser.error('--incremental reuses per-PASCODE documents and cannot be combined with --single-pass')
+
+    stage_timings = args.stage_timings is not None or args.memory
+    if stage_timings:
+        start_timing(memory=args.memory)
+    with profile(args.profile, args.profiler) if args.profile else contextlib.nullcontext():
+        timings = run_batch(
+            args.roster,
+            args.cycles,
+            args.years,
+            mel_config_path=args.config,
+            output_dir=args.output_dir,
+            initial=not args.final_only,
+            final=not args.initial_only,
+            logo_path=args.logo,
+            workers=args.workers or None,
+            single_pass=args.single_pass,
+            cache_dir=args.incremental,
+            chunk_size=args.streaming
+        )
+    print_timings(timings)
+    if stage_timings:
+        records = stop_timing()
+        print_timing_summary(records)
+        if args.stage_timings:
+            write_timing_json(args.stage_timings, records)
+            print(f"Wrote stage timings to {args.stage_timings}")
+    if args.profile:
+        print(f"Wrote {args.profiler} profile to {args.profile}")
+
+
+if __name__ == "__main__":
+    main()
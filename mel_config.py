@@ -0,0 +1,132 @@
+import csv
+import json
+import os
+
+# Placeholders used when a PASCODE's FD details are not in the config
+default_fd_name = 'FIRST M. LAST'
+default_fd_rank = 'Rank'
+default_fd_title = 'Duty Title'
+
+pascode_csv_columns = ['PASCODE', 'FD_NAME', 'RANK', 'TITLE', 'SRID']
+senior_rater_csv_columns = ['SR_NAME', 'SR_RANK', 'SR_TITLE']
+
+
+def empty_mel_config():
+    return {'pascodes': {}, 'senior_raters': {}}
+
+
+def _read_mapping_file(path):
+    with open(path, encoding='utf-8') as f:
+        if path.lower().endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError(f"PyYAML is required to read {path}; use a JSON or CSV config instead")
+            return yaml.safe_load(f) or {}
+        return json.load(f)
+
+
+def _read_csv_file(path):
+    """One row per PASCODE; SR_NAME/SR_RANK/SR_TITLE columns are optional and repeat per SRID"""
+    config = empty_mel_config()
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            row = {key.strip().upper(): (value or '').strip() for key, value in row.items() if key}
+            if not row.get('PASCODE'):
+                continue
+            config['pascodes'][row['PASCODE']] = {
+                'fd_name': row.get('FD_NAME'),
+                'rank': row.get('RANK'),
+                'title': row.get('TITLE'),
+                'srid': row.get('SRID')
+            }
+            if row.get('SRID') and row.get('SR_NAME'):
+                config['senior_raters'][row['SRID']] = {
+                    'name': row['SR_NAME'],
+                    'rank': row.get('SR_RANK'),
+                    'title': row.get('SR_TITLE')
+                }
+    return config
+
+
+def load_mel_config(path):
+    """
+    Load PASCODE and senior rater details for unattended runs.
+
+    YAML/JSON files hold two mappings:
+        pascodes: {PASCODE: {fd_name, rank, title, srid}}
+        senior_raters: {SRID: {name, rank, title}}
+    CSV files hold one row per PASCODE with PASCODE, FD_NAME, RANK, TITLE, SRID and optionally
+    SR_NAME, SR_RANK, SR_TITLE.
+
+    Args:
+        path (str): Config file path. None gives an empty config, so every PASCODE is prompted for
+
+    Returns:
+        dict: 'pascodes' (PASCODE -> (fd name, rank, title, srid)) and
+            'senior_raters' (SRID -> (name, rank, title))
+    """
+    if path is None:
+        return empty_mel_config()
+    if path.lower().endswith('.csv'):
+        raw = _read_csv_file(path)
+    else:
+        raw = _read_mapping_file(path)
+
+    config = empty_mel_config()
+    for pascode, info in (raw.get('pascodes') or {}).items():
+        info = info or {}
+        config['pascodes'][str(pascode)] = (
+            info.get('fd_name') or default_fd_name,
+            info.get('rank') or default_fd_rank,
+            info.get('title') or default_fd_title,
+            str(info['srid']) if info.get('srid') else None
+        )
+    for srid, info in (raw.get('senior_raters') or {}).items():
+        info = info or {}
+        config['senior_raters'][str(srid)] = (info.get('name'), info.get('rank'), info.get('title'))
+    print(f"Loaded MEL config from {os.path.basename(path)}: {len(config['pascodes'])} pascodes, "
+          f"{len(config['senior_raters'])} senior raters")
+    return config
+
+
+def resolve_pascode_map(pascodes, pascode_units, config=None):
+    """
+    Look up FD details and SRID for every PASCODE, prompting only for ones missing from the config.
+
+    Args:
+        pascodes (list): PASCODEs in the order to resolve them
+        pascode_units (dict): PASCODE -> unit name, shown in the prompt
+        config (dict, optional): From load_mel_config
+
+    Returns:
+        tuple: (pascode_map, srid_pascode_map) where pascode_map is PASCODE -> (fd name, rank, title, srid)
+            and srid_pascode_map is SRID -> [PASCODE, ...]
+    """
+    # Prompted SRIDs are added to the config so later cycles in the same run reuse them
+    known = (config or empty_mel_config())['pascodes']
+    pascode_map = {}
+    srid_pascode_map = {}
+    for pascode in pascodes:
+        name, rank, title, srid = known.get(pascode, (default_fd_name, default_fd_rank, default_fd_title, None))
+        if not srid:
+            srid = input(f'Enter associated SRID for {pascode} \n unit: {pascode_units.get(pascode)}: ')
+            known[pascode] = (name, rank, title, srid)
+        srid_pascode_map.setdefault(srid, []).append(pascode)
+        pascode_map[pascode] = (name, rank, title, srid)
+    return pascode_map, srid_pascode_map
+
+
+def get_senior_rater(senior_raters, srid):
+    """
+    Senior rater (name, rank, title) for an SRID, prompting once if it is not in senior_raters.
+
+    Args:
+        senior_raters (dict): SRID -> (name, rank, title); prompted answers are added to it
+        srid (str): Senior rater ID
+    """
+    details = senior_raters.get(srid)
+    if details is None or not details[0]:
+        details = (input('Name of Senior Rater: '), input("Rank: "), input("Title: "))
+        senior_raters[srid] = details
+    return details
@@ -1,42 +1,27 @@
-import pandas as pd
-from excel_parser import eligible_service_members, ineligible_service_members
-from pdf_generator import generate_roster_pdf
 from datetime import datetime
+from excel_parser import load_roster, build_mel_data, generate_initial_mel
+from mel_config import load_mel_config
 
 
-def execute_roster_generation(alpha_roster_path, cycle, year, output_path=None):
+def execute_roster_generation(alpha_roster_path, cycle, year, output_path=None, mel_config_path=None):
     """
     Execute the roster generation process.
 
     Args:
-        alpha_roster_path (str): Path to the Alpha Roster Excel file
+        alpha_roster_path (str): Path to the Alpha Roster Excel, CSV or Parquet file
         cycle (str): Promotion cycle (e.g., 'SSG')
         year (int): Year for promotion cycle
         output_path (str, optional): Path for output PDF. If None, generates default name
+        mel_config_path (str, optional): YAML/CSV/JSON PASCODE and senior rater config
     """
     try:
-        # Define required columns
-        required_columns = [
-            'FULL_NAME', 'GRADE', 'ASSIGNED_PAS_CLEARTEXT', 'DAFSC', 'DOR',
-            'DATE_ARRIVED_STATION', 'TAFMSD', 'REENL_ELIG_STATUS', 'ASSIGNED_PAS'
-        ]
-        optional_columns = ['GRADE_PERM_PROJ', 'UIF_CODE', 'UIF_DISPOSITION_DATE']
-        pdf_columns = [
-            'FULL_NAME', 'GRADE', 'DATE_ARRIVED_STATION', 'DAFSC',
-            'ASSIGNED_PAS_CLEARTEXT', 'DOR', 'TAFMSD', 'ASSIGNED_PAS'
-        ]
-
-        # Read Excel file
+        # Read the roster
         print(f"Reading Alpha Roster from: {alpha_roster_path}")
-        alpha_roster = pd.read_excel(alpha_roster_path)
-
-        # Filter columns
-        filtered_alpha_roster = alpha_roster[required_columns + optional_columns]
-        pdf_roster = filtered_alpha_roster[pdf_columns]
+        roster = load_roster(alpha_roster_path)
+        mel_config = load_mel_config(mel_config_path)
 
         # Create eligible and ineligible dataframes
-        eligible_df = pdf_roster.loc[eligible_service_members]
-        ineligible_df = pdf_roster.loc[ineligible_service_members]
+        mel_data = build_mel_data(roster, cycle, year, mel_config)
 
         # Generate output filename if not provided
         if output_path is None:
@@ -45,15 +30,10 @@ def execute_roster_generation(alpha_roster_path, cycle, year, output_path=None):
 
         # Generate PDF
         print(f"Generating PDF: {output_path}")
-        print(f"Eligible members: {len(eligible_df)}")
-        print(f"Ineligible members: {len(ineligible_df)}")
+        print(f"Eligible members: {len(mel_data['eligible_df'])}")
+        print(f"Ineligible members: {len(mel_data['ineligible_df'])}")
 
-        generate_roster_pdf(
-            eligible_df=eligible_df,
-            ineligible_df=ineligible_df,
-            cycle=cycle,
-            output_filename=output_path
-        )
+        generate_initial_mel(mel_data, output_path, mel_config)
 
         print(f"PDF generation complete: {output_path}")
         return True
@@ -79,4 +59,4 @@ if __name__ == "__main__":
     if success:
         print("Roster generation completed successfully.")
     else:
-        print("Roster generation failed. Check error messages above.")
\ No newline at end of file
+        print("Roster generation failed. Check error messages above.")
@@ -0,0 +1,315 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+import os
+from reportlab.platypus.doctemplate import ActionFlowable
+from reportlab.platypus.flowables import Flowable, PageBreak
+
+# Fonts used by the MEL documents, registered on first document
+mel_fonts = {
+    'Calibri': 'Calibri.ttf',
+    'Calibri-Bold': 'Calibrib.ttf'
+}
+_fonts_registered = False
+
+
+def register_fonts():
+    """Register the MEL TrueType fonts once per process"""
+    global _fonts_registered
+    if _fonts_registered:
+        return
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    for name, path in mel_fonts.items():
+        pdfmetrics.registerFont(TTFont(name, path))
+    _fonts_registered = True
+
+
+class SetPasInfo(ActionFlowable):
+    """Switch the header info (doc.pas_info) for the pages that follow. Never drawn."""
+
+    def __init__(self, pas_info):
+        ActionFlowable.__init__(self)
+        self.pas_info = pas_info
+
+    def apply(self, doc):
+        # Applied on the last page of the previous section, so doc.page is the next page's index
+        doc.pas_info = self.pas_info
+        doc.section_start_pages.append(doc.page)
+
+
+def build_sections(doc, sections):
+    """
+    Build several pascode sections into one document in a single pass.
+
+    Args:
+        doc (BaseDocTemplate): Document whose page template draws doc.pas_info in the header
+        sections (list): (pas_info, elements) pairs; every section starts on a new page
+
+    Returns:
+        list: 0-based index of the first page of each non-empty section
+    """
+    flowables = []
+    doc.section_start_pages = [0]
+    for pas_info, elements in sections:
+        if not elements:
+            continue
+        if not flowables:
+            doc.pas_info = pas_info
+        else:
+            if isinstance(flowables[-1], PageBreak):
+                flowables.pop()
+            flowables.extend([SetPasInfo(pas_info), PageBreak()])
+        flowables.extend(elements)
+    doc.build(flowables)
+    return doc.section_start_pages
+
+
+def partition_by_pascode(df, pascode_idx=7):
+    """Split DataFrame rows into per-PASCODE row lists in a single pass"""
+    if len(df.columns) <= pascode_idx:
+        return {}
+    return {pascode: group.values.tolist() for pascode, group in df.groupby(df.iloc[:, pascode_idx], sort=False)}
+
+
+def pdf_stream(pdf):
+    """Wrap in-memory PDF bytes in a BytesIO; paths and file objects pass through unchanged"""
+    if isinstance(pdf, (bytes, bytearray)):
+        return BytesIO(pdf)
+    return pdf
+
+
+def write_pdf(data, output):
+    """
+    Write PDF bytes to their destination.
+
+    Args:
+        data (bytes): PDF contents
+        output (str or file-like): Path or writable buffer. None returns the bytes unchanged
+
+    Returns:
+        bytes or str or file-like: data when output is None, otherwise output
+    """
+    if output is None:
+        return data
+    if hasattr(output, 'write'):
+        output.write(data)
+    else:
+        with open(output, 'wb') as f:
+            f.write(data)
+    return output
+
+
+mel_footer_text = (
+    "The information herein is FOR OFFICIAL USE ONLY (CUI) information which must be protected under "
+    "the Freedom of Information Act (5 U.S.C. 552) and/or the Privacy Act of 1974 (5 U.S.C. 552a). "
+    "Unauthorized disclosure or misuse of this PERSONAL INFORMATION may result in disciplinary action, "
+    "criminal and/or civil penalties."
+)
+
+
+@lru_cache(maxsize=None)
+def get_logo(logo_path):
+    """Decoded logo image, read once per process. None when the file does not exist."""
+    from reportlab.lib.utils import ImageReader
+    if not logo_path or not os.path.exists(logo_path):
+        return None
+    return ImageReader(logo_path)
+
+
+def stamp_form(canvas, form_name, draw):
+    """
+    Draw a form XObject on the current page, defining it with draw(canvas) the first time the
+    document uses it.
+
+    Args:
+        canvas (Canvas): Page canvas
+        form_name (str): Form name, unique within the document
+        draw (callable): Draws the form contents in page coordinates
+    """
+    if not canvas.hasForm(form_name):
+        canvas.beginForm(form_name)
+        draw(canvas)
+        canvas.endForm()
+    canvas.doForm(form_name)
+
+
+@lru_cache(maxsize=None)
+def footer_lines(page_width, text=mel_footer_text, font_name='Calibri-Bold', font_size=8, margin=72):
+    """
+    Wrap the footer text to the page once per page width.
+
+    Returns:
+        tuple: (x, line) pairs, centered on the page, top line first
+    """
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    words = text.split()
+    lines = []
+    current_line = []
+    current_width = 0
+    max_width = page_width - margin
+
+    for word in words:
+        word_width = stringWidth(word + ' ', font_name, font_size)
+        if current_width + word_width <= max_width:
+            current_line.append(word)
+            current_width += word_width
+        else:
+            lines.append(' '.join(current_line))
+            current_line = [word]
+            current_width = word_width
+
+    if current_line:
+        lines.append(' '.join(current_line))
+
+    # Centered with the regular face's width, as the footer has always been laid out
+    return tuple(((page_width - stringWidth(line, 'Calibri', font_size)) / 2, line) for line in lines)
+
+
+# Table layout shared by every MEL table: heading rows in 12pt bold white on dark blue (#17365d), data rows in 10pt,
+# 6pt side padding and a light grey rule below each row
+table_heading_color = (23 / 255, 54 / 255, 93 / 255)
+table_rule_color = (211 / 255, 211 / 255, 211 / 255)
+table_padding = 6
+
+
+class FastTable(Flowable):
+    """
+    MEL table drawn straight onto the canvas. Rows have a fixed height and columns a fixed width, so
+    the rows that fit on a page are known without measuring any cell and splitting is a slice.
+    The status and heading rows repeat on every page, like a Table with repeatRows.
+
+    Args:
+        col_widths (list): Column widths
+        header (list): Column headings
+        rows (list): Data rows; a cell is drawn as text, or centered in its cell if it is a Flowable
+        header_aligns (list): 'LEFT', 'CENTER' or 'RIGHT' for each heading
+        data_aligns (list): Alignment for each data column
+        status (tuple, optional): (title, total text) for a status row above the headings
+    """
+    heading_font = ('Calibri-Bold', 12)
+    data_font = ('Calibri', 10)
+    # 12pt leading plus top/bottom padding; text sits on padding + leading - font size
+    heading_height = 19
+    heading_baseline = 4
+    row_height = 18
+    row_baseline = 5
+
+    def __init__(self, col_widths, header, rows, header_aligns, data_aligns, status=None, start=0, stop=None):
+        Flowable.__init__(self)
+        self.hAlign = 'CENTER'
+        self.col_widths = col_widths
+        self.header = header
+        self.rows = rows
+        self.header_aligns = header_aligns
+        self.data_aligns = data_aligns
+        self.status = status
+        self.start = start
+        self.stop = len(rows) if stop is None else stop
+        self.width = sum(col_widths)
+        self.headings_height = self.heading_height * (2 if status else 1)
+
+    def _rows(self, start, stop):
+        return FastTable(self.col_widths, self.header, self.rows, self.header_aligns, self.data_aligns, self.status,
+                         start, stop)
+
+    def rows_per_page(self, avail_height):
+        """Data rows that fit below the headings in avail_height"""
+        return int((avail_height - self.headings_height) // self.row_height)
+
+    def wrap(self, availWidth, availHeight):
+        self.height = self.headings_height + (self.stop - self.start) * self.row_height
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        fits = self.rows_per_page(availHeight)
+        if fits < 1:
+            return []
+        if self.start + fits >= self.stop:
+            return [self]
+        return [self._rows(self.start, self.start + fits), self._rows(self.start + fits, self.stop)]
+
+    def draw(self):
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+
+        canvas = self.canv
+        col_positions = [sum(self.col_widths[:i]) for i in range(len(self.col_widths))]
+        canvas.saveState()
+
+        # Heading rows
+        y = self.height - self.headings_height
+        canvas.setFillColorRGB(*table_heading_color)
+        canvas.rect(0, y, self.width, self.headings_height, stroke=0, fill=1)
+        canvas.setFillColorRGB(1, 1, 1)
+        headings = [(self.header, self.header_aligns)]
+        if self.status:
+            title, total = self.status
+            status_row = [title] + [''] * (len(self.col_widths) - 2) + [total]
+            headings.insert(0, (status_row, ['LEFT'] * (len(self.col_widths) - 1) + ['RIGHT']))
+        text = canvas.beginText()
+        rule_ys = []
+        y = self.height
+        for cells, aligns in headings:
+            y -= self.heading_height
+            rule_ys.append(y)
+            self._add_text(text, stringWidth, self.heading_font, cells, aligns, col_positions, y + self.heading_baseline)
+        canvas.drawText(text)
+
+        # Data rows
+        canvas.setFillColorRGB(0, 0, 0)
+        text = canvas.beginText()
+        flowable_cells = []
+        for row in self.rows[self.start:self.stop]:
+            y -= self.row_height
+            rule_ys.append(y)
+            self._add_text(text, stringWidth, self.data_font, row, self.data_aligns, col_positions,
+                           y + self.row_baseline, flowable_cells)
+        canvas.drawText(text)
+        for cell, x, y, width in flowable_cells:
+            cell_width, cell_height = cell.wrap(width - 2 * table_padding, self.row_height)
+            cell.drawOn(canvas, x + (width - cell_width) / 2, y + (self.row_height - cell_height) / 2)
+
+        # Rule below every row
+        canvas.setStrokeColorRGB(*table_rule_color)
+        canvas.setLineWidth(0.5)
+        canvas.setLineCap(1)
+        canvas.setLineJoin(1)
+        canvas.lines([(0, rule_y, self.width, rule_y) for rule_y in rule_ys])
+        canvas.restoreState()
+
+    def _add_text(self, text, stringWidth, font, cells, aligns, col_positions, baseline, flowable_cells=None):
+        font_name, font_size = font
+        text.setFont(font_name, font_size)
+        for cell, align, x, width in zip(cells, aligns, col_positions, self.col_widths):
+            if isinstance(cell, Flowable):
+                flowable_cells.append((cell, x, baseline - self.row_baseline, width))
+                continue
+            value = str(cell)
+            if not value:
+                continue
+            if align == 'LEFT':
+                x += table_padding
+            elif align == 'RIGHT':
+                x += width - table_padding - stringWidth(value, font_name, font_size)
+            else:
+                x += (width - stringWidth(value, font_name, font_size)) / 2
+            text.setTextOrigin(x, baseline)
+            text.textOut(value)
+
+
+def render_jobs(render, jobs, workers=1):
+    """
+    Call render(*job) for every job, optionally across a process pool.
+
+    Args:
+        render (callable): Module-level render function (must be picklable)
+        jobs (list): Argument tuples, one per document
+        workers (int, optional): Worker processes. 1 renders serially; None uses every CPU
+
+    Returns:
+        list: render results in the same order as jobs
+    """
+    if workers == 1 or len(jobs) <= 1:
+        return [render(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(render, *zip(*jobs)))
@@ -0,0 +1,164 @@
+import contextlib
+import json
+import time
+import tracemalloc
+
+# Stage timings are only recorded between start_timing and stop_timing; otherwise stage() does nothing.
+# Stages run in worker processes (render_jobs with workers != 1) are not recorded.
+_enabled = False
+_track_memory = False
+_records = []
+_stack = []
+
+
+def start_timing(memory=False):
+    """
+    Start recording pipeline stages, clearing earlier records.
+
+    Args:
+        memory (bool, optional): Also record each stage's peak traced memory. tracemalloc slows
+            the run down considerably, so timings taken with it are not comparable to ones without
+    """
+    global _enabled, _track_memory
+    _records.clear()
+    _stack.clear()
+    _enabled = True
+    _track_memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def stop_timing():
+    """Stop recording and return the records (see stage)"""
+    global _enabled, _track_memory
+    if _track_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _enabled = False
+    _track_memory = False
+    return list(_records)
+
+
+def get_timings():
+    return list(_records)
+
+
+@contextlib.contextmanager
+def stage(name, rows=None, pascode=None):
+    """
+    Record wall time, CPU time, rows and (when enabled) peak memory for the enclosed block.
+
+    Args:
+        name (str): Stage name, e.g. 'render.initial_pascode'
+        rows (int, optional): Rows the stage handles; can also be set on the yielded record
+        pascode (str, optional): PASCODE the stage works on
+
+    Yields:
+        dict: The stage's record: stage, pascode, rows, depth (nesting level), wall_seconds,
+            cpu_seconds and peak_memory_bytes (above the memory in use when the stage started)
+    """
+    entry = {'stage': name, 'pascode': pascode, 'rows': rows, 'depth': len(_stack)}
+    if not _enabled:
+        yield entry
+        return
+
+    if _track_memory:
+        # The traced peak is process wide: hand the peak so far to the enclosing stage, then reset it
+        current, peak = tracemalloc.get_traced_memory()
+        if _stack:
+            _stack[-1]['_peak'] = max(_stack[-1]['_peak'], peak)
+        tracemalloc.reset_peak()
+        entry['_start_memory'] = entry['_peak'] = current
+    _stack.append(entry)
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    try:
+        yield entry
+    finally:
+        entry['wall_seconds'] = time.perf_counter() - start_wall
+        entry['cpu_seconds'] = time.process_time() - start_cpu
+        _stack.pop()
+        if _track_memory:
+            peak = max(entry.pop('_peak'), tracemalloc.get_traced_memory()[1])
+            entry['peak_memory_bytes'] = peak - entry.pop('_start_memory')
+            if _stack:
+                _stack[-1]['_peak'] = max(_stack[-1]['_peak'], peak)
+        _records.append(entry)
+
+
+def timing_summary(records=None):
+    """
+    Totals per stage name, in the order stages first finished.
+
+    Returns:
+        list: dicts with stage, calls, wall_seconds, cpu_seconds, rows and peak_memory_bytes (largest call)
+    """
+    summary = {}
+    for record in get_timings() if records is None else records:
+        totals = summary.setdefault(record['stage'], {
+            'stage': record['stage'], 'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'rows': 0,
+            'peak_memory_bytes': None
+        })
+        totals['calls'] += 1
+        totals['wall_seconds'] += record['wall_seconds']
+        totals['cpu_seconds'] += record['cpu_seconds']
+        totals['rows'] += record['rows'] or 0
+        if record.get('peak_memory_bytes') is not None:
+            totals['peak_memory_bytes'] = max(totals['peak_memory_bytes'] or 0, record['peak_memory_bytes'])
+    return list(summary.values())
+
+
+def format_timing_summary(records=None):
+    """Summary table, one line per stage"""
+    lines = [f"{'STAGE':<34} {'CALLS':>6} {'WALL (s)':>10} {'CPU (s)':>10} {'ROWS':>9} {'PEAK MEM':>10}"]
+    for totals in timing_summary(records):
+        peak = totals['peak_memory_bytes']
+        peak_text = '-' if peak is None else f"{peak / 2 ** 20:.1f} MB"
+        lines.append(f"{totals['stage']:<34} {totals['calls']:>6} {totals['wall_seconds']:>10.3f} "
+                     f"{totals['cpu_seconds']:>10.3f} {totals['rows']:>9} {peak_text:>10}")
+    return '\n'.join(lines)
+
+
+def print_timing_summary(records=None):
+    print(format_timing_summary(records))
+
+
+def write_timing_json(path, records=None):
+    """Write the per-stage summary and every record (including per-PASCODE ones) to a JSON file"""
+    records = get_timings() if records is None else records
+    with open(path, 'w') as f:
+        json.dump({'stages': timing_summary(records), 'records': records}, f, indent=2)
+    return path
+
+
+@contextlib.contextmanager
+def profile(output_path, profiler='cprofile'):
+    """
+    Profile the enclosed block and write the result to output_path.
+
+    Args:
+        output_path (str): cProfile writes pstats data (view with pstats or snakeviz); pyinstrument
+            writes HTML when the path ends in .html and text otherwise
+        profiler (str, optional): 'cprofile' or 'pyinstrument'
+    """
+    if profiler == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise ImportError("pyinstrument is required for --profiler pyinstrument; use cprofile instead")
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield profiler
+        finally:
+            profiler.stop()
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html() if output_path.lower().endswith('.html') else profiler.output_text())
+        return
+
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(output_path)
@@ -1,3 +1,199 @@
+from bisect import bisect_right
+from functools import lru_cache
+
+# Lookup tables based on the document's Tables 4.7 and 4.8
+sra_table = [
+    ((11, 12), (1, 1)),
+    ((13, 17), (1, 2)),
+    ((18, 22), (1, 3)),
+    ((23, 27), (1, 4)),
+    ((28, 29), (1, 5)),
+    ((30, 37), (2, 5)),
+    ((38, 42), (2, 6)),
+    ((43, 47), (2, 7)),
+    ((48, 49), (2, 8)),
+    ((50, 57), (3, 8)),
+    ((58, 62), (3, 9)),
+    ((63, 67), (3, 10)),
+    ((68, 69), (3, 11)),
+    ((70, 77), (4, 11)),
+    ((78, 82), (4, 12)),
+    ((83, 87), (4, 13)),
+    ((88, 89), (4, 14)),
+    ((90, 97), (5, 14)),
+    ((98, 102), (5, 15)),
+    ((103, 107), (5, 16)),
+    ((108, 109), (5, 17)),
+    ((110, 117), (6, 17)),
+    ((118, 122), (6, 18)),
+    ((123, 127), (6, 19)),
+    ((128, 129), (6, 20)),
+    ((130, 137), (7, 20)),
+    ((138, 142), (7, 21)),
+    ((143, 147), (7, 22)),
+    ((148, 149), (7, 23)),
+    ((150, 157), (8, 23)),
+    ((158, 162), (8, 24)),
+    ((163, 167), (8, 25)),
+    ((168, 177), (9, 26)),
+    ((178, 182), (9, 27)),
+    ((183, 187), (9, 28)),
+    ((188, 189), (9, 29)),
+    ((190, 197), (10, 29)),
+    ((198, 202), (10, 30)),
+    ((203, 207), (10, 31)),
+    ((208, 209), (10, 32)),
+    ((210, 217), (11, 32)),
+    ((218, 222), (11, 33)),
+    ((223, 227), (11, 34)),
+    ((228, 229), (11, 35)),
+    ((230, 237), (12, 35)),
+    ((238, 242), (12, 36)),
+    ((243, 247), (12, 37)),
+    ((248, 249), (12, 38)),
+    ((250, 257), (13, 38)),
+    ((258, 262), (13, 39)),
+    ((263, 267), (13, 40)),
+    ((268, 269), (13, 41)),
+    ((270, 277), (14, 41)),
+    ((278, 282), (14, 42)),
+    ((283, 287), (14, 43)),
+    ((288, 289), (14, 44)),
+    ((290, 297), (15, 44)),
+    ((298, 302), (15, 45)),
+    ((303, 307), (15, 46)),
+    ((308, 309), (15, 47)),
+    ((310, 317), (16, 47)),
+    ((318, 322), (16, 48)),
+    ((323, 327), (16, 49)),
+    ((328, 329), (16, 50)),
+    ((330, 337), (17, 50)),
+    ((338, 342), (17, 51)),
+    ((343, 347), (17, 52)),
+    ((348, 349), (17, 53)),
+    ((350, 357), (18, 53)),
+    ((358, 362), (18, 54)),
+    ((363, 369), (18, 56)),
+    ((370, 377), (19, 56)),
+    ((378, 382), (19, 57)),
+    ((383, 387), (19, 58)),
+    ((388, 389), (19, 59)),
+    ((390, 397), (20, 59)),
+    ((398, 402), (20, 60)),
+    ((403, 407), (20, 61)),
+    ((408, 409), (20, 62)),
+    ((410, 417), (21, 62)),
+    ((418, 422), (21, 63)),
+    ((423, 427), (21, 64)),
+    ((428, 429), (21, 65)),
+    ((430, 437), (22, 65)),
+    ((438, 442), (22, 66)),
+    ((443, 447), (22, 67)),
+    ((448, 449), (22, 68)),
+    ((450, 457), (23, 68)),
+    ((458, 462), (23, 69)),
+    ((463, 467), (23, 70)),
+    ((468, 469), (23, 71)),
+    ((470, 477), (24, 71)),
+    ((478, 482), (24, 72)),
+    ((483, 487), (24, 73)),
+    ((488, 489), (24, 74)),
+    ((490, 497), (25, 74)),
+    ((498, 500), (25, 75))
+]
+
+# SSgt and TSgt table (similar structure to SrA)
+ssg_tsgt_table = [
+    ((11, 16), (1, 1)),
+    ((17, 23), (1, 2)),
+    ((24, 29), (1, 3)),
+    ((30, 36), (2, 3)),
+    ((37, 43), (2, 4)),
+    ((44, 49), (2, 5)),
+    ((50, 56), (3, 5)),
+    ((57, 63), (3, 6)),
+    ((64, 69), (3, 7)),
+    ((70, 76), (4, 7)),
+    ((77, 83), (4, 8)),
+    ((84, 89), (4, 9)),
+    ((90, 96), (5, 9)),
+    ((97, 103), (5, 10)),
+    ((104, 109), (5, 11)),
+    ((110, 116), (6, 11)),
+    ((117, 123), (6, 12)),
+    ((124, 129), (6, 13)),
+    ((130, 136), (7, 13)),
+    ((137, 143), (7, 14)),
+    ((144, 149), (7, 15)),
+    ((150, 156), (8, 15)),
+    ((157, 163), (8, 16)),
+    ((164, 169), (8, 17)),
+    ((170, 176), (9, 17)),
+    ((177, 183), (9, 18)),
+    ((184, 189), (9, 19)),
+    ((190, 196), (10, 19)),
+    ((197, 203), (10, 20)),
+    ((204, 209), (10, 21)),
+    ((210, 216), (11, 21)),
+    ((217, 223), (11, 22)),
+    ((224, 229), (11, 23)),
+    ((230, 236), (12, 23)),
+    ((237, 243), (12, 24)),
+    ((244, 249), (12, 25)),
+    ((250, 256), (13, 25)),
+    ((257, 263), (13, 26)),
+    ((264, 269), (13, 27)),
+    ((270, 276), (14, 27)),
+    ((277, 283), (14, 28)),
+    ((284, 289), (14, 29)),
+    ((290, 296), (15, 29)),
+    ((297, 303), (15, 30)),
+    ((304, 309), (15, 31)),
+    ((310, 316), (16, 31)),
+    ((317, 323), (16, 32)),
+    ((324, 329), (16, 33)),
+    ((330, 336), (17, 33)),
+    ((337, 343), (17, 34)),
+    ((344, 349), (17, 35)),
+    ((350, 356), (18, 35)),
+    ((357, 363), (18, 36)),
+    ((364, 369), (18, 37)),
+    ((370, 376), (19, 37)),
+    ((377, 383), (19, 38)),
+    ((384, 389), (19, 39)),
+    ((390, 396), (20, 39)),
+    ((397, 403), (20, 40)),
+    ((404, 409), (20, 41)),
+    ((410, 416), (21, 41)),
+    ((417, 423), (21, 42)),
+    ((424, 429), (21, 43)),
+    ((430, 436), (22, 43)),
+    ((437, 443), (22, 44)),
+    ((444, 449), (22, 45)),
+    ((450, 456), (23, 45)),
+    ((457, 463), (23, 46)),
+    ((464, 469), (23, 47)),
+    ((470, 476), (24, 47)),
+    ((477, 483), (24, 48)),
+    ((484, 489), (24, 49)),
+    ((490, 496), (25, 49)),
+    ((497, 500), (25, 50))
+]
+
+# Units with fewer eligibles than this go on the senior rater pages of the initial MEL;
+# the final MEL labels units with up to this many eligibles SMALL
+small_unit_size = 10
+
+quota_tables = {
+    'SRA': sra_table,
+    'SSG': ssg_tsgt_table,
+    'TSG': ssg_tsgt_table
+}
+
+# Sorted range starts per rank, for bisect lookups
+quota_starts = {rank: [start for (start, end), quota in table] for rank, table in quota_tables.items()}
+
+
 def get_promotion_eligibility(total_eligible, rank='SrA'):
     """
     Determine Promote Now (PN) and Must Promote (MP) based on total eligible personnel.
@@ -9,202 +205,114 @@ def get_promotion_eligibility(total_eligible, rank='SrA'):
     Returns:
         tuple: (Promote Now (PN), Must Promote (MP))
     """
-    # Lookup tables based on the document's Tables 4.7 and 4.8
-    sra_table = [
-        ((11, 12), (1, 1)),
-        ((13, 17), (1, 2)),
-        ((18, 22), (1, 3)),
-        ((23, 27), (1, 4)),
-        ((28, 29), (1, 5)),
-        ((30, 37), (2, 5)),
-        ((38, 42), (2, 6)),
-        ((43, 47), (2, 7)),
-        ((48, 49), (2, 8)),
-        ((50, 57), (3, 8)),
-        ((58, 62), (3, 9)),
-        ((63, 67), (3, 10)),
-        ((68, 69), (3, 11)),
-        ((70, 77), (4, 11)),
-        ((78, 82), (4, 12)),
-        ((83, 87), (4, 13)),
-        ((88, 89), (4, 14)),
-        ((90, 97), (5, 14)),
-        ((98, 102), (5, 15)),
-        ((103, 107), (5, 16)),
-        ((108, 109), (5, 17)),
-        ((110, 117), (6, 17)),
-        ((118, 122), (6, 18)),
-        ((123, 127), (6, 19)),
-        ((128, 129), (6, 20)),
-        ((130, 137), (7, 20)),
-        ((138, 142), (7, 21)),
-        ((143, 147), (7, 22)),
-        ((148, 149), (7, 23)),
-        ((150, 157), (8, 23)),
-        ((158, 162), (8, 24)),
-        ((163, 167), (8, 25)),
-        ((168, 177), (9, 26)),
-        ((178, 182), (9, 27)),
-        ((183, 187), (9, 28)),
-        ((188, 189), (9, 29)),
-        ((190, 197), (10, 29)),
-        ((198, 202), (10, 30)),
-        ((203, 207), (10, 31)),
-        ((208, 209), (10, 32)),
-        ((210, 217), (11, 32)),
-        ((218, 222), (11, 33)),
-        ((223, 227), (11, 34)),
-        ((228, 229), (11, 35)),
-        ((230, 237), (12, 35)),
-        ((238, 242), (12, 36)),
-        ((243, 247), (12, 37)),
-        ((248, 249), (12, 38)),
-        ((250, 257), (13, 38)),
-        ((258, 262), (13, 39)),
-        ((263, 267), (13, 40)),
-        ((268, 269), (13, 41)),
-        ((270, 277), (14, 41)),
-        ((278, 282), (14, 42)),
-        ((283, 287), (14, 43)),
-        ((288, 289), (14, 44)),
-        ((290, 297), (15, 44)),
-        ((298, 302), (15, 45)),
-        ((303, 307), (15, 46)),
-        ((308, 309), (15, 47)),
-        ((310, 317), (16, 47)),
-        ((318, 322), (16, 48)),
-        ((323, 327), (16, 49)),
-        ((328, 329), (16, 50)),
-        ((330, 337), (17, 50)),
-        ((338, 342), (17, 51)),
-        ((343, 347), (17, 52)),
-        ((348, 349), (17, 53)),
-        ((350, 357), (18, 53)),
-        ((358, 362), (18, 54)),
-        ((363, 369), (18, 56)),
-        ((370, 377), (19, 56)),
-        ((378, 382), (19, 57)),
-        ((383, 387), (19, 58)),
-        ((388, 389), (19, 59)),
-        ((390, 397), (20, 59)),
-        ((398, 402), (20, 60)),
-        ((403, 407), (20, 61)),
-        ((408, 409), (20, 62)),
-        ((410, 417), (21, 62)),
-        ((418, 422), (21, 63)),
-        ((423, 427), (21, 64)),
-        ((428, 429), (21, 65)),
-        ((430, 437), (22, 65)),
-        ((438, 442), (22, 66)),
-        ((443, 447), (22, 67)),
-        ((448, 449), (22, 68)),
-        ((450, 457), (23, 68)),
-        ((458, 462), (23, 69)),
-        ((463, 467), (23, 70)),
-        ((468, 469), (23, 71)),
-        ((470, 477), (24, 71)),
-        ((478, 482), (24, 72)),
-        ((483, 487), (24, 73)),
-        ((488, 489), (24, 74)),
-        ((490, 497), (25, 74)),
-        ((498, 500), (25, 75))
-    ]
-
-    # SSgt and TSgt table (similar structure to SrA)
-    ssg_tsgt_table = [
-        ((11, 16), (1, 1)),
-        ((17, 23), (1, 2)),
-        ((24, 29), (1, 3)),
-        ((30, 36), (2, 3)),
-        ((37, 43), (2, 4)),
-        ((44, 49), (2, 5)),
-        ((50, 56), (3, 5)),
-        ((57, 63), (3, 6)),
-        ((64, 69), (3, 7)),
-        ((70, 76), (4, 7)),
-        ((77, 83), (4, 8)),
-        ((84, 89), (4, 9)),
-        ((90, 96), (5, 9)),
-        ((97, 103), (5, 10)),
-        ((104, 109), (5, 11)),
-        ((110, 116), (6, 11)),
-        ((117, 123), (6, 12)),
-        ((124, 129), (6, 13)),
-        ((130, 136), (7, 13)),
-        ((137, 143), (7, 14)),
-        ((144, 149), (7, 15)),
-        ((150, 156), (8, 15)),
-        ((157, 163), (8, 16)),
-        ((164, 169), (8, 17)),
-        ((170, 176), (9, 17)),
-        ((177, 183), (9, 18)),
-        ((184, 189), (9, 19)),
-        ((190, 196), (10, 19)),
-        ((197, 203), (10, 20)),
-        ((204, 209), (10, 21)),
-        ((210, 216), (11, 21)),
-        ((217, 223), (11, 22)),
-        ((224, 229), (11, 23)),
-        ((230, 236), (12, 23)),
-        ((237, 243), (12, 24)),
-        ((244, 249), (12, 25)),
-        ((250, 256), (13, 25)),
-        ((257, 263), (13, 26)),
-        ((264, 269), (13, 27)),
-        ((270, 276), (14, 27)),
-        ((277, 283), (14, 28)),
-        ((284, 289), (14, 29)),
-        ((290, 296), (15, 29)),
-        ((297, 303), (15, 30)),
-        ((304, 309), (15, 31)),
-        ((310, 316), (16, 31)),
-        ((317, 323), (16, 32)),
-        ((324, 329), (16, 33)),
-        ((330, 336), (17, 33)),
-        ((337, 343), (17, 34)),
-        ((344, 349), (17, 35)),
-        ((350, 356), (18, 35)),
-        ((357, 363), (18, 36)),
-        ((364, 369), (18, 37)),
-        ((370, 376), (19, 37)),
-        ((377, 383), (19, 38)),
-        ((384, 389), (19, 39)),
-        ((390, 396), (20, 39)),
-        ((397, 403), (20, 40)),
-        ((404, 409), (20, 41)),
-        ((410, 416), (21, 41)),
-        ((417, 423), (21, 42)),
-        ((424, 429), (21, 43)),
-        ((430, 436), (22, 43)),
-        ((437, 443), (22, 44)),
-        ((444, 449), (22, 45)),
-        ((450, 456), (23, 45)),
-        ((457, 463), (23, 46)),
-        ((464, 469), (23, 47)),
-        ((470, 476), (24, 47)),
-        ((477, 483), (24, 48)),
-        ((484, 489), (24, 49)),
-        ((490, 496), (25, 49)),
-        ((497, 500), (25, 50))
-    ]
-
-    # Select the appropriate table based on rank
-    lookup_table = []
-    if rank == 'SRA':
-        lookup_table = sra_table
-    elif rank == 'SSG' or rank == 'TSG':
-        lookup_table = ssg_tsgt_table
+    lookup_table = quota_tables.get(rank)
 
     # Find the matching range
-    if len(lookup_table) > 0:
-        for (start, end), (pn, mp) in lookup_table:
-            if start <= total_eligible <= end:
+    if lookup_table:
+        i = bisect_right(quota_starts[rank], total_eligible) - 1
+        if i >= 0:
+            (start, end), (pn, mp) = lookup_table[i]
+            if total_eligible <= end:
                 return mp, pn
 
     # If no matching range is found
     return 'NA', 'NA'
 
 
+@lru_cache(maxsize=None)
+def _quota_arrays(rank):
+    """(starts, ends, mp, pn) numpy arrays for a rank's quota table, built on first use"""
+    import numpy as np
+
+    table = quota_tables[rank]
+    starts = np.array([start for (start, end), quota in table])
+    ends = np.array([end for (start, end), quota in table])
+    # object arrays keep the quotas as Python ints, like get_promotion_eligibility returns them
+    mp = np.array([mp for _, (pn, mp) in table] + ['NA'], dtype=object)
+    pn = np.array([pn for _, (pn, mp) in table] + ['NA'], dtype=object)
+    return starts, ends, mp, pn
+
+
+def get_promotion_eligibility_batch(totals, rank='SrA'):
+    """
+    Look up PN/MP for many eligible counts with one numpy searchsorted over the range starts.
+
+    Args:
+        totals (iterable): Eligible counts, e.g. one per unit
+        rank (str, optional): Rank to look up. Defaults to 'SrA'.
+
+    Returns:
+        list: (mp, pn) tuples in the same order as totals, as returned by get_promotion_eligibility
+    """
+    import numpy as np
+
+    totals = np.asarray(totals, dtype=np.int64).reshape(-1)
+    if rank not in quota_tables:
+        return [('NA', 'NA')] * len(totals)
+
+    starts, ends, mp, pn = _quota_arrays(rank)
+    i = np.searchsorted(starts, totals, side='right') - 1
+    # Counts below the first range or past a range's end point at the trailing 'NA'
+    found = (i >= 0) & (totals <= ends[np.maximum(i, 0)])
+    i = np.where(found, i, len(starts))
+    return list(zip(mp[i], pn[i]))
+
+
+def build_unit_quotas(eligible_df, rank, pascode_srids=None, pascode_column='ASSIGNED_PAS'):
+    """
+    Count eligibles and look up PN/MP for every PASCODE and SRID in one pass.
+
+    Args:
+        eligible_df (pd.DataFrame): Eligible members, one row each
+        rank (str): Cycle rank used for the quota tables
+        pascode_srids (dict, optional): PASCODE -> SRID. Without it the SRID table is empty
+        pascode_column (str, optional): Column holding the PASCODE
+
+    Returns:
+        tuple: (pascode_quotas, srid_quotas) DataFrames indexed by PASCODE and SRID.
+            pascode_quotas has 'eligible', 'small_unit', 'srid', 'mp' and 'pn'. srid_quotas has one row per
+            SRID in pascode_srids with 'eligible', 'small_unit_eligible', 'mp' and 'pn', where the quota is
+            for every small unit eligible in the roster, as on the senior rater pages
+    """
+    import pandas as pd
+
+    pascode_srids = pascode_srids or {}
+    counts = eligible_df[pascode_column].value_counts().sort_index()
+    pascode_quotas = pd.DataFrame({'eligible': counts.astype(int)})
+    pascode_quotas.index.name = pascode_column
+    pascode_quotas['small_unit'] = pascode_quotas['eligible'] < small_unit_size
+    pascode_quotas['srid'] = pascode_quotas.index.map(pascode_srids)
+    pascode_quotas['mp'], pascode_quotas['pn'] = _quota_columns(pascode_quotas['eligible'], rank)
+
+    units = pascode_quotas.dropna(subset=['srid'])
+    srid_quotas = pd.DataFrame({
+        'eligible': units.groupby('srid')['eligible'].sum(),
+        'small_unit_eligible': units['eligible'].where(units['small_unit'], 0).groupby(units['srid']).sum()
+    }).reindex(sorted(set(pascode_srids.values())), fill_value=0).astype(int)
+    srid_quotas.index.name = 'srid'
+    small_unit_total = int(pascode_quotas.loc[pascode_quotas['small_unit'], 'eligible'].sum())
+    srid_quotas['mp'], srid_quotas['pn'] = get_promotion_eligibility(small_unit_total, rank)
+    return pascode_quotas, srid_quotas
+
+
+def _quota_columns(totals, rank):
+    quotas = get_promotion_eligibility_batch(totals, rank)
+    return [mp for mp, pn in quotas], [pn for mp, pn in quotas]
+
+
+def get_unit_quota(quotas, key):
+    """
+    Read one row of a build_unit_quotas table.
+
+    Returns:
+        tuple: (eligible, mp, pn). Units missing from the table have no eligibles: (0, 'NA', 'NA')
+    """
+    if key not in quotas.index:
+        return 0, 'NA', 'NA'
+    row = quotas.loc[key]
+    return int(row['eligible']), row['mp'], row['pn']
+
+
 # Usage in your PDF generation code
 # def add_promotion_eligibility_data(canvas, doc, text_start_x, text_start_y, line_height):
 #     """
@@ -241,7 +349,3 @@ def get_promotion_eligibility(total_eligible, rank='SrA'):
 
 # In your main PDF generation code
 # add_promotion_eligibility_data(canvas, doc, text_start_x, text_start_y, line_height)
-
-mp,pn = get_promotion_eligibility(24, 'SSG')
-print(f'must promote: {mp}')
-print(f'promote now: {pn}')
\ No newline at end of file
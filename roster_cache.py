@@ -0,0 +1,93 @@
+import hashlib
+import os
+from roster_ingest import roster_columns
+from roster_sources import read_roster, get_roster_format, uncached_formats
+
+default_cache_dir = '.roster_cache'
+
+# Bump when roster_ingest changes the typed roster it produces
+cache_version = 2
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """SHA-256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_stem(alpha_roster_path):
+    """
+    Cache file prefix for one roster file: its name plus a short hash of its absolute path, so rosters with the
+    same name in different directories keep separate entries
+    """
+    path_key = hashlib.sha256(os.path.abspath(alpha_roster_path).encode()).hexdigest()[:8]
+    # The extension stays in the name so roster.xlsx and roster.csv do not replace each other's cache
+    return f'{os.path.basename(alpha_roster_path)}-{path_key}'
+
+
+def get_cache_path(alpha_roster_path, cache_dir=default_cache_dir):
+    """Cache file for the current contents of the roster; any change to the file gives a new path"""
+    key = hashlib.sha256(
+        f"{cache_version}|{','.join(roster_columns)}|{file_hash(alpha_roster_path)}".encode()
+    ).hexdigest()[:32]
+    return os.path.join(cache_dir, f'{cache_stem(alpha_roster_path)}-{key}.arrow')
+
+
+def _remove_stale_entries(cache_path):
+    cache_dir = os.path.dirname(cache_path)
+    # Drop the content key; the stem holds the roster's name and path hash
+    stem = os.path.basename(cache_path).rsplit('-', 1)[0]
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.endswith('.arrow') and name.rsplit('-', 1)[0] == stem and path != cache_path:
+            try:
+                os.remove(path)
+            except Exception as e:
+                print(f"Warning: Could not remove stale roster cache {path}: {e}")
+
+
+def _feather():
+    """pyarrow.feather, imported on first use; None when pyarrow is not installed"""
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return None
+    return feather
+
+
+def load_alpha_roster(alpha_roster_path, cache_dir=default_cache_dir):
+    """
+    Load the typed roster, reusing an Arrow IPC copy when the file has not changed.
+
+    Args:
+        alpha_roster_path (str): Path to the Alpha Roster Excel, CSV or Parquet file (see roster_sources)
+        cache_dir (str, optional): Directory for cached rosters. None disables the cache, as do Parquet rosters
+
+    Returns:
+        pd.DataFrame: Same frame as roster_ingest.read_alpha_roster
+    """
+    feather = _feather() if cache_dir is not None else None
+    if feather is None or get_roster_format(alpha_roster_path) in uncached_formats:
+        return read_roster(alpha_roster_path)
+
+    cache_path = get_cache_path(alpha_roster_path, cache_dir)
+    if os.path.exists(cache_path):
+        try:
+            return feather.read_table(cache_path, memory_map=True).to_pandas()
+        except Exception as e:
+            print(f"Warning: Could not read roster cache {cache_path}, re-reading workbook: {e}")
+
+    roster = read_roster(alpha_roster_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f'{cache_path}.tmp'
+        # uncompressed so later runs can memory-map the file
+        feather.write_feather(roster, temp_path, compression='uncompressed')
+        os.replace(temp_path, cache_path)
+        _remove_stale_entries(cache_path)
+    except Exception as e:
+        print(f"Warning: Could not write roster cache {cache_path}: {e}")
+    return roster
@@ -0,0 +1,186 @@
+import argparse
+import numpy as np
+import pandas as pd
+from eligibility_engine import ELIGIBLE, BTZ, INELIGIBLE
+from excel_parser import load_roster, sort_members
+
+# FULL_NAME alone repeats across a wing; with the service date it identifies a member between snapshots
+default_member_key = ['FULL_NAME', 'TAFMSD']
+
+# Members who are on station but not on this cycle's MEL
+NOT_LISTED = 'not listed'
+
+# Change labels, most significant first; a member gets the first that applies
+ADDED = 'added'
+REMOVED = 'removed'
+NEWLY_ELIGIBLE = 'newly eligible'
+DROPPED_TO_INELIGIBLE = 'dropped to ineligible'
+STATUS_CHANGED = 'status changed'
+REASON_CHANGED = 'reason changed'
+MOVED_PASCODE = 'moved pascode'
+UNCHANGED = 'unchanged'
+
+
+def member_statuses(roster, cycle, year, key=default_member_key):
+    """
+    MEL status of every member for one cycle, from the same sort as the MELs.
+
+    Args:
+        roster (pd.DataFrame): Typed roster from load_roster
+        cycle (str): Promotion cycle (e.g., 'SSG')
+        year (int): Year for promotion cycle
+        key (list, optional): Columns identifying a member
+
+    Returns:
+        pd.DataFrame: key columns, ASSIGNED_PAS, GRADE, STATUS (eligible, btz, ineligible or not listed) and REASON
+    """
+    mel_data = sort_members(roster, cycle, year)
+    statuses = roster[list(dict.fromkeys(key + ['ASSIGNED_PAS', 'GRADE']))].copy()
+    statuses['STATUS'] = NOT_LISTED
+    statuses['REASON'] = None
+    statuses.loc[mel_data['eligible_df'].index, 'STATUS'] = ELIGIBLE
+    statuses.loc[mel_data['btz_df'].index, 'STATUS'] = BTZ
+    ineligible_df = mel_data['ineligible_df']
+    statuses.loc[ineligible_df.index, 'STATUS'] = INELIGIBLE
+    statuses.loc[ineligible_df.index, 'REASON'] = ineligible_df['REASON']
+    return statuses
+
+
+def _with_occurrence(statuses, key):
+    # Members sharing a key are paired one to one (ordered by PASCODE and grade, not roster row order)
+    # rather than multiplied by the join
+    statuses = statuses.sort_values(list(dict.fromkeys(key + ['ASSIGNED_PAS', 'GRADE'])), kind='stable')
+    statuses['_OCCURRENCE'] = statuses.groupby(key, dropna=False, sort=False).cumcount()
+    return statuses
+
+
+def _pair_members(old, new, key):
+    """
+    Add a _PAIR column so old and new members join one to one on key + _PAIR.
+
+    Members sharing a key pair with one in the same PASCODE first, so one of them moving does not re-pair the
+    others; the members left over pair by key in PASCODE and grade order.
+    """
+    exact_key = list(dict.fromkeys(key + ['ASSIGNED_PAS']))
+    old = _with_occurrence(old, exact_key)
+    new = _with_occurrence(new, exact_key)
+    columns = exact_key + ['_OCCURRENCE']
+    exact = old[columns].assign(_OLD_ROW=np.arange(len(old))).merge(
+        new[columns].assign(_NEW_ROW=np.arange(len(new))), on=columns)
+
+    # Exact pairs get negative ids, the rest their occurrence among the unpaired members of their key
+    pair_ids = -1 - np.arange(len(exact))
+    for statuses, rows in ((old, exact['_OLD_ROW']), (new, exact['_NEW_ROW'])):
+        pair = np.zeros(len(statuses), dtype=np.int64)
+        pair[rows.to_numpy()] = pair_ids
+        unpaired = np.ones(len(statuses), dtype=bool)
+        unpaired[rows.to_numpy()] = False
+        # Still in key, PASCODE and grade order from _with_occurrence
+        pair[unpaired] = statuses[unpaired].groupby(key, dropna=False, sort=False).cumcount().to_numpy()
+        statuses['_PAIR'] = pair
+    return old, new
+
+
+def diff_statuses(old, new, key=default_member_key):
+    """
+    Join two member_statuses frames on the member key and label every member's change.
+
+    Returns:
+        pd.DataFrame: key columns, GRADE, PASCODE_OLD/NEW, STATUS_OLD/NEW, REASON_OLD/NEW, CHANGE (see the change
+            labels) and MOVED (PASCODE differs, whatever the CHANGE). Unchanged members are included.
+    """
+    join_key = key + ['_PAIR']
+    old, new = _pair_members(old, new, key)
+    old = old.drop(columns='_OCCURRENCE').rename(columns={'ASSIGNED_PAS': 'PASCODE', 'GRADE': 'GRADE_OLD'})
+    new = new.drop(columns='_OCCURRENCE').rename(columns={'ASSIGNED_PAS': 'PASCODE', 'GRADE': 'GRADE_NEW'})
+    diff = old.merge(new, on=join_key, how='outer', suffixes=('_OLD', '_NEW'), indicator=True, sort=False)
+
+    in_old = (diff['_merge'] != 'right_only').to_numpy()
+    in_new = (diff['_merge'] != 'left_only').to_numpy()
+    status_old = diff['STATUS_OLD'].to_numpy(dtype=object)
+    status_new = diff['STATUS_NEW'].to_numpy(dtype=object)
+    listed_old = np.isin(status_old, [ELIGIBLE, BTZ])
+    listed_new = np.isin(status_new, [ELIGIBLE, BTZ])
+    reason_old = diff['REASON_OLD'].fillna('').to_numpy(dtype=object)
+    reason_new = diff['REASON_NEW'].fillna('').to_numpy(dtype=object)
+    moved = in_old & in_new & (diff['PASCODE_OLD'].fillna('').to_numpy(dtype=object)
+                               != diff['PASCODE_NEW'].fillna('').to_numpy(dtype=object))
+
+    diff['CHANGE'] = np.select(
+        [
+            ~in_old,
+            ~in_new,
+            listed_new & ~listed_old,
+            listed_old & (status_new == INELIGIBLE),
+            status_old != status_new,
+            (status_new == INELIGIBLE) & (reason_old != reason_new),
+            moved,
+        ],
+        [ADDED, REMOVED, NEWLY_ELIGIBLE, DROPPED_TO_INELIGIBLE, STATUS_CHANGED, REASON_CHANGED, MOVED_PASCODE],
+        default=UNCHANGED
+    )
+    diff['MOVED'] = moved
+    diff['GRADE'] = diff['GRADE_NEW'].where(in_new, diff['GRADE_OLD'])
+    columns = key + ['GRADE', 'PASCODE_OLD', 'PASCODE_NEW', 'STATUS_OLD', 'STATUS_NEW', 'REASON_OLD', 'REASON_NEW',
+                     'CHANGE', 'MOVED']
+    return diff[columns]
+
+
+def diff_rosters(old_roster, new_roster, cycle, year, key=default_member_key):
+    """
+    Status and reason transitions between two roster snapshots for one cycle.
+
+    Args:
+        old_roster (pd.DataFrame): Earlier typed roster
+        new_roster (pd.DataFrame): Later typed roster
+        cycle (str): Promotion cycle (e.g., 'SSG')
+        year (int): Year for promotion cycle
+        key (list, optional): Columns identifying a member in both snapshots
+
+    Returns:
+        pd.DataFrame: Changed members only, see diff_statuses
+    """
+    diff = diff_statuses(member_statuses(old_roster, cycle, year, key), member_statuses(new_roster, cycle, year, key),
+                         key)
+    return diff[diff['CHANGE'] != UNCHANGED].reset_index(drop=True)
+
+
+def summarize_by_pascode(diff):
+    """
+    Count changes per PASCODE. Members who moved count under their new PASCODE, removed members under their old one.
+
+    Returns:
+        pd.DataFrame: One row per PASCODE, one column per change label
+    """
+    pascode = diff['PASCODE_NEW'].fillna(diff['PASCODE_OLD'])
+    return pd.crosstab(pascode.rename('PASCODE'), diff['CHANGE']).rename_axis(columns=None)
+
+
+def changed_pascodes(diff):
+    """Every PASCODE whose MEL pages a change touches (old and new PASCODE of each changed member)"""
+    return set(diff['PASCODE_OLD'].dropna()) | set(diff['PASCODE_NEW'].dropna())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report MEL status changes between two Alpha Roster snapshots.')
+    parser.add_argument('old_roster', help='Earlier Alpha Roster (Excel, CSV or Parquet)')
+    parser.add_argument('new_roster', help='Later Alpha Roster (Excel, CSV or Parquet)')
+    parser.add_argument('--cycle', required=True, type=str.upper, help='Promotion cycle (e.g., SSG)')
+    parser.add_argument('--year', required=True, type=int, help='Promotion year')
+    parser.add_argument('--key', nargs='+', default=default_member_key, help='Columns identifying a member')
+    parser.add_argument('--output', help='CSV file for every changed member')
+    args = parser.parse_args(argv)
+
+    diff = diff_rosters(load_roster(args.old_roster), load_roster(args.new_roster), args.cycle, args.year, args.key)
+    if diff.empty:
+        print("No MEL status changes")
+        return
+    print(summarize_by_pascode(diff).to_string())
+    print(f"{len(diff)} members changed in {len(changed_pascodes(diff))} pascodes")
+    if args.output:
+        diff.to_csv(args.output, index=False)
+        print(f"Wrote changes to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
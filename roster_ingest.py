@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+from date_utils import roster_date_format
+
+required_columns = ['FULL_NAME', 'GRADE', 'ASSIGNED_PAS_CLEARTEXT', 'DAFSC', 'DOR', 'DATE_ARRIVED_STATION', 'TAFMSD','REENL_ELIG_STATUS', 'ASSIGNED_PAS', 'CAFSC']
+optional_columns = ['GRADE_PERM_PROJ', 'UIF_CODE', 'UIF_DISPOSITION_DATE', '2AFSC', '3AFSC', '4AFSC']
+pdf_columns = ['FULL_NAME','GRADE', 'DATE_ARRIVED_STATION','DAFSC', 'ASSIGNED_PAS_CLEARTEXT', 'DOR', 'TAFMSD', 'ASSIGNED_PAS']
+roster_columns = required_columns + optional_columns
+
+date_columns = ['DOR', 'TAFMSD', 'DATE_ARRIVED_STATION', 'UIF_DISPOSITION_DATE']
+numeric_columns = ['UIF_CODE']
+roster_dtypes = {column: str for column in roster_columns if column not in date_columns + numeric_columns}
+roster_dtypes['UIF_CODE'] = 'float64'
+
+# Every reader returns dates in one unit; Excel, CSV and Parquet each default to a different one
+roster_date_dtype = 'datetime64[us]'
+
+# Cell text pandas reads as missing by default
+na_strings = {'', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA',
+              'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'}
+
+
+def parse_roster_dates(column):
+    """DD-MMM-YYYY text to datetime64, unparseable values to NaT. Each distinct date is parsed once."""
+    codes, uniques = pd.factorize(column)
+    dates = pd.to_datetime(uniques, format=roster_date_format, errors='coerce')
+    return pd.Series(dates.take(codes, allow_fill=True, fill_value=pd.NaT), index=column.index, name=column.name)
+
+
+def type_roster(roster):
+    """Prune a raw roster to the roster columns and convert the date columns to roster_date_dtype."""
+    roster = roster[roster_columns].copy()
+    for column in date_columns:
+        if not pd.api.types.is_datetime64_any_dtype(roster[column].dtype):
+            roster[column] = parse_roster_dates(roster[column])
+        roster[column] = roster[column].astype(roster_date_dtype)
+    return roster
+
+
+def read_alpha_roster(alpha_roster_path):
+    """
+    Read only the roster columns from an Alpha Roster workbook, with explicit dtypes.
+
+    Args:
+        alpha_roster_path (str): Path to the Alpha Roster Excel file
+
+    Returns:
+        pd.DataFrame: Roster with string, float (UIF_CODE) and datetime64 (date_columns) columns
+    """
+    roster = pd.read_excel(alpha_roster_path, usecols=roster_columns, dtype=roster_dtypes)
+    return type_roster(roster)
+
+
+def validate_required_fields(roster, columns=None):
+    """
+    Find every missing required value in one pass.
+
+    Args:
+        roster (pd.DataFrame): Typed roster
+        columns (list, optional): Columns that must be filled in. Defaults to required_columns
+
+    Returns:
+        dict: 'valid', 'errors' (list of (index, column) in row order), 'missing_by_column',
+            'rows_with_errors' and 'total_errors'
+    """
+    columns = required_columns if columns is None else columns
+    missing = roster[columns].isna()
+    rows, cols = np.nonzero(missing.to_numpy())
+    errors = list(zip(roster.index[rows], np.asarray(columns)[cols]))
+    missing_by_column = missing.sum()
+    return {
+        'valid': len(errors) == 0,
+        'errors': errors,
+        'missing_by_column': {column: int(count) for column, count in missing_by_column.items() if count > 0},
+        'rows_with_errors': int(missing.any(axis=1).sum()),
+        'total_errors': len(errors)
+    }
+
+
+def print_validation_errors(errors):
+    for index, column in errors:
+        print(rf"error at {index}, {column}")
+
+
+def print_validation_report(report):
+    print_validation_errors(report['errors'])
+    for column, count in report['missing_by_column'].items():
+        print(f"{column}: {count} missing")
+    print(f"{report['total_errors']} missing values in {report['rows_with_errors']} rows")
+
+
+def format_roster_dates(df):
+    """Format datetime columns as DD-MMM-YYYY strings for PDF output."""
+    df = df.copy()
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column].dtype):
+            df[column] = df[column].dt.strftime(roster_date_format).str.upper()
+    return df
@@ -0,0 +1,117 @@
+import os
+from roster_ingest import (roster_columns, date_columns, numeric_columns, roster_dtypes, na_strings, type_roster,
+                           read_alpha_roster)
+
+# pyarrow is optional for CSV (pandas reads it without) and required for Parquet; it is imported on first use
+
+
+def _pyarrow():
+    """(pyarrow, pyarrow.csv), or None when pyarrow is not installed"""
+    try:
+        import pyarrow
+        import pyarrow.csv
+    except ImportError:
+        return None
+    return pyarrow, pyarrow.csv
+
+
+def read_csv_roster(alpha_roster_path):
+    """
+    Read only the roster columns from a CSV export of the Alpha Roster, with dates as DD-MMM-YYYY text.
+
+    Uses pyarrow's multithreaded CSV reader when it is installed, pandas otherwise.
+
+    Returns:
+        pd.DataFrame: Same frame as read_alpha_roster
+    """
+    arrow = _pyarrow()
+    if arrow is None:
+        import pandas as pd
+
+        return type_roster(pd.read_csv(alpha_roster_path, usecols=roster_columns, dtype=roster_dtypes))
+
+    pa, pa_csv = arrow
+    column_types = {column: pa.float64() if column in numeric_columns else pa.string() for column in roster_columns}
+    convert_options = pa_csv.ConvertOptions(include_columns=roster_columns, column_types=column_types,
+                                            null_values=sorted(na_strings), strings_can_be_null=True)
+    return type_roster(pa_csv.read_csv(alpha_roster_path, convert_options=convert_options).to_pandas())
+
+
+def read_parquet_roster(alpha_roster_path):
+    """
+    Read only the roster columns from a Parquet export of the Alpha Roster.
+
+    Date columns may be timestamps, dates or DD-MMM-YYYY text; other columns are cast to the roster types.
+
+    Returns:
+        pd.DataFrame: Same frame as read_alpha_roster
+    """
+    if _pyarrow() is None:
+        raise ImportError(f"pyarrow is required to read {alpha_roster_path}; use an Excel or CSV roster instead")
+    import pyarrow.parquet as pq
+
+    return parquet_table_to_roster(pq.read_table(alpha_roster_path, columns=roster_columns))
+
+
+def parquet_table_to_roster(table):
+    """
+    Cast an Arrow table of the roster columns to the roster types and convert it to pandas.
+    Text columns treat na_strings as missing, like the Excel and CSV readers.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    missing_text = pa.array(sorted(na_strings))
+    for i, field in enumerate(table.schema):
+        if field.name in numeric_columns:
+            target = pa.float64()
+        elif field.name in date_columns:
+            if pa.types.is_timestamp(field.type):
+                target = field.type
+            else:
+                target = pa.timestamp('us') if pa.types.is_date(field.type) else pa.string()
+        else:
+            target = pa.string()
+        column = table.column(i)
+        if field.type != target:
+            column = column.cast(target)
+        if pa.types.is_string(target):
+            column = pc.if_else(pc.is_in(column, value_set=missing_text), pa.scalar(None, pa.string()), column)
+        table = table.set_column(i, field.name, column)
+    return type_roster(table.to_pandas(date_as_object=False))
+
+
+# File extension -> reader returning the typed roster. Add formats here.
+roster_readers = {
+    '.xlsx': read_alpha_roster,
+    '.xlsm': read_alpha_roster,
+    '.xls': read_alpha_roster,
+    '.csv': read_csv_roster,
+    '.parquet': read_parquet_roster,
+    '.pq': read_parquet_roster
+}
+
+# Formats that are already columnar, so the Arrow roster cache would only add a copy
+uncached_formats = ['.parquet', '.pq']
+
+
+def get_roster_format(alpha_roster_path):
+    """Lower-case file extension of a roster, checked against roster_readers"""
+    roster_format = os.path.splitext(alpha_roster_path)[1].lower()
+    if roster_format not in roster_readers:
+        raise ValueError(f"Unsupported roster format '{roster_format}' for {alpha_roster_path}; "
+                         f"expected one of {', '.join(roster_readers)}")
+    return roster_format
+
+
+def read_roster(alpha_roster_path):
+    """
+    Read an Alpha Roster from Excel, CSV or Parquet, choosing the reader by file extension.
+
+    Args:
+        alpha_roster_path (str): Path to the roster file
+
+    Returns:
+        pd.DataFrame: Roster with string, float (UIF_CODE) and datetime64 (date_columns) columns
+    """
+    return roster_readers[get_roster_format(alpha_roster_path)](alpha_roster_path)
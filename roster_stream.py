@@ -0,0 +1,175 @@
+from datetime import datetime
+from pipeline_timing import stage
+
+# pandas and openpyxl are imported inside the functions that use them, so importing this module stays cheap
+
+default_chunk_size = 20000
+
+
+def _cell_text(value, na_strings):
+    if isinstance(value, str) and value in na_strings:
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def _type_chunk(chunk):
+    """Type a chunk of raw cell values the way read_alpha_roster types the whole sheet"""
+    import pandas as pd
+    from roster_ingest import (roster_columns, date_columns, numeric_columns, na_strings, roster_date_dtype,
+                               parse_roster_dates)
+
+    for column in roster_columns:
+        values = chunk[column]
+        if column in numeric_columns:
+            chunk[column] = pd.to_numeric(values, errors='coerce').astype('float64')
+        elif column in date_columns:
+            # Cells can hold real Excel dates or DD-MMM-YYYY text
+            is_text = values.map(lambda value: isinstance(value, str))
+            dates = pd.to_datetime(values.where(values.map(lambda value: isinstance(value, datetime))),
+                                   errors='coerce')
+            dates[is_text] = parse_roster_dates(values[is_text])
+            chunk[column] = dates.astype(roster_date_dtype)
+        else:
+            chunk[column] = values.map(lambda value: _cell_text(value, na_strings), na_action='ignore')
+    return chunk
+
+
+def iter_excel_chunks(alpha_roster_path, chunk_size=default_chunk_size):
+    """
+    Read an Alpha Roster workbook a chunk of rows at a time with openpyxl's read-only mode.
+
+    Args:
+        alpha_roster_path (str): Path to the Alpha Roster Excel file
+        chunk_size (int, optional): Rows per chunk
+
+    Yields:
+        pd.DataFrame: Typed roster_columns for each chunk, indexed by row position in the sheet like read_alpha_roster
+    """
+    import pandas as pd
+    from openpyxl import load_workbook
+    from roster_ingest import roster_columns
+
+    workbook = load_workbook(alpha_roster_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        missing = [column for column in roster_columns if column not in header]
+        if missing:
+            raise ValueError(f"Alpha Roster is missing columns: {', '.join(missing)}")
+        positions = [header.index(column) for column in roster_columns]
+
+        start = 0
+        values = []
+        for row in rows:
+            values.append([row[i] if i < len(row) else None for i in positions])
+            if len(values) == chunk_size:
+                yield _type_chunk(pd.DataFrame(values, columns=roster_columns, index=pd.RangeIndex(start, start + chunk_size)))
+                start += chunk_size
+                values = []
+        # An empty sheet still gives one (empty) chunk, so callers always see the columns
+        if values or start == 0:
+            end = start + len(values)
+            yield _type_chunk(pd.DataFrame(values, columns=roster_columns, index=pd.RangeIndex(start, end)))
+    finally:
+        workbook.close()
+
+
+def iter_csv_chunks(alpha_roster_path, chunk_size=default_chunk_size):
+    """Read a CSV export of the Alpha Roster in chunks (see iter_excel_chunks)"""
+    import pandas as pd
+    from roster_ingest import roster_columns, roster_dtypes, type_roster
+
+    with pd.read_csv(alpha_roster_path, usecols=roster_columns, dtype=roster_dtypes, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            yield type_roster(chunk)
+
+
+def iter_parquet_chunks(alpha_roster_path, chunk_size=default_chunk_size):
+    """Read a Parquet export of the Alpha Roster in record batches (see iter_excel_chunks)"""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from roster_ingest import roster_columns
+    from roster_sources import parquet_table_to_roster
+
+    start = 0
+    with pq.ParquetFile(alpha_roster_path) as parquet_file:
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=roster_columns):
+            chunk = parquet_table_to_roster(pa.Table.from_batches([batch]))
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield chunk
+
+
+def iter_roster_chunks(alpha_roster_path, chunk_size=default_chunk_size):
+    """Typed roster chunks from an Excel workbook or a CSV or Parquet export (see roster_sources)"""
+    from roster_sources import get_roster_format
+
+    roster_format = get_roster_format(alpha_roster_path)
+    if roster_format == '.csv':
+        return iter_csv_chunks(alpha_roster_path, chunk_size)
+    if roster_format in ['.parquet', '.pq']:
+        return iter_parquet_chunks(alpha_roster_path, chunk_size)
+    return iter_excel_chunks(alpha_roster_path, chunk_size)
+
+
+def _merge_validation(total, report):
+    # Errors are printed chunk by chunk; only the counts are kept
+    for column, count in report['missing_by_column'].items():
+        total['missing_by_column'][column] = total['missing_by_column'].get(column, 0) + count
+    total['rows_with_errors'] += report['rows_with_errors']
+    total['total_errors'] += report['total_errors']
+    total['valid'] = total['valid'] and report['valid']
+
+
+def stream_mel_members(alpha_roster_path, cycle_years, chunk_size=default_chunk_size):
+    """
+    Sort a roster into the MEL member lists for several cycles in one pass, a chunk at a time.
+
+    Only the eligible, ineligible and BTZ rows of each cycle are kept, so memory follows the MEL size
+    rather than the roster size. Prints any missing required values like load_roster, as each chunk is read.
+
+    Args:
+        alpha_roster_path (str): Path to the Alpha Roster Excel, CSV or Parquet file
+        cycle_years (list): (cycle, year) pairs, e.g. [('SSG', 2025), ('TSG', 2025)]
+        chunk_size (int, optional): Rows read and evaluated at a time
+
+    Returns:
+        tuple: (dict of (cycle, year) -> sort_members output, number of members read)
+    """
+    import pandas as pd
+    from excel_parser import sort_members
+    from roster_ingest import validate_required_fields, print_validation_errors, print_validation_report
+
+    parts = {cycle_year: {'eligible_df': [], 'ineligible_df': [], 'btz_df': [], 'pascode_units': {}}
+             for cycle_year in cycle_years}
+    validation_report = {'valid': True, 'errors': [], 'missing_by_column': {}, 'rows_with_errors': 0, 'total_errors': 0}
+    members = 0
+    with stage('ingest.stream_roster') as timing:
+        for chunk in iter_roster_chunks(alpha_roster_path, chunk_size):
+            members += len(chunk)
+            chunk_report = validate_required_fields(chunk)
+            print_validation_errors(chunk_report['errors'])
+            _merge_validation(validation_report, chunk_report)
+            for (cycle, year), cycle_parts in parts.items():
+                mel_data = sort_members(chunk, cycle, year)
+                for key in ['eligible_df', 'ineligible_df', 'btz_df']:
+                    cycle_parts[key].append(mel_data[key])
+                # Like drop_duplicates on the whole roster, the first member seen names the unit
+                for pascode, unit in mel_data['pascode_units'].items():
+                    cycle_parts['pascode_units'].setdefault(pascode, unit)
+        timing['rows'] = members
+    if not validation_report['valid']:
+        print_validation_report(validation_report)
+
+    members_by_cycle = {}
+    for cycle_year, cycle_parts in parts.items():
+        pascode_units = cycle_parts['pascode_units']
+        members_by_cycle[cycle_year] = {
+            'eligible_df': pd.concat(cycle_parts['eligible_df']),
+            'ineligible_df': pd.concat(cycle_parts['ineligible_df']),
+            'btz_df': pd.concat(cycle_parts['btz_df']),
+            'pascodes': sorted(pascode_units),
+            'pascode_units': pascode_units
+        }
+    return members_by_cycle, members
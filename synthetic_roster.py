@@ -0,0 +1,185 @@
+import argparse
+import numpy as np
+import pandas as pd
+from roster_ingest import roster_columns, roster_date_format
+
+# Grade mix of a typical wing, junior enlisted heavy
+grade_weights = {
+    'AB': 0.02,
+    'AMN': 0.05,
+    'A1C': 0.15,
+    'SRA': 0.2,
+    'SSG': 0.25,
+    'TSG': 0.18,
+    'MSG': 0.1,
+    'SMS': 0.05
+}
+
+# Years of service a member usually has on reaching each grade
+grade_service_years = {
+    'AB': 0,
+    'AMN': 0.5,
+    'A1C': 1,
+    'SRA': 2.5,
+    'SSG': 5,
+    'TSG': 9,
+    'MSG': 13,
+    'SMS': 16
+}
+
+# Skill level (5th AFSC character) held at each grade
+grade_skill_levels = {
+    'AB': '1',
+    'AMN': '3',
+    'A1C': '3',
+    'SRA': '5',
+    'SSG': '5',
+    'TSG': '7',
+    'MSG': '7',
+    'SMS': '9'
+}
+
+next_grade = {
+    'A1C': 'SRA',
+    'SRA': 'SSG',
+    'SSG': 'TSG',
+    'TSG': 'MSG',
+    'MSG': 'SMS',
+    'SMS': 'CMS'
+}
+
+last_names = ['SMITH', 'JOHNSON', 'WILLIAMS', 'BROWN', 'JONES', 'GARCIA', 'MILLER', 'DAVIS', 'RODRIGUEZ', 'MARTINEZ',
+              'HERNANDEZ', 'LOPEZ', 'GONZALEZ', 'WILSON', 'ANDERSON', 'THOMAS', 'TAYLOR', 'MOORE', 'JACKSON', 'MARTIN']
+first_names = ['JAMES', 'MARY', 'ROBERT', 'PATRICIA', 'JOHN', 'JENNIFER', 'MICHAEL', 'LINDA', 'DAVID', 'ELIZABETH',
+               'WILLIAM', 'BARBARA', 'RICHARD', 'SUSAN', 'JOSEPH', 'JESSICA', 'THOMAS', 'SARAH', 'CHRISTOPHER', 'KAREN']
+career_fields = ['1A', '1C', '1D', '1N', '1S', '1T', '1X', '2A', '2D', '2F', '2N', '2P', '2T', '3D', '3F', '3N', '3P',
+                 '3T', '3X', '4N']
+
+# REENL_ELIG_STATUS is a required column, so every member gets a code: mostly unrestricted (1x/3x),
+# the rest spread over common restricting codes
+reenlistment_codes = ['1A', '1B', '3A', '3B', '2X', '4H', '2A', '4J']
+reenlistment_weights = [0.55, 0.15, 0.12, 0.08, 0.03, 0.03, 0.02, 0.02]
+
+
+def _random_dates(rng, start, end, size):
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    days = rng.integers(0, (end - start).days + 1, size)
+    return start + pd.to_timedelta(days, unit='D')
+
+
+def _date_strings(dates):
+    """Dates as DD-MMM-YYYY text, the way the Alpha Roster export writes them"""
+    # A roster spans a few thousand distinct days, so format each day once
+    codes, days = pd.factorize(pd.DatetimeIndex(dates))
+    return days.strftime(roster_date_format).str.upper().to_numpy(dtype=object)[codes]
+
+
+def _afscs(rng, skill_levels):
+    fields = rng.choice(career_fields, len(skill_levels))
+    digits = rng.integers(0, 10, (len(skill_levels), 2))
+    suffixes = rng.choice(['', 'A', 'B', 'C'], len(skill_levels), p=[0.4, 0.3, 0.2, 0.1])
+    return np.array([f'{field}{a}{skill}{b}{suffix}' for field, a, skill, b, suffix
+                     in zip(fields, digits[:, 0], skill_levels, digits[:, 1], suffixes)], dtype=object)
+
+
+def generate_roster(members, seed=0, units=None, year=2025):
+    """
+    Build a synthetic Alpha Roster with the real column schema, as read_excel returns it.
+
+    Args:
+        members (int): Number of members
+        seed (int, optional): Random seed; the same seed always gives the same roster
+        units (int, optional): Number of PASCODEs. Defaults to one per 250 members (at least 5)
+        year (int, optional): Promotion year the dates are spread around
+
+    Returns:
+        pd.DataFrame: roster_columns with text dates (DD-MMM-YYYY) and float UIF_CODE, ready for type_roster
+    """
+    rng = np.random.default_rng(seed)
+    units = units or max(5, members // 250)
+
+    # A few large units and many small ones
+    unit_weights = 1 / np.arange(1, units + 1) ** 0.8
+    pascodes = np.array([f'PA{i:04d}' for i in range(units)], dtype=object)
+    assigned = pascodes[rng.choice(units, members, p=unit_weights / unit_weights.sum())]
+
+    grades = rng.choice(list(grade_weights), members, p=list(grade_weights.values()))
+    dor = _random_dates(rng, f'{year - 7}-01-01', f'{year}-06-30', members)
+    service_years = np.array([grade_service_years[grade] for grade in grades]) + rng.uniform(0, 8, members)
+    tafmsd = dor - pd.to_timedelta(service_years * 365.25, unit='D').round('D')
+    arrived = _random_dates(rng, f'{year - 6}-01-01', f'{year}-12-31', members)
+
+    skill_levels = np.array([grade_skill_levels[grade] for grade in grades])
+    cafsc = _afscs(rng, skill_levels)
+    dafsc = _afscs(rng, skill_levels)
+    # Only some members hold additional AFSCs
+    extra_afscs = {}
+    for column, share in [('2AFSC', 0.3), ('3AFSC', 0.1), ('4AFSC', 0.05)]:
+        afscs = _afscs(rng, rng.choice(['3', '5', '7'], members))
+        extra_afscs[column] = np.where(rng.random(members) < share, afscs, None)
+
+    uif_codes = rng.choice([np.nan, 0, 1, 2, 3], members, p=[0.6, 0.25, 0.07, 0.05, 0.03])
+    uif_dates = _date_strings(_random_dates(rng, f'{year - 2}-01-01', f'{year + 1}-12-31', members))
+    projected = np.array([next_grade.get(grade) for grade in grades], dtype=object)
+
+    roster = pd.DataFrame({
+        'FULL_NAME': [f'{last}, {first} {initial}' for last, first, initial in zip(
+            rng.choice(last_names, members), rng.choice(first_names, members),
+            rng.choice(list('ABCDEFGHJKLMNPRSTW'), members)
+        )],
+        'GRADE': grades.astype(object),
+        'ASSIGNED_PAS_CLEARTEXT': np.array([f'UNIT {pascode}' for pascode in assigned], dtype=object),
+        'DAFSC': dafsc,
+        'DOR': _date_strings(dor),
+        'DATE_ARRIVED_STATION': _date_strings(arrived),
+        'TAFMSD': _date_strings(tafmsd),
+        'REENL_ELIG_STATUS': rng.choice(np.array(reenlistment_codes, dtype=object), members, p=reenlistment_weights),
+        'ASSIGNED_PAS': assigned,
+        'CAFSC': cafsc,
+        # About one in ten members already has a projected promotion
+        'GRADE_PERM_PROJ': np.where(rng.random(members) < 0.1, projected, None),
+        'UIF_CODE': uif_codes,
+        'UIF_DISPOSITION_DATE': np.where(np.isnan(uif_codes), None, uif_dates),
+        **extra_afscs
+    })
+    return roster[roster_columns]
+
+
+def synthetic_mel_config(roster, pascodes_per_srid=5):
+    """
+    MEL config (see mel_config.load_mel_config) covering every PASCODE in a synthetic roster, so
+    generating its MELs never prompts.
+
+    Args:
+        roster (pd.DataFrame): Roster from generate_roster
+        pascodes_per_srid (int, optional): PASCODEs that share each senior rater
+    """
+    config = {'pascodes': {}, 'senior_raters': {}}
+    for i, pascode in enumerate(sorted(roster['ASSIGNED_PAS'].dropna().unique())):
+        srid = f'SR{i // pascodes_per_srid:04d}'
+        config['pascodes'][pascode] = (f'COMMANDER {i}', 'Lt Col', f'Commander, UNIT {pascode}', srid)
+        config['senior_raters'].setdefault(srid, (f'SENIOR RATER {srid}', 'Col', 'Wing Commander'))
+    return config
+
+
+def write_roster(roster, path):
+    """Write a roster to an Alpha Roster style Excel workbook"""
+    roster.to_excel(path, index=False)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a synthetic Alpha Roster workbook.')
+    parser.add_argument('members', type=int, help='Number of members')
+    parser.add_argument('output', help='Excel file to write')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--units', type=int, help='Number of PASCODEs (default: one per 250 members)')
+    parser.add_argument('--year', type=int, default=2025, help='Promotion year the dates are spread around')
+    args = parser.parse_args(argv)
+
+    write_roster(generate_roster(args.members, args.seed, args.units, args.year), args.output)
+    print(f"Wrote {args.members} members to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+from board_filter import board_filter
+from eligibility_engine import evaluate_eligibility, to_board_filter_result
+from roster_ingest import roster_columns, type_roster
+from synthetic_roster import generate_roster
+
+nan = np.nan
+
+# Hand-picked members for the rules a random roster rarely hits (dates for the 2025 cycle)
+edge_cases = [
+    # A1C: eligible, failed A1C check, BTZ, not considered (BTZ date after the SrA SCOD)
+    dict(GRADE='A1C', DOR='01-JUN-2022', TAFMSD='01-JUN-2021'),
+    dict(GRADE='A1C', DOR='15-NOV-2022', TAFMSD='01-JUN-2021'),
+    dict(GRADE='A1C', DOR='15-JAN-2023', TAFMSD='01-JUN-2021'),
+    dict(GRADE='A1C', DOR='01-OCT-2023', TAFMSD='01-JUN-2021'),
+    # A1C BTZ/cutoff edges, including month ends that relativedelta and DateOffset both clamp
+    dict(GRADE='A1C', DOR='01-OCT-2022', TAFMSD='01-JUN-2021'),
+    dict(GRADE='A1C', DOR='31-MAY-2023', TAFMSD='01-JUN-2021'),
+    dict(GRADE='A1C', DOR='31-DEC-2022', TAFMSD='01-JUN-2021'),
+    dict(GRADE='A1C', DOR='29-FEB-2024', TAFMSD='01-JUN-2021'),
+    # Over 36 months TIS (never applied by board_filter)
+    dict(GRADE='A1C', DOR='01-JUN-2022', TAFMSD='01-JAN-2019'),
+    dict(GRADE='AMN', DOR='01-JUN-2024', TAFMSD='01-JUN-2023'),
+    dict(GRADE='AB', DOR='01-JUN-2024', TAFMSD='01-JUN-2024'),
+    # TIG and TIS exactly on and one day past the SSG cutoffs
+    dict(GRADE='SSG', DOR='01-AUG-2023', TAFMSD='01-JUL-2018'),
+    dict(GRADE='SSG', DOR='02-AUG-2023', TAFMSD='01-JUL-2018'),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='01-JUL-2021'),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='02-JUL-2021'),
+    # HYT: inside the exception window (+2 years), before it, and on its edges
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='01-JUN-2005'),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2003'),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='08-DEC-2003'),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='09-DEC-2003'),
+    dict(GRADE='SMS', DOR='01-JAN-2023', TAFMSD='29-FEB-2000'),
+    # UIF: code above 1 disposed before / after the SCOD, code 1, code without a date
+    dict(GRADE='TSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2012', UIF_CODE=2.0, UIF_DISPOSITION_DATE='01-JAN-2025'),
+    dict(GRADE='TSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2012', UIF_CODE=3.0, UIF_DISPOSITION_DATE='01-JAN-2026'),
+    dict(GRADE='TSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2012', UIF_CODE=1.0, UIF_DISPOSITION_DATE='01-JAN-2025'),
+    dict(GRADE='TSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2012', UIF_CODE=2.0, UIF_DISPOSITION_DATE=nan),
+    # RE codes: restricted and unrestricted
+    dict(GRADE='MSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2008', REENL_ELIG_STATUS='2X'),
+    dict(GRADE='MSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2008', REENL_ELIG_STATUS='4H'),
+    dict(GRADE='MSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2008', REENL_ELIG_STATUS='1A'),
+    # CAFSC: 8/9 exempt, short code, missing, low level saved by the first present alternate AFSC only
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2015', CAFSC='18X3A1'),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2015', CAFSC='19Z3X1'),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2015', CAFSC='1A351'),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2015', CAFSC=nan),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2015', CAFSC='1A331A', **{'2AFSC': '2A571'}),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2015', CAFSC='1A331A', **{'2AFSC': '2A5710'}),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2015', CAFSC='1A331A', **{'2AFSC': '2A331', '3AFSC': '3D171'}),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2015', CAFSC='1A331A', **{'3AFSC': '3D171'}),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2015', CAFSC='1A331A', **{'4AFSC': '3D1710'}),
+    dict(GRADE='SMS', DOR='01-JAN-2023', TAFMSD='01-JAN-2005', CAFSC='1A371', **{'2AFSC': '2A791'}),
+    # Missing or unparseable dates: not considered for any grade
+    dict(GRADE='SRA', DOR='01-JAN-2023', TAFMSD=nan),
+    dict(GRADE='A1C', DOR=nan, TAFMSD='01-JUN-2021'),
+    dict(GRADE='SRA', DOR=nan, TAFMSD='01-JUN-2019'),
+    dict(GRADE='SSG', DOR=nan, TAFMSD='01-JAN-2015'),
+    dict(GRADE='MSG', DOR=nan, TAFMSD='01-JAN-2008', REENL_ELIG_STATUS='2X'),
+    dict(GRADE='TSG', DOR='31-FEB-2022', TAFMSD='01-JAN-2012'),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='not a date'),
+    # UIF code above 1 without a date is not considered, unless an earlier rule already failed the member
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2015', UIF_CODE=3.0, UIF_DISPOSITION_DATE=nan),
+    dict(GRADE='SSG', DOR='01-JAN-2025', TAFMSD='01-JAN-2015', UIF_CODE=3.0, UIF_DISPOSITION_DATE=nan),
+    dict(GRADE='SSG', DOR='01-JAN-2022', TAFMSD='01-JAN-2015', UIF_CODE=3.0, UIF_DISPOSITION_DATE='bad'),
+]
+
+member_defaults = dict(FULL_NAME='EDGE, CASE A', ASSIGNED_PAS_CLEARTEXT='UNIT PA0000', DAFSC='1A571',
+                       DATE_ARRIVED_STATION='01-JAN-2023', REENL_ELIG_STATUS=nan, ASSIGNED_PAS='PA0000',
+                       CAFSC='1A1791', GRADE_PERM_PROJ=nan, UIF_CODE=nan, UIF_DISPOSITION_DATE=nan,
+                       **{'2AFSC': nan, '3AFSC': nan, '4AFSC': nan})
+
+
+def edge_case_roster():
+    return pd.DataFrame([{**member_defaults, **case} for case in edge_cases])[roster_columns]
+
+
+def raw_roster():
+    """Every grade from the synthetic roster, followed by the edge cases, with text dates"""
+    return pd.concat([generate_roster(3000, seed=7), edge_case_roster()], ignore_index=True)
+
+
+def board_filter_results(roster, year):
+    """board_filter for every row of a raw roster, the way the original parser called it (text dates, NaN if missing)"""
+    return [board_filter(grade, year, dor, uif_code, uif_date, tafmsd, re_status, cafsc, two, three, four)
+            for grade, dor, uif_code, uif_date, tafmsd, re_status, cafsc, two, three, four in zip(
+                roster['GRADE'], roster['DOR'], roster['UIF_CODE'], roster['UIF_DISPOSITION_DATE'], roster['TAFMSD'],
+                roster['REENL_ELIG_STATUS'], roster['CAFSC'], roster['2AFSC'], roster['3AFSC'], roster['4AFSC'])]
+
+
+def engine_results(roster, year):
+    results = evaluate_eligibility(roster, year)
+    return [to_board_filter_result(status, reason) for status, reason in zip(results['STATUS'], results['REASON'])]
+
+
+@pytest.mark.parametrize('year', [2024, 2025, 2026])
+@pytest.mark.parametrize('typed', [True, False], ids=['typed', 'text_dates'])
+def test_evaluate_eligibility_matches_board_filter(year, typed):
+    roster = raw_roster()
+    expected = board_filter_results(roster, year)
+    actual = engine_results(type_roster(roster) if typed else roster, year)
+    mismatches = [(i, roster.loc[i, 'GRADE'], want, got)
+                  for i, (want, got) in enumerate(zip(expected, actual)) if want != got]
+    assert mismatches == []
+
+
+def test_roster_covers_every_outcome():
+    roster = type_roster(raw_roster())
+    results = evaluate_eligibility(roster, 2025)
+    assert set(roster['GRADE']) >= {'AB', 'AMN', 'A1C', 'SRA', 'SSG', 'TSG', 'MSG', 'SMS'}
+    assert set(results['STATUS'].dropna()) == {'eligible', 'btz', 'ineligible'}
+    reasons = results['REASON'].dropna()
+    for prefix in ['Failed A1C Check.', 'TIG: <', 'TIS <', 'Higher tenure.', 'UIF code:', '2X:', '4H:',
+                   'Insufficient CAFSC skill level.']:
+        assert reasons.str.startswith(prefix).any(), prefix
+    assert results['STATUS'].isna().any()
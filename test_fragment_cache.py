@@ -0,0 +1,41 @@
+import os
+from fragment_cache import (fragment_fingerprint, file_fingerprint, get_fragment_path, load_fragment, store_fragment,
+                            pascode_key, senior_rater_key)
+
+
+def test_pascode_and_srid_with_the_same_text_keep_separate_entries(tmp_path):
+    cache_dir = str(tmp_path)
+    pascode_path = get_fragment_path(cache_dir, 'initial_SSG_2025', pascode_key('X1'), 'a' * 32)
+    srid_path = get_fragment_path(cache_dir, 'initial_SSG_2025', senior_rater_key('X1'), 'b' * 32)
+    assert pascode_path != srid_path
+    store_fragment(pascode_path, b'pascode')
+    store_fragment(srid_path, b'senior rater')
+    assert load_fragment(pascode_path) == b'pascode'
+    assert load_fragment(srid_path) == b'senior rater'
+
+
+def test_store_replaces_only_the_same_key(tmp_path):
+    cache_dir = str(tmp_path)
+    old_path = get_fragment_path(cache_dir, 'final_SSG_2025', pascode_key('PA01'), 'a' * 32)
+    other_path = get_fragment_path(cache_dir, 'final_SSG_2025', pascode_key('PA01X'), 'a' * 32)
+    store_fragment(old_path, b'old')
+    store_fragment(other_path, b'other')
+    new_path = get_fragment_path(cache_dir, 'final_SSG_2025', pascode_key('PA01'), 'c' * 32)
+    store_fragment(new_path, b'new')
+    assert not os.path.exists(old_path)
+    assert load_fragment(new_path) == b'new'
+    assert load_fragment(other_path) == b'other'
+
+
+def test_logo_contents_change_the_fingerprint(tmp_path):
+    logo_path = tmp_path / 'logo.png'
+    logo_path.write_bytes(b'first')
+    first = fragment_fingerprint('pascode', 'PA01', (str(logo_path), file_fingerprint(str(logo_path))))
+    logo_path.write_bytes(b'second')
+    second = fragment_fingerprint('pascode', 'PA01', (str(logo_path), file_fingerprint(str(logo_path))))
+    assert first != second
+    assert file_fingerprint(str(tmp_path / 'missing.png')) is None
+
+
+def test_last_senior_rater_changes_the_fingerprint():
+    assert fragment_fingerprint('senior_rater', 'SR1', True) != fragment_fingerprint('senior_rater', 'SR1', False)
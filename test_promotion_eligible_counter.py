@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+from promotion_eligible_counter import (build_unit_quotas, get_unit_quota, get_promotion_eligibility,
+                                        get_promotion_eligibility_batch, small_unit_size)
+
+# PASCODE -> eligible members
+unit_sizes = {'PA01': 4, 'PA02': 6, 'PA03': 9, 'PA04': 25, 'PA05': 10, 'PA06': 11, 'PA07': 3}
+
+# PA01-PA04 share SR1 (three small units); PA05 and PA06 share SR2; PA07 has no SRID; PA08 has no eligibles
+pascode_srids = {'PA01': 'SR1', 'PA02': 'SR1', 'PA03': 'SR1', 'PA04': 'SR1', 'PA05': 'SR2', 'PA06': 'SR2',
+                 'PA08': 'SR3'}
+
+
+def eligible_roster():
+    return pd.DataFrame({'ASSIGNED_PAS': [pascode for pascode, size in unit_sizes.items() for _ in range(size)]})
+
+
+@pytest.fixture(scope='module')
+def quotas():
+    return build_unit_quotas(eligible_roster(), 'SSG', pascode_srids)
+
+
+def test_small_unit_size():
+    assert small_unit_size == 10
+
+
+@pytest.mark.parametrize('pascode, eligible, small_unit, srid, mp, pn', [
+    ('PA03', 9, True, 'SR1', 'NA', 'NA'),
+    ('PA05', 10, False, 'SR2', 'NA', 'NA'),
+    ('PA06', 11, False, 'SR2', 1, 1),
+    ('PA04', 25, False, 'SR1', 3, 1),
+    ('PA01', 4, True, 'SR1', 'NA', 'NA'),
+])
+def test_pascode_quotas(quotas, pascode, eligible, small_unit, srid, mp, pn):
+    pascode_quotas, _ = quotas
+    row = pascode_quotas.loc[pascode]
+    assert (row['eligible'], row['small_unit'], row['srid'], row['mp'], row['pn']) == (eligible, small_unit, srid, mp, pn)
+    assert get_unit_quota(pascode_quotas, pascode) == (eligible, mp, pn)
+
+
+def test_pascode_without_srid(quotas):
+    pascode_quotas, _ = quotas
+    assert pd.isna(pascode_quotas.loc['PA07', 'srid'])
+
+
+# Every SRID gets the quota for all small unit eligibles in the roster (4 + 6 + 9 + 3), not just its own
+@pytest.mark.parametrize('srid, eligible, small_unit_eligible, mp, pn', [
+    ('SR1', 44, 19, 2, 1),
+    # PA05 (10) is not a small unit
+    ('SR2', 21, 0, 2, 1),
+    # An SRID whose units have no eligibles still gets the senior rater quota
+    ('SR3', 0, 0, 2, 1),
+])
+def test_srid_quotas(quotas, srid, eligible, small_unit_eligible, mp, pn):
+    _, srid_quotas = quotas
+    row = srid_quotas.loc[srid]
+    assert (row['eligible'], row['small_unit_eligible'], row['mp'], row['pn']) == (eligible, small_unit_eligible, mp, pn)
+    assert get_unit_quota(srid_quotas, srid) == (eligible, mp, pn)
+
+
+def test_srid_quota_below_table():
+    _, srid_quotas = build_unit_quotas(pd.DataFrame({'ASSIGNED_PAS': ['PA01'] * 4 + ['PA02'] * 6}), 'SSG',
+                                       {'PA01': 'SR1', 'PA02': 'SR2'})
+    assert srid_quotas[['mp', 'pn']].values.tolist() == [['NA', 'NA'], ['NA', 'NA']]
+
+
+def test_srids_cover_only_mapped_pascodes(quotas):
+    _, srid_quotas = quotas
+    assert sorted(srid_quotas.index) == ['SR1', 'SR2', 'SR3']
+
+
+def test_missing_unit_quota(quotas):
+    pascode_quotas, srid_quotas = quotas
+    assert get_unit_quota(pascode_quotas, 'PA99') == (0, 'NA', 'NA')
+    assert get_unit_quota(srid_quotas, 'SR9') == (0, 'NA', 'NA')
+
+
+@pytest.mark.parametrize('rank', ['SRA', 'SSG', 'TSG', 'MSG'])
+def test_batch_matches_single_lookup(rank):
+    # Below, inside, on the edges of and past the tables
+    totals = list(range(-1, 510))
+    assert get_promotion_eligibility_batch(totals, rank) == [get_promotion_eligibility(total, rank) for total in totals]
+    assert get_promotion_eligibility_batch([], rank) == []
@@ -0,0 +1,38 @@
+import os
+from pandas.testing import assert_frame_equal
+from roster_cache import load_alpha_roster, get_cache_path
+from synthetic_roster import generate_roster
+
+
+def write_csv(path, members, seed):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    generate_roster(members, seed=seed).to_csv(path, index=False)
+    return path
+
+
+def test_same_name_in_different_directories(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    first = write_csv(str(tmp_path / 'a' / 'roster.csv'), 50, seed=1)
+    second = write_csv(str(tmp_path / 'b' / 'roster.csv'), 60, seed=2)
+
+    first_roster = load_alpha_roster(first, cache_dir)
+    second_roster = load_alpha_roster(second, cache_dir)
+    assert sorted(os.listdir(cache_dir)) == sorted(os.path.basename(get_cache_path(path, cache_dir))
+                                                   for path in [first, second])
+    assert_frame_equal(load_alpha_roster(first, cache_dir), first_roster)
+    assert_frame_equal(load_alpha_roster(second, cache_dir), second_roster)
+
+
+def test_changed_roster_replaces_only_its_own_entry(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    first = write_csv(str(tmp_path / 'a' / 'roster.csv'), 50, seed=1)
+    second = write_csv(str(tmp_path / 'b' / 'roster.csv'), 60, seed=2)
+    load_alpha_roster(first, cache_dir)
+    load_alpha_roster(second, cache_dir)
+    old_entry = get_cache_path(first, cache_dir)
+
+    write_csv(first, 70, seed=3)
+    assert len(load_alpha_roster(first, cache_dir)) == 70
+    assert not os.path.exists(old_entry)
+    assert os.path.exists(get_cache_path(first, cache_dir))
+    assert os.path.exists(get_cache_path(second, cache_dir))
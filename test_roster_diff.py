@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from roster_diff import (diff_rosters, summarize_by_pascode, changed_pascodes, ADDED, REMOVED, NEWLY_ELIGIBLE,
+                         DROPPED_TO_INELIGIBLE, REASON_CHANGED, MOVED_PASCODE)
+from roster_ingest import roster_columns, type_roster
+
+nan = np.nan
+
+# An SSG eligible for the 2025 SSG cycle unless a test overrides a field
+member_defaults = dict(FULL_NAME='DOE, JOHN A', GRADE='SSG', ASSIGNED_PAS_CLEARTEXT='UNIT PA0001', DAFSC='1A571',
+                       DOR='01-JAN-2022', DATE_ARRIVED_STATION='01-JAN-2023', TAFMSD='01-JAN-2015',
+                       REENL_ELIG_STATUS=nan, ASSIGNED_PAS='PA0001', CAFSC='1A1791', GRADE_PERM_PROJ=nan, UIF_CODE=nan,
+                       UIF_DISPOSITION_DATE=nan, **{'2AFSC': nan, '3AFSC': nan, '4AFSC': nan})
+
+
+def roster(*members):
+    return type_roster(pd.DataFrame([{**member_defaults, **member} for member in members])[roster_columns])
+
+
+def diff(old, new):
+    return diff_rosters(roster(*old), roster(*new), 'SSG', 2025)
+
+
+def changes(result):
+    return dict(zip(result['FULL_NAME'], result['CHANGE']))
+
+
+def test_unchanged_rosters():
+    members = [dict(FULL_NAME='A'), dict(FULL_NAME='B', REENL_ELIG_STATUS='2X')]
+    assert diff(members, members).empty
+
+
+def test_added_member():
+    result = diff([dict(FULL_NAME='A')], [dict(FULL_NAME='A'), dict(FULL_NAME='B')])
+    assert changes(result) == {'B': ADDED}
+    row = result.iloc[0]
+    assert pd.isna(row['STATUS_OLD']) and row['STATUS_NEW'] == 'eligible'
+    assert pd.isna(row['PASCODE_OLD']) and row['PASCODE_NEW'] == 'PA0001'
+    assert not row['MOVED']
+
+
+def test_removed_member():
+    result = diff([dict(FULL_NAME='A'), dict(FULL_NAME='B', GRADE='TSG')], [dict(FULL_NAME='A')])
+    assert changes(result) == {'B': REMOVED}
+    row = result.iloc[0]
+    assert row['GRADE'] == 'TSG'
+    assert row['STATUS_OLD'] == 'not listed' and pd.isna(row['STATUS_NEW'])
+
+
+def test_status_flips():
+    old = [dict(FULL_NAME='A'), dict(FULL_NAME='B', REENL_ELIG_STATUS='2X'), dict(FULL_NAME='C', CAFSC='1A331A')]
+    new = [dict(FULL_NAME='A', REENL_ELIG_STATUS='2X'), dict(FULL_NAME='B'), dict(FULL_NAME='C', REENL_ELIG_STATUS='2X')]
+    result = diff(old, new)
+    assert changes(result) == {'A': DROPPED_TO_INELIGIBLE, 'B': NEWLY_ELIGIBLE, 'C': REASON_CHANGED}
+    flipped = result.set_index('FULL_NAME').loc['A']
+    assert (flipped['STATUS_OLD'], flipped['STATUS_NEW']) == ('eligible', 'ineligible')
+    assert pd.isna(flipped['REASON_OLD']) and flipped['REASON_NEW'].startswith('2X:')
+
+
+def test_moved_pascode():
+    old = [dict(FULL_NAME='A'), dict(FULL_NAME='B')]
+    new = [dict(FULL_NAME='A', ASSIGNED_PAS='PA0002', ASSIGNED_PAS_CLEARTEXT='UNIT PA0002'),
+           dict(FULL_NAME='B', ASSIGNED_PAS='PA0002', REENL_ELIG_STATUS='2X')]
+    result = diff(old, new).set_index('FULL_NAME')
+    # A status change outranks the move, but MOVED is still set
+    assert result['CHANGE'].to_dict() == {'A': MOVED_PASCODE, 'B': DROPPED_TO_INELIGIBLE}
+    assert result['MOVED'].tolist() == [True, True]
+    assert (result.loc['A', 'PASCODE_OLD'], result.loc['A', 'PASCODE_NEW']) == ('PA0001', 'PA0002')
+    assert changed_pascodes(result) == {'PA0001', 'PA0002'}
+    summary = summarize_by_pascode(result)
+    assert summary.loc['PA0002', MOVED_PASCODE] == 1 and summary.loc['PA0002', DROPPED_TO_INELIGIBLE] == 1
+
+
+def test_duplicate_names_pair_one_to_one():
+    # Two members share the name and service date; they are told apart by occurrence, not multiplied by the join
+    twin = dict(FULL_NAME='SMITH, JANE')
+    old = [dict(twin, ASSIGNED_PAS='PA0001'), dict(twin, ASSIGNED_PAS='PA0002'), dict(FULL_NAME='A')]
+    new = [dict(twin, ASSIGNED_PAS='PA0002'), dict(FULL_NAME='A'), dict(twin, ASSIGNED_PAS='PA0001')]
+    assert diff(old, new).empty
+
+    new = [dict(twin, ASSIGNED_PAS='PA0001'), dict(twin, ASSIGNED_PAS='PA0002', REENL_ELIG_STATUS='2X'),
+           dict(twin, ASSIGNED_PAS='PA0003'), dict(FULL_NAME='A')]
+    result = diff(old, new)
+    assert len(result) == 2
+    assert sorted(result['CHANGE']) == sorted([ADDED, DROPPED_TO_INELIGIBLE])
+    dropped = result[result['CHANGE'] == DROPPED_TO_INELIGIBLE].iloc[0]
+    assert (dropped['PASCODE_OLD'], dropped['PASCODE_NEW']) == ('PA0002', 'PA0002')
+    assert result[result['CHANGE'] == ADDED].iloc[0]['PASCODE_NEW'] == 'PA0003'
+
+
+def test_duplicate_names_only_one_moves():
+    # Sorted by PASCODE the twins would swap partners (PA0002 -> PA0001, PA0003 -> PA0002) and both look moved
+    twin = dict(FULL_NAME='SMITH, JANE')
+    old = [dict(twin, ASSIGNED_PAS='PA0002'), dict(twin, ASSIGNED_PAS='PA0003', REENL_ELIG_STATUS='2X')]
+    new = [dict(twin, ASSIGNED_PAS='PA0002'), dict(twin, ASSIGNED_PAS='PA0001', REENL_ELIG_STATUS='2X')]
+    result = diff(old, new)
+    assert len(result) == 1
+    row = result.iloc[0]
+    assert (row['CHANGE'], row['MOVED']) == (MOVED_PASCODE, True)
+    assert (row['PASCODE_OLD'], row['PASCODE_NEW']) == ('PA0003', 'PA0001')
+    assert (row['STATUS_OLD'], row['STATUS_NEW']) == ('ineligible', 'ineligible')
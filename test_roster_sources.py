@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+import roster_sources
+from roster_ingest import date_columns, roster_date_dtype
+from roster_sources import read_roster, get_roster_format
+from synthetic_roster import generate_roster, write_roster
+
+
+@pytest.fixture(scope='module')
+def raw_roster():
+    """Synthetic roster with text dates, plus the missing-value spellings an export can hold"""
+    raw = generate_roster(400, seed=5)
+    raw.loc[0, 'REENL_ELIG_STATUS'] = 'N/A'
+    raw.loc[1, '2AFSC'] = 'NULL'
+    raw.loc[2, 'GRADE_PERM_PROJ'] = ''
+    raw.loc[3, 'CAFSC'] = '#N/A'
+    raw.loc[4, 'DOR'] = np.nan
+    raw.loc[5, 'TAFMSD'] = 'NA'
+    raw.loc[6, 'DATE_ARRIVED_STATION'] = 'not a date'
+    raw.loc[7, 'DOR'] = '29-FEB-2024'
+    return raw
+
+
+def write(raw, path):
+    if path.suffix == '.csv':
+        raw.to_csv(path, index=False)
+    elif path.suffix == '.parquet':
+        raw.to_parquet(path, index=False)
+    else:
+        write_roster(raw, path)
+    return str(path)
+
+
+@pytest.fixture(scope='module')
+def excel_roster(raw_roster, tmp_path_factory):
+    return read_roster(write(raw_roster, tmp_path_factory.mktemp('roster') / 'roster.xlsx'))
+
+
+def test_excel_roster_types(excel_roster):
+    for column in date_columns:
+        assert excel_roster[column].dtype == roster_date_dtype
+    assert excel_roster['UIF_CODE'].dtype == 'float64'
+    missing = [(0, 'REENL_ELIG_STATUS'), (1, '2AFSC'), (2, 'GRADE_PERM_PROJ'), (3, 'CAFSC'), (4, 'DOR'), (5, 'TAFMSD'),
+               (6, 'DATE_ARRIVED_STATION')]
+    for row, column in missing:
+        assert pd.isna(excel_roster.loc[row, column]), column
+    assert excel_roster.loc[7, 'DOR'] == pd.Timestamp('2024-02-29')
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.parquet'])
+def test_formats_read_the_same_roster(raw_roster, excel_roster, suffix, tmp_path):
+    assert_frame_equal(read_roster(write(raw_roster, tmp_path / f'roster{suffix}')), excel_roster)
+
+
+def test_csv_without_pyarrow(raw_roster, excel_roster, tmp_path, monkeypatch):
+    path = write(raw_roster, tmp_path / 'roster.csv')
+    monkeypatch.setattr(roster_sources, '_pyarrow', lambda: None)
+    assert_frame_equal(read_roster(path), excel_roster)
+
+
+def test_parquet_with_date_columns(raw_roster, excel_roster, tmp_path):
+    # Parquet exports usually store dates as timestamps or dates rather than text
+    typed = raw_roster.copy()
+    for column in date_columns:
+        typed[column] = pd.to_datetime(typed[column], format='%d-%b-%Y', errors='coerce')
+    typed['DOR'] = typed['DOR'].dt.date
+    typed['TAFMSD'] = typed['TAFMSD'].astype('datetime64[ns]')
+    assert_frame_equal(read_roster(write(typed, tmp_path / 'roster.parquet')), excel_roster)
+
+
+def test_unsupported_format():
+    assert get_roster_format('ROSTER.XLSX') == '.xlsx'
+    with pytest.raises(ValueError, match='Unsupported roster format'):
+        get_roster_format('roster.json')
@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+from excel_parser import load_roster, build_mel_data, finish_mel_data
+from roster_ingest import date_columns, roster_date_dtype
+from roster_stream import stream_mel_members
+from synthetic_roster import generate_roster, write_roster, synthetic_mel_config
+
+members = 1500
+cycle_years = [('SRA', 2025), ('SSG', 2025), ('TSG', 2026)]
+
+
+@pytest.fixture(scope='module')
+def raw_roster():
+    return generate_roster(members, seed=11, units=8)
+
+
+def write(raw, path):
+    if path.suffix == '.csv':
+        raw.to_csv(path, index=False)
+    elif path.suffix == '.parquet':
+        raw.to_parquet(path, index=False)
+    else:
+        write_roster(raw, path)
+    return str(path)
+
+
+def assert_mel_data_equal(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, pd.DataFrame):
+            assert_frame_equal(actual[key], value, obj=key)
+        elif key == 'quotas':
+            for actual_quotas, expected_quotas in zip(actual[key], value):
+                assert_frame_equal(actual_quotas, expected_quotas, obj=key)
+        else:
+            assert actual[key] == value, key
+
+
+@pytest.mark.parametrize('suffix', ['.xlsx', '.csv', '.parquet'])
+def test_stream_matches_load_roster(raw_roster, suffix, tmp_path, monkeypatch):
+    # load_roster caches the typed roster under the working directory
+    monkeypatch.chdir(tmp_path)
+    path = write(raw_roster, tmp_path / f'roster{suffix}')
+    mel_config = synthetic_mel_config(raw_roster)
+
+    members_by_cycle, streamed = stream_mel_members(path, cycle_years, chunk_size=400)
+    assert streamed == members
+
+    roster = load_roster(path)
+    for column in date_columns:
+        assert roster[column].dtype == roster_date_dtype
+    for cycle, year in cycle_years:
+        expected = build_mel_data(roster, cycle, year, mel_config)
+        actual = finish_mel_data(members_by_cycle[(cycle, year)], cycle, year, mel_config)
+        assert len(expected['eligible_df']) > 0
+        assert_mel_data_equal(actual, expected)
@@ -0,0 +1,9 @@
+import pytest
+from roster_ingest import type_roster, validate_required_fields
+from synthetic_roster import generate_roster
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_generated_roster_passes_validation(seed):
+    report = validate_required_fields(type_roster(generate_roster(5000, seed=seed)))
+    assert report['valid'], report['missing_by_column']